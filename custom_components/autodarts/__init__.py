@@ -1,25 +1,54 @@
 """The autodarts integration."""
 from __future__ import annotations
 
-import json
-from os import path, walk
+import asyncio
+from datetime import timedelta
+import logging
+import sqlite3
+import time
 
-from autodarts import AutoDartSession
 from homeassistant.components.frontend import add_extra_js_url
-from homeassistant.components.http.view import HomeAssistantView
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
 
+from .assets import AssetView, build_assets
 from .const import (
-    AUTODART_CLIENT_ID,
-    AUTODART_CLIENT_SECRET,
-    AUTODART_REALM_NAME,
+    CONF_COALESCE_WINDOW,
+    CONF_LOCAL,
+    CONF_LOCAL_HOST,
+    CONF_PROFILING,
+    CONF_RECORD,
+    DATA_HEATMAPS,
+    DATA_HISTORY,
+    DATA_SETUP_SEMAPHORE,
+    DATA_STATISTICS,
+    DEFAULT_COALESCE_WINDOW,
     DOMAIN,
+    HEATMAP_DIR,
+    HEATMAP_FLUSH_INTERVAL,
+    HISTORY_DB,
+    MAX_PARALLEL_SETUPS,
+    SIGNAL_STATISTICS_LOADED,
+    TRAFFIC_DIR,
 )
 from .coordinator import AutoDartsBoardCoordinator, AutoDartsBoardMatchCoordinator
+from .events import event_listener
+from .heatmap import HeatmapStore, HeatmapView
+from .history import ThrowHistory, statistics_listener
+from .local import LocalBoardClient
+from .profiling import Profiler
+from .services import async_setup_services
+from .session import async_get_session_pool
+from .snapshot import Snapshot
+from .statistics import StatisticsEngine
+from .traffic import TrafficRecorder
+from .views import IconIndex, IconSetView, ListingView
+
+_LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [
     Platform.SENSOR,
@@ -34,39 +63,14 @@ LOADER_URL = f"/{DOMAIN}/main.js"
 LOADER_PATH = f"custom_components/{DOMAIN}/main.js"
 ICONS_URL = f"/{DOMAIN}/icons"
 ICONLIST_URL = f"/{DOMAIN}/list"
+ICONSET_URL = f"/{DOMAIN}/iconset"
+ASSETS_URL = f"/{DOMAIN}/static"
 ICONS_PATH = f"custom_components/{DOMAIN}/data"
 
 
-class InvalidAuth(HomeAssistantError):
-    """Error to indicate there is invalid auth."""
-
-    pass
-
-
-class ListingView(HomeAssistantView):
-    requires_auth = False
-
-    def __init__(self, url, iconpath):
-        self.url = url
-        self.iconpath = iconpath
-        self.name = "Icon Listing"
-
-    async def get(self, request):
-        icons = []
-        for dirpath, _dirnames, filenames in walk(self.iconpath):
-            icons.extend(
-                [
-                    {"name": path.join(dirpath[len(self.iconpath) :], fn[:-4])}
-                    for fn in filenames
-                    if fn.endswith(".svg")
-                ]
-            )
-        return json.dumps(icons)
-
-
 async def async_setup(hass, config):
+    # unversioned urls are kept for pages loaded before an upgrade
     hass.http.register_static_path(LOADER_URL, hass.config.path(LOADER_PATH), True)
-    add_extra_js_url(hass, LOADER_URL)
 
     """
     for iset in ["darts",]:
@@ -85,9 +89,50 @@ async def async_setup(hass, config):
     hass.http.register_static_path(
         ICONS_URL + "/darts", hass.config.path(ICONS_PATH + "/darts"), True
     )
-    hass.http.register_view(
-        ListingView(ICONLIST_URL + "/darts", hass.config.path(ICONS_PATH + "/darts"))
+    # built once here, out of the event loop, then only on directory change
+    index = IconIndex(hass.config.path(ICONS_PATH + "/darts"))
+    await hass.async_add_executor_job(index.build)
+    hass.http.register_view(ListingView(ICONLIST_URL + "/darts", index))
+    hass.http.register_view(IconSetView(ICONSET_URL + "/darts", index))
+
+    assets, loader = await hass.async_add_executor_job(
+        build_assets, hass.config.path(LOADER_PATH)
     )
+    hass.http.register_view(AssetView(ASSETS_URL, assets))
+    add_extra_js_url(hass, f"{ASSETS_URL}/{loader}")
+
+    history = ThrowHistory(hass, hass.config.path(HISTORY_DB))
+    await history.async_setup()
+    hass.data.setdefault(DOMAIN, {})[DATA_HISTORY] = history
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, history.async_close)
+
+    statistics = StatisticsEngine()
+    history.async_add_listener(statistics_listener(statistics))
+    hass.data[DOMAIN][DATA_STATISTICS] = statistics
+
+    async def async_load_statistics():
+        try:
+            await history.async_load_statistics(statistics)
+        except sqlite3.Error as e:
+            _LOGGER.error(f"Unable to load throw statistics : {e}")
+        async_dispatcher_send(hass, SIGNAL_STATISTICS_LOADED)
+
+    # the whole history may be read, never on the setup path
+    hass.async_create_background_task(
+        async_load_statistics(), f"{DOMAIN} statistics load"
+    )
+
+    heatmaps = HeatmapStore(hass, hass.config.path(HEATMAP_DIR))
+    await heatmaps.async_setup()
+    history.async_add_listener(heatmaps.history_listener())
+    hass.data[DOMAIN][DATA_HEATMAPS] = heatmaps
+    hass.http.register_view(HeatmapView(heatmaps))
+    async_track_time_interval(
+        hass, heatmaps.async_flush, timedelta(seconds=HEATMAP_FLUSH_INTERVAL)
+    )
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, heatmaps.async_flush)
+
+    async_setup_services(hass)
     return True
 
 
@@ -95,36 +140,140 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up autodarts from a config entry."""
 
     hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN].setdefault(
+        DATA_SETUP_SEMAPHORE, asyncio.Semaphore(MAX_PARALLEL_SETUPS)
+    )
     hass.data[DOMAIN][entry.entry_id] = {}
 
-    session = AutoDartSession(
-        email=entry.data["email"],
-        password=entry.data["password"],
-        client_id=AUTODART_CLIENT_ID,
-        realm_name=AUTODART_REALM_NAME,
-        client_secret_key=AUTODART_CLIENT_SECRET,
-    )
+    timings = {}
+    start = time.monotonic()
+    coalesce_window = entry.options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW)
+    profiler = Profiler() if entry.options.get(CONF_PROFILING) else None
+    recorder = None
+    if entry.options.get(CONF_RECORD):
+        recorder = TrafficRecorder(
+            hass, hass.config.path(TRAFFIC_DIR), entry.data["board_id"]
+        )
+        entry.async_on_unload(recorder.async_close)
+        entry.async_on_unload(
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, recorder.async_close)
+        )
+    sessions = async_get_session_pool(hass)
+
+    # entries are set up concurrently, bound the load on the cloud
+    async with hass.data[DOMAIN][DATA_SETUP_SEMAPHORE]:
+        timings["queued"] = time.monotonic() - start
 
-    if not await session.is_authenticated():
-        raise InvalidAuth
+        # boards of the same account share one login
+        session = await sessions.async_acquire(
+            entry.data["email"], entry.data["password"]
+        )
+        timings["login"] = time.monotonic() - start - sum(timings.values())
+
+        try:
+            board_coordinator = AutoDartsBoardCoordinator(
+                hass,
+                session,
+                entry.data["board_id"],
+                coalesce_window=coalesce_window,
+                socket=sessions.socket(entry.data["email"], entry.data["password"]),
+                profiler=profiler,
+                recorder=recorder,
+            )
+            await board_coordinator.async_config_entry_first_refresh()
+        except Exception:
+            sessions.release(entry.data["email"], entry.data["password"])
+            raise
+        timings["board"] = time.monotonic() - start - sum(timings.values())
 
-    board_coordinator = AutoDartsBoardCoordinator(hass, session, entry.data["board_id"])
-    await board_coordinator.async_config_entry_first_refresh()
     hass.data[DOMAIN][entry.entry_id]["board_coordinator"] = board_coordinator
 
-    match_coordinator = AutoDartsBoardMatchCoordinator(hass, board_coordinator)
-    await match_coordinator.async_config_entry_first_refresh()
+    # entities are created without match, it is discovered in background
+    match_coordinator = AutoDartsBoardMatchCoordinator(
+        hass, board_coordinator, coalesce_window=coalesce_window
+    )
     hass.data[DOMAIN][entry.entry_id]["match_coordinator"] = match_coordinator
 
+    history = hass.data[DOMAIN][DATA_HISTORY]
+    entry.async_on_unload(
+        match_coordinator.async_add_frame_listener(
+            history.frame_listener(board_coordinator.id)
+        )
+    )
+
+    entry.async_on_unload(
+        match_coordinator.async_add_frame_listener(
+            event_listener(hass, board_coordinator.id)
+        )
+    )
+
+    # show last known match until the live one is loaded
+    snapshot = Snapshot(hass, entry.entry_id, board_coordinator, match_coordinator)
+    await snapshot.async_restore()
+    entry.async_on_unload(
+        match_coordinator.async_add_listener(snapshot.async_schedule_save)
+    )
+
+    async def async_discover_match():
+        discover_start = time.monotonic()
+        await match_coordinator.async_discover()
+        _LOGGER.debug(
+            f"Match discovery of {entry.title} took "
+            f"{time.monotonic() - discover_start:.3f}s"
+        )
+
+    entry.async_create_background_task(
+        hass, async_discover_match(), f"{DOMAIN} match discovery {entry.entry_id}"
+    )
+
+    # board events from the LAN, the cloud still manages the match
+    if entry.options.get(CONF_LOCAL):
+        host = entry.options.get(CONF_LOCAL_HOST) or board_coordinator.item.ip
+        if host:
+            local = LocalBoardClient(hass, board_coordinator, match_coordinator, host)
+            board_coordinator.local = local
+            local.start(entry)
+            entry.async_on_unload(local.stop)
+        else:
+            _LOGGER.warning(f"No address known for {entry.title}, local mode disabled")
+
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
     hass.async_create_task(
         hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     )
+
+    _LOGGER.debug(
+        f"Setup of {entry.title} took {time.monotonic() - start:.3f}s ("
+        + ", ".join(f"{step} {duration:.3f}s" for step, duration in timings.items())
+        + ")"
+    )
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data of a config entry."""
+    await Snapshot.async_remove(hass, entry.entry_id)
+    await async_get_session_pool(hass).async_remove(
+        entry.data["email"], entry.data["password"]
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        data["board_coordinator"].supervisor.cancel()
+        for coordinator in (data["match_coordinator"], data["board_coordinator"]):
+            coordinator.cancel_pending()
+            coordinator.disconnect()
+        async_get_session_pool(hass).release(
+            entry.data["email"], entry.data["password"]
+        )
 
     return unload_ok
@@ -0,0 +1,85 @@
+"""Versioned, precompressed static assets of the autodarts frontend."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+from os import path
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http.view import HomeAssistantView
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always served
+    brotli = None
+
+_LOGGER = logging.getLogger(__name__)
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+class Asset:
+    """A static file with its compressed variants."""
+
+    __slots__ = ("body", "gz", "br", "content_type", "digest")
+
+    def __init__(self, body, content_type):
+        self.body = body
+        self.content_type = content_type
+        self.digest = hashlib.sha1(body).hexdigest()[:12]
+        self.gz = gzip.compress(body, compresslevel=9)
+        self.br = brotli.compress(body) if brotli else None
+
+
+def versioned(name, digest):
+    base, ext = path.splitext(name)
+    return f"{base}.{digest}{ext}"
+
+
+def build_assets(loader_path):
+    """Read, hash and compress the frontend files, blocking.
+
+    Return the assets by versioned name, and the versioned name of main.js.
+    Icons are edited at runtime, they are served by the icon views,
+    revalidated with their etag, not versioned once at setup.
+    """
+    assets = {}
+
+    with open(loader_path, "rb") as file:
+        asset = Asset(file.read(), "application/javascript")
+    loader_name = versioned("main.js", asset.digest)
+    assets[loader_name] = asset
+
+    _LOGGER.debug(
+        f"Built {len(assets)} frontend assets"
+        + ("" if brotli else ", brotli not available")
+    )
+    return assets, loader_name
+
+
+class AssetView(HomeAssistantView):
+    """Serve versioned assets, cached forever by clients."""
+
+    requires_auth = False
+
+    def __init__(self, url, assets):
+        self.url = url + "/{filename:.+}"
+        self.assets = assets
+        self.name = "Autodarts assets"
+
+    async def get(self, request, filename):
+        if not (asset := self.assets.get(filename)):
+            raise web.HTTPNotFound()
+
+        headers = {hdrs.CACHE_CONTROL: IMMUTABLE, hdrs.VARY: hdrs.ACCEPT_ENCODING}
+        accept = request.headers.get(hdrs.ACCEPT_ENCODING, "")
+        body = asset.body
+        if asset.br is not None and "br" in accept:
+            headers[hdrs.CONTENT_ENCODING] = "br"
+            body = asset.br
+        elif "gzip" in accept:
+            headers[hdrs.CONTENT_ENCODING] = "gzip"
+            body = asset.gz
+        return web.Response(body=body, content_type=asset.content_type, headers=headers)
@@ -53,8 +53,8 @@ class ResetButton(AutoDartEntity,ButtonEntity):
     __name__ = "reset"
 
     async def async_press(self):
-        if self.coordinator.data :
-            await self.coordinator.data.async_reset()
+        if self.coordinator.item :
+            await self.coordinator.async_reset()
                 
 class NextButton(AutoDartChildEntity,ButtonEntity):
     """Button for next Autodart. Depending on the state, it could be next player or next leg"""
@@ -65,11 +65,12 @@ class NextButton(AutoDartChildEntity,ButtonEntity):
     configuration_url = AUTODART_MATCH_URL
 
     async def async_press(self):
-        if self.coordinator.data :
-            if self.coordinator.data.finished :
-                await self.coordinator.data.async_next_match()
-            else :
-                await self.coordinator.data.async_next_player()
+        if self.coordinator.item :
+            await self.coordinator.async_next()
+
+    def render_key(self):
+        data = self.coordinator.data
+        return (self.available, data and data.finished)
     
     @property
     def extra_state_attributes(self) -> dict | None:
@@ -88,8 +89,11 @@ class UndoButton(AutoDartChildEntity,ButtonEntity):
     configuration_url = AUTODART_MATCH_URL
 
     async def async_press(self):
-        if self.coordinator.data :
-            await self.coordinator.data.async_undo()
+        if self.coordinator.item :
+            await self.coordinator.async_undo()
+
+    def render_key(self):
+        return (self.available,)
 
 class FinishButton(AutoDartChildEntity,ButtonEntity):
     """Button for next Autodart. Depending on the state, it could be cancel or finish math"""
@@ -100,11 +104,15 @@ class FinishButton(AutoDartChildEntity,ButtonEntity):
     configuration_url = AUTODART_MATCH_URL
 
     async def async_press(self):
-        if self.coordinator.data :
-            if self.coordinator.data.finished :
-                await self.coordinator.data.async_finish()
+        if self.coordinator.item :
+            if self.coordinator.finished :
+                await self.coordinator.async_finish()
             else :
-                await self.coordinator.data.async_abort()
+                await self.coordinator.async_abort()
+
+    def render_key(self):
+        data = self.coordinator.data
+        return (self.available, data and data.finished)
 
     @property
     def extra_state_attributes(self) -> dict | None:
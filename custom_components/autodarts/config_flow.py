@@ -6,17 +6,22 @@ from typing import Any
 
 import voluptuous as vol
 
-from autodarts import AutoDartSession, CloudBoard
+from autodarts import CloudBoard
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
 from .const import (
-    AUTODART_CLIENT_ID,
-    AUTODART_CLIENT_SECRET,
-    AUTODART_REALM_NAME,
+    CONF_COALESCE_WINDOW,
+    CONF_LOCAL,
+    CONF_LOCAL_HOST,
+    CONF_PROFILING,
+    CONF_RECORD,
+    DEFAULT_COALESCE_WINDOW,
     DOMAIN,
 )
+from .session import InvalidAuth, async_get_session_pool, create_session
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,13 +40,7 @@ async def async_validate_input(email: str, password: str) -> dict[str, Any]:
     """
     # TODO validate the data can be used to set up a connection.
 
-    session = AutoDartSession(
-        email=email,
-        password=password,
-        client_id=AUTODART_CLIENT_ID,
-        realm_name=AUTODART_REALM_NAME,
-        client_secret_key=AUTODART_CLIENT_SECRET,
-    )
+    session = create_session(email, password)
 
     if not await session.is_authenticated():
         raise InvalidAuth
@@ -57,6 +56,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     session = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Create the options flow."""
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -95,6 +102,10 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
             else:
+                # hand the authenticated session over to the entry setup
+                async_get_session_pool(self.hass).adopt(
+                    self.data["email"], self.data["password"], self.session
+                )
                 return self.async_create_entry(
                     title=self.boards[user_input["board_id"]], data=self.data
                 )
@@ -119,9 +130,52 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
-class CannotConnect(HomeAssistantError):
-    """Error to indicate we cannot connect."""
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle autodarts options."""
 
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
 
-class InvalidAuth(HomeAssistantError):
-    """Error to indicate there is invalid auth."""
+        options_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_COALESCE_WINDOW,
+                    default=self.config_entry.options.get(
+                        CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5000)),
+                vol.Required(
+                    CONF_PROFILING,
+                    default=self.config_entry.options.get(CONF_PROFILING, False),
+                ): bool,
+                vol.Required(
+                    CONF_RECORD,
+                    default=self.config_entry.options.get(CONF_RECORD, False),
+                ): bool,
+                vol.Required(
+                    CONF_LOCAL,
+                    default=self.config_entry.options.get(CONF_LOCAL, False),
+                ): bool,
+                vol.Optional(
+                    CONF_LOCAL_HOST,
+                    description={
+                        "suggested_value": self.config_entry.options.get(
+                            CONF_LOCAL_HOST
+                        )
+                    },
+                ): str,
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=options_schema)
+
+
+class CannotConnect(HomeAssistantError):
+    """Error to indicate we cannot connect."""
@@ -2,12 +2,93 @@
 
 DOMAIN = "autodarts"
 
+DATA_SESSIONS = "sessions"
+DATA_SETUP_SEMAPHORE = "setup_semaphore"
+DATA_HISTORY = "history"
+DATA_STATISTICS = "statistics"
+DATA_HEATMAPS = "heatmaps"
+
+# sent once the statistics are loaded from the history
+SIGNAL_STATISTICS_LOADED = f"{DOMAIN}_statistics_loaded"
+
+MAX_PARALLEL_SETUPS = 4
+
+SESSION_IDLE_TIMEOUT = 300  # s
+SESSION_REFRESH_MARGIN = 60  # s, before the access token expires
+TOKENS_VERSION = 1
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10  # s
+SNAPSHOT_MAX_AGE = 6 * 3600  # s
+
 AUTODART_CLIENT_ID = ''
 AUTODART_CLIENT_SECRET = ""
 AUTODART_REALM_NAME = 'autodarts'
+AUTODART_AUTH_URL = "https://login.autodarts.io/"
 
 AUTODART_MATCH_URL = "https://api.autodarts.io/gs/v0/matches/"
+AUTODART_WEBSOCKET_URL = "wss://api.autodarts.io/ms/v0/subscribe"
 
 MATCH_WAITING = "Waiting"
 MATCH_STARTED = "Started"
 MATCH_STOPPED = "Finished"
+
+COMMON_DARTS = ["Miss"]
+BULL_DARTS = ["25", "Bull"]
+CRICKET_ALLOWED_DARTS = (
+    COMMON_DARTS
+    + [f"{letter}{number}" for number in range(15, 21) for letter in ["S", "D", "T"]]
+    + BULL_DARTS
+)
+X01_ALLOWED_DARTS = (
+    COMMON_DARTS
+    + [f"{letter}{number}" for number in range(1, 21) for letter in ["S", "D", "T"]]
+    + BULL_DARTS
+)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+RECONNECT_BASE_DELAY = 1  # s
+RECONNECT_CONFIRM_DELAY = 5  # s
+RECONNECT_MAX_DELAY = 120  # s
+RECONNECT_FAILURE_THRESHOLD = 8
+RECONNECT_OPEN_DELAY = 600  # s
+
+CONF_COALESCE_WINDOW = "coalesce_window"
+DEFAULT_COALESCE_WINDOW = 150  # ms
+CONF_PROFILING = "profiling"
+CONF_RECORD = "record"
+CONF_LOCAL = "local"
+CONF_LOCAL_HOST = "local_host"
+
+PROFILE_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250)  # ms
+PROFILE_SLOWEST = 20
+
+ICON_INDEX_CHECK_INTERVAL = 30  # s
+
+HISTORY_DB = "autodarts_history.db"
+HISTORY_BATCH_SIZE = 50
+HISTORY_FLUSH_DELAY = 5  # s
+HISTORY_MAX_QUEUE = 10000
+
+HEATMAP_DIR = ".storage/autodarts_heatmaps"
+HEATMAP_SIZE = 64
+HEATMAP_EXTENT = 1.3  # board radius is 1
+HEATMAP_FLUSH_INTERVAL = 300  # s
+
+OPTIMISTIC_TIMEOUT = 5  # s
+OPERATIONS_HISTORY = 10
+BOARD_CACHE_TTL = 2  # s
+TELEMETRY_RATE_WINDOW = 60  # s
+
+TRAFFIC_DIR = "autodarts_traffic"
+TRAFFIC_MAX_BYTES = 5 * 1024 * 1024
+TRAFFIC_BACKUPS = 5
+TRAFFIC_BATCH_SIZE = 200
+TRAFFIC_FLUSH_DELAY = 5  # s
+TRAFFIC_MAX_QUEUE = 10000
+
+LOCAL_PORT = 3180
+LOCAL_EVENTS_PATH = "/api/events"
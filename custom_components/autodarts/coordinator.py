@@ -1,19 +1,65 @@
 """Example integration using DataUpdateCoordinator."""
 
 import asyncio
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from itertools import count
 import logging
+import time
 
 from autodarts import CloudBoard, Match
 from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
+from .const import (
+    BOARD_CACHE_TTL,
+    DEFAULT_COALESCE_WINDOW,
+    OPERATIONS_HISTORY,
+    OPTIMISTIC_TIMEOUT,
+)
+from .optimistic import (
+    CONFIRMED,
+    EXPIRED,
+    FAILED,
+    PENDING,
+    SENT,
+    Operation,
+    apply_next_player,
+    apply_throw,
+    apply_undo,
+    expect_next_player,
+    expect_throw,
+    expect_undo,
+    segment_key,
+)
+from .reconnect import ReconnectSupervisor
+from .singleflight import SingleFlight
+from .store import BoardStore, MatchStore
+from .telemetry import Telemetry
+from .view import MatchView
+
 _LOGGER = logging.getLogger(__name__)
 
 
 class AutoDartsBaseCoordinator(DataUpdateCoordinator):
     __child__ = None
-
-    def __init__(self, hass, session):
+    __store__ = None
+    __channel__ = None
+    __topic_channel__ = None
+
+    def __init__(
+        self,
+        hass,
+        session,
+        coalesce_window=DEFAULT_COALESCE_WINDOW,
+        socket=None,
+        supervisor=None,
+        flights=None,
+        telemetry=None,
+        profiler=None,
+        recorder=None,
+    ):
         """Initialize my coordinator."""
         super().__init__(
             hass,
@@ -23,46 +69,121 @@ class AutoDartsBaseCoordinator(DataUpdateCoordinator):
 
         self.session = session
         self.item = None
+        self.view = None
         self._unregister_cb = []
+        # account websocket shared by every board, None for a socket per item
+        self.socket = socket
+        self._subscribed = False
         self.is_waiting = asyncio.Event()
 
+        # websocket coalescing, window in ms, 0 to publish every message
+        self.coalesce_window = coalesce_window
+        self.messages_received = 0
+        self.updates_published = 0
+        self.store = self.__store__()
+        self._pending = False
+        self._hold = 0
+        self._published = None
+        self._cancel_flush = None
+        self._frame_listeners = []
+        # published instead of the live store while a recording is replayed
+        self._replay_store = None
+
+        self.supervisor = supervisor or ReconnectSupervisor(hass)
+        self.supervisor.attach(self)
+        # board and match coordinators share fetches of the same resources
+        self.flights = flights or SingleFlight()
+        self.telemetry = telemetry or Telemetry()
+        # opt-in, None when profiling is disabled
+        self.profiler = profiler
+        # opt-in, None when traffic is not recorded
+        self.recorder = recorder
+        self._received_at = None
+
     @property
     def connected(self):
-        return True if self.item and self.item.is_connected else False
+        if not self.item:
+            return False
+        if self.socket is not None:
+            return self._subscribed and self.socket.connected
+        return True if self.item.is_connected else False
 
     def connect(self):
         if self.item and not self.connected:
-            self._unregister_cb.append(
-                self.item.register_callback(self.on_state_updated)
-            )
-            self._unregister_cb.append(
-                self.item.register_async_callback(
-                    self.on_unexpected_close, event="error", topic="events"
+            if not self._subscribed:
+                on_state_updated = self.profiled(
+                    "on_state_updated", self.on_state_updated
                 )
-            )
-            self._unregister_cb.append(
-                self.item.register_async_callback(
-                    self.on_unexpected_close, event="disconnected", topic="events"
+                on_unexpected_close = self.profiled(
+                    "on_unexpected_close", self.on_unexpected_close
                 )
-            )
+                self._unregister_cb.append(self.register_callback(on_state_updated))
+                self._unregister_cb.append(
+                    self.register_async_callback(
+                        on_unexpected_close, event="error", topic="events"
+                    )
+                )
+                self._unregister_cb.append(
+                    self.register_async_callback(
+                        on_unexpected_close, event="disconnected", topic="events"
+                    )
+                )
+                self._subscribed = True
+            self.reconnect()
+
+    def reconnect(self):
+        """Open the socket of the item again, the account one if shared."""
+        if self.socket is not None:
+            self.socket.connect()
+        else:
             self.item.connect()
 
+    def register_callback(self, handler):
+        """Call handler(state) for every state frame of the item."""
+        if self.socket is None:
+            return self.item.register_callback(handler)
+        return self.socket.register_callback(
+            self.__topic_channel__, f"{self.item.id}.state", handler
+        )
+
+    def register_async_callback(self, handler, event=None, topic="events"):
+        """Call handler(data) for event of the item topic, like the library does."""
+        if self.socket is None:
+            return self.item.register_async_callback(handler, event=event, topic=topic)
+        return self.socket.register_callback(
+            self.__topic_channel__, f"{self.item.id}.{topic}", handler, event
+        )
+
+    def profiled(self, name, func):
+        """Return func timed by the profiler, if profiling is enabled."""
+        if self.profiler is None:
+            return func
+        return self.profiler.wrap(f"{self.name}.{name}", func)
+
     def disconnect(self):
-        if self.item and self.connected:
+        self.supervisor.cancel(self)
+        if self.item and self._subscribed:
             while self._unregister_cb:
                 cb = self._unregister_cb.pop()
                 cb()
-            self.item.disconnect()
+            self._subscribed = False
+            if self.socket is None and self.item.is_connected:
+                self.item.disconnect()
 
     def load(self, item, forward_state=True):
         if self.item:
             self.unload()
+        # frames are diffed against the loaded state, not replayed from scratch
+        self.store.reset(item.state)
         self.item = item
         if forward_state:
             self.async_set_updated_data(item)
 
     def unload(self):
         self.disconnect()
+        self.cancel_pending()
+        self.store.clear()
+        self._published = None
         self.item = None
         self.async_set_updated_data(None)
 
@@ -71,41 +192,302 @@ class AutoDartsBaseCoordinator(DataUpdateCoordinator):
             await self.item.async_load()
             self.async_set_updated_data(self.item)
 
+    async def async_resync(self):
+        """Load the item and apply its state like a frame, held updates included."""
+        if self.item:
+            await self.async_load_item()
+            self.apply_frame(self.item.state)
+
+    async def async_load_item(self):
+        """Load the current state of the item from the REST api."""
+        await self.item.async_load()
+
     @callback
     def on_state_updated(self, msg):
-        item = self.__child__(msg, self.session)
-        self.async_set_updated_data(item)
+        now = time.monotonic()
+        if self.recorder is not None:
+            self.recorder.record(self.__channel__, msg)
+        self.messages_received += 1
+        self.telemetry.message_received(now)
+        self.supervisor.connection_ok(self)
+        self.apply_frame(msg, now)
+
+    @callback
+    def apply_frame(self, msg, now=None):
+        """Store a frame and publish it, coalesced, whatever its source."""
+        now = now or time.monotonic()
+        previous = self.store.state
+        if not (changed := self.store.apply(msg)):
+            return
+        for listener in self._frame_listeners:
+            listener(previous, self.store.state, changed)
+        if self._replay_store is None:
+            self._schedule_flush(changed, now)
+
+    @callback
+    def _schedule_flush(self, changed, now=None):
+        """Publish the published store now or after the window, by what changed.
+
+        now is when the frame was received, None for a frame not timed.
+        """
+        if self._received_at is None:
+            self._received_at = now
+        self._pending = True
+        if self.coalesce_window <= 0 or self.is_flush_event(changed):
+            self.flush()
+        elif self._cancel_flush is None:
+            self._cancel_flush = async_call_later(
+                self.hass,
+                self.coalesce_window / 1000,
+                self.profiled("flush", self._on_flush_timer),
+            )
+
+    @property
+    def published_store(self):
+        """Return the store entities are published from, the replay one if any."""
+        if self._replay_store is not None:
+            return self._replay_store
+        return self.store
+
+    @contextmanager
+    def replaying(self):
+        """Publish frames given to replay_frame instead of the live state.
+
+        Replayed frames go to a store of their own: frame listeners, the
+        traffic recorder and the live state never see them. Live frames are
+        still stored and listened to, the live state, or None, is published
+        again at the end.
+        """
+        # a live state waiting for the window is not mixed with the replay
+        self.flush()
+        self._replay_store = self.__store__()
+        self._published = None
+        try:
+            yield
+        finally:
+            self._replay_store = None
+            self._published = None
+            self._pending = True
+            self.flush()
+
+    @callback
+    def replay_frame(self, msg):
+        """Publish a recorded frame within replaying(), coalesced as a live one."""
+        if self._replay_store is None or not (changed := self._replay_store.apply(msg)):
+            return
+        # replayed frames are left out of the latency telemetry
+        self._schedule_flush(changed)
+
+    async def async_command(self, action, coro, data=None):
+        """Send a command to the cloud, every outgoing command goes through here.
+
+        The command is timed and recorded, data is what is recorded of its
+        arguments.
+        """
+        if self.recorder is not None:
+            self.recorder.record(self.__channel__, data or {}, command=action)
+        return await self.telemetry.async_timed(action, coro)
+
+    @callback
+    def async_add_frame_listener(self, listener):
+        """Call listener(previous, state, changed) for every frame changing the state."""
+        self._frame_listeners.append(listener)
+
+        @callback
+        def remove_listener():
+            self._frame_listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def _on_flush_timer(self, _now):
+        self._cancel_flush = None
+        self.flush()
+
+    @callback
+    def flush(self):
+        """Publish the latest stored state, if it changed since last publish."""
+        if self._cancel_flush:
+            self._cancel_flush()
+            self._cancel_flush = None
+        if not self._pending or self._hold:
+            return
+        self._pending = False
+        self._published = self.published_store.state
+        self.updates_published += 1
+        # no live state after a replay, nothing to build an item from
+        state = self.state_to_publish()
+        self.async_set_updated_data(
+            None if state is None else self.__child__(state, self.session)
+        )
+
+    @asynccontextmanager
+    async def async_hold_updates(self):
+        """Publish nothing while in the block, only the latest state at its end."""
+        self._hold += 1
+        try:
+            yield
+        finally:
+            self._hold -= 1
+            if not self._hold:
+                self.flush()
+
+    @callback
+    def cancel_pending(self):
+        """Drop a pending state without publishing it."""
+        if self._cancel_flush:
+            self._cancel_flush()
+            self._cancel_flush = None
+        self._pending = False
+        self._received_at = None
+
+    @callback
+    def restore(self, state):
+        """Publish a persisted state until live data replaces it."""
+        if self.data is None:
+            self.store.apply(state)
+            self.async_set_updated_data(self.__child__(state, self.session))
+
+    def is_flush_event(self, changed):
+        """Return True if changed keys must be published without waiting the window."""
+        return False
+
+    def state_to_publish(self):
+        """Return the state entities are built from, the stored one by default."""
+        return self.published_store.state
+
+    def build_view(self, data):
+        """Return the precomputed snapshot entities render from."""
+        return None
+
+    @callback
+    def async_update_listeners(self):
+        self.view = self.build_view(self.data) if self.data else None
+        super().async_update_listeners()
+        # entities write their state synchronously from the listeners
+        if self._received_at is not None and not self._pending:
+            self.telemetry.write_latency.add(time.monotonic() - self._received_at)
+            self._received_at = None
+
+    async def async_fetch(self, key, factory, ttl=None):
+        """Run a REST fetch once for concurrent callers, timing it by kind."""
+        return await self.flights.async_do(
+            key, lambda: self.telemetry.async_timed(key[0], factory()), ttl=ttl
+        )
+
+    @property
+    def coalesce_stats(self):
+        return {
+            "messages_received": self.messages_received,
+            "updates_published": self.updates_published,
+            "frames_applied": self.store.frames,
+        }
 
     @callback
     def on_unexpected_close(self, msg):
         _LOGGER.warning(f"Unexpected web socket closure {msg}")
-        # reconnect on error or disconnect from host
-        self.item.connect()
+        # reconnect on error or disconnect from host, with backoff
+        self.supervisor.connection_lost(self)
 
 
 class AutoDartsChilBaseCoordinator(AutoDartsBaseCoordinator):
-    def __init__(self, hass, board_coordinator):
-        super().__init__(hass, board_coordinator.item.session)
+    def __init__(self, hass, board_coordinator, **kwargs):
+        super().__init__(
+            hass,
+            board_coordinator.item.session,
+            socket=board_coordinator.socket,
+            supervisor=board_coordinator.supervisor,
+            flights=board_coordinator.flights,
+            telemetry=board_coordinator.telemetry,
+            profiler=board_coordinator.profiler,
+            recorder=board_coordinator.recorder,
+            **kwargs,
+        )
         self.board_coordinator = board_coordinator
 
 
 class AutoDartsBoardCoordinator(AutoDartsBaseCoordinator):
     __child__ = CloudBoard
+    __store__ = BoardStore
+    __channel__ = "board"
+    __topic_channel__ = "autodarts.boards"
 
-    def __init__(self, hass, session, id):
+    def __init__(self, hass, session, id, **kwargs):
         self.id = id
-        super().__init__(hass, session)
+        super().__init__(hass, session, **kwargs)
+        # board manager client, when the board is also followed on the LAN
+        self.local = None
+        # latest board manager values, kept over cloud frames
+        self._local_values = {}
+
+    def is_flush_event(self, changed):
+        # board status (throw, takeout, ...) is what automations wait for
+        return self._published is None or bool(changed & {"status", "event"})
+
+    @callback
+    def apply_frame(self, msg, now=None):
+        # the board manager on the LAN is ahead of the cloud for its own keys
+        if self._local_values:
+            msg = {**msg, **self._local_values}
+        super().apply_frame(msg, now)
+
+    @callback
+    def apply_local(self, values):
+        """Apply board manager values, kept over cloud frames until clear_local()."""
+        self._local_values = values
+        if (state := self.store.state) is not None and any(
+            state.get(key) != value for key, value in values.items()
+        ):
+            self.apply_frame(state)
+
+    @callback
+    def clear_local(self):
+        """Let cloud frames set the board manager values again."""
+        self._local_values = {}
 
     def connect(self):
         super().connect()
         self.async_set_updated_data(self.item)
 
+    async def async_refresh(self):
+        # match end and board reset both ask for a reload of the same board
+        if self.item:
+            await self.async_fetch(
+                ("board load", self.id), self.item.async_load, ttl=BOARD_CACHE_TTL
+            )
+            self.async_set_updated_data(self.item)
+
+    async def async_load_item(self):
+        # a resync wants the state of now, not the one of a cached load
+        self.flights.invalidate(("board load", self.id))
+        await self.async_fetch(
+            ("board load", self.id), self.item.async_load, ttl=BOARD_CACHE_TTL
+        )
+
+    async def async_command(self, action, coro, data=None):
+        try:
+            return await super().async_command(action, coro, data)
+        finally:
+            # a load cached before the command shows the board before it
+            self.flights.invalidate(("board load", self.id))
+
+    async def async_reset(self):
+        await self.async_command("reset", self.item.async_reset())
+
+    async def async_start(self):
+        await self.async_command("start", self.item.async_start())
+
+    async def async_stop(self):
+        await self.async_command("stop", self.item.async_stop())
+
     def disconnect(self):
         super().disconnect()
         self.async_set_updated_data(self.item)
 
     async def _async_update_data(self):
-        board = await self.__child__.from_id(self.session, self.id)
+        board = await self.async_fetch(
+            ("board", self.id), lambda: self.__child__.from_id(self.session, self.id)
+        )
         self.load(board, False)
         super().connect()
         return self.item
@@ -113,6 +495,209 @@ class AutoDartsBoardCoordinator(AutoDartsBaseCoordinator):
 
 class AutoDartsGenericMatchCoordinator(AutoDartsChilBaseCoordinator):
     __child__ = Match
+    __store__ = MatchStore
+    __channel__ = "match"
+    __topic_channel__ = "autodarts.matches"
+
+    def __init__(self, hass, board_coordinator, **kwargs):
+        super().__init__(hass, board_coordinator, **kwargs)
+        self.operations = deque(maxlen=OPERATIONS_HISTORY)
+        self._operation_ids = count(1)
+
+    @property
+    def finished(self):
+        """Return True when the live match is finished, whatever is shown."""
+        return bool(self.store.state and self.store.state.get("finished"))
+
+    @property
+    def pending_operations(self):
+        return [operation for operation in self.operations if operation.in_flight]
+
+    def state_to_publish(self):
+        if self._replay_store is not None:
+            return self._replay_store.state
+        return self.expected_state()
+
+    def expected_state(self, state=None):
+        """Return state, the live one by default, with the in flight actions applied."""
+        if state is None:
+            state = self.store.state
+        for operation in self.pending_operations:
+            if operation.apply and state is not None:
+                state = operation.apply(state)
+        return state
+
+    @callback
+    def _publish_operations(self):
+        if self.store.state is None and self.item is not None:
+            # nothing received since the item was loaded, start from its state
+            self.store.reset(self.item.state)
+        if self._hold:
+            # published once, at the end of the hold
+            self._pending = True
+            return
+        if self.published_store.state is not None:
+            self.async_set_updated_data(
+                self.__child__(self.state_to_publish(), self.session)
+            )
+        else:
+            self.async_update_listeners()
+
+    @callback
+    def apply_frame(self, msg, now=None):
+        # an operation is done once a frame shows its effect, sent or not yet
+        # returned, and so are the operations before it
+        operations = self.pending_operations
+        confirmed = max(
+            (
+                idx
+                for idx, operation in enumerate(operations)
+                if operation.expect is not None and operation.expect(msg)
+            ),
+            default=-1,
+        )
+        for operation in operations[: confirmed + 1]:
+            self._end_operation(operation, CONFIRMED)
+        super().apply_frame(msg, now)
+
+    def _end_operation(self, operation, status):
+        operation.status = status
+        if operation.cancel:
+            operation.cancel()
+            operation.cancel = None
+
+    async def async_run_operation(
+        self, action, coro, apply=None, dart=None, command=None, expect=None
+    ):
+        """Run an action on the match, showing its expected effect meanwhile.
+
+        The expected state is published immediately. It is replaced by the
+        first frame matching expect(base), base being the state the action
+        was made on, or rolled back if the action fails or is not echoed
+        within OPTIMISTIC_TIMEOUT seconds. command is what is recorded of the
+        action arguments.
+        """
+        base = self.expected_state()
+        operation = Operation(
+            next(self._operation_ids),
+            action,
+            apply,
+            dart,
+            expect(base) if expect and base is not None else None,
+        )
+        self.operations.append(operation)
+        self._publish_operations()
+        try:
+            await self.async_command(action, coro, command)
+        except BaseException:
+            # cancelled too, never left shown without its expiry timer
+            if operation.in_flight:
+                self._end_operation(operation, FAILED)
+                self._publish_operations()
+            raise
+
+        if operation.status != PENDING:
+            # echoed before the call returned
+            return
+        if operation.expect is None:
+            # nothing shown to confirm
+            self._end_operation(operation, CONFIRMED)
+            self._publish_operations()
+            return
+        operation.status = SENT
+        self._expire_later(operation)
+
+    def _expire_later(self, operation):
+        @callback
+        def expire(_now):
+            operation.cancel = None
+            if operation.status == SENT:
+                _LOGGER.debug(f"No echo for {operation.action}, rolling back")
+                self._end_operation(operation, EXPIRED)
+                self._publish_operations()
+
+        operation.cancel = async_call_later(self.hass, OPTIMISTIC_TIMEOUT, expire)
+
+    @callback
+    def apply_local_throw(self, segment, dart, turn_id=None):
+        """Show a throw seen by the board on the LAN until the cloud echoes it.
+
+        turn_id is the turn of the previous darts of the same board turn,
+        None for its first dart. Return the id of the turn the throw belongs
+        to, None when it can't be placed yet: no match, or a turn the cloud
+        hasn't started.
+        """
+        state = self.expected_state()
+        if state is None or not (turns := state.get("turns")):
+            return None
+        turn = turns[-1]
+        throws = turn.get("throws") or ()
+        if turn_id is None and dart < len(throws):
+            if segment_key(throws[dart].get("segment")) != segment_key(segment):
+                # still the previous turn, the cloud is behind the board
+                return None
+            # the cloud was first
+            return turn.get("id")
+        if turn_id is not None and turn.get("id") != turn_id:
+            # a new turn meanwhile, the cloud has the dart or dropped it
+            return turn_id
+        operation = Operation(
+            next(self._operation_ids),
+            "local throw",
+            apply_throw(segment, dart, turn.get("id")),
+            dart,
+            expect_throw(state, segment, dart),
+        )
+        operation.status = SENT
+        self.operations.append(operation)
+        self._expire_later(operation)
+        self._publish_operations()
+        return turn.get("id")
+
+    async def async_throw(self, segment, throw_id=None, dart=None):
+        await self.async_run_operation(
+            "throw",
+            self.item.async_throw(segment, throw_id=throw_id),
+            apply_throw(segment, throw_id),
+            throw_id if dart is None else dart,
+            {"segment": segment, "throw_id": throw_id},
+            lambda base: expect_throw(base, segment, throw_id),
+        )
+
+    async def async_undo(self):
+        await self.async_run_operation(
+            "undo", self.item.async_undo(), apply_undo, expect=expect_undo
+        )
+
+    async def async_next(self):
+        if self.finished:
+            await self.async_run_operation("next leg", self.item.async_next_match())
+        else:
+            await self.async_run_operation(
+                "next player",
+                self.item.async_next_player(),
+                apply_next_player,
+                expect=expect_next_player,
+            )
+
+    async def async_finish(self):
+        await self.async_command("finish", self.item.async_finish())
+
+    async def async_abort(self):
+        await self.async_command("abort", self.item.async_abort())
+
+    def build_view(self, data):
+        return MatchView.from_match(data)
+
+    def is_flush_event(self, changed):
+        # turn ending events : next player, bust, new turn, leg or match won
+        if (previous := self._published) is None:
+            return True
+        return bool(
+            changed & {"player", "turnBusted", "finished", "gameFinished"}
+        ) or len(self.published_store.state.get("turns") or ()) != len(
+            previous.get("turns") or ()
+        )
 
 
 class AutoDartsBoardMatchCoordinator(AutoDartsGenericMatchCoordinator):
@@ -128,11 +713,13 @@ class AutoDartsBoardMatchCoordinator(AutoDartsGenericMatchCoordinator):
 
         @callback
         async def on_board_reset(msg):
+            if self.recorder is not None:
+                self.recorder.record("board", msg, event="Manual reset")
             try:
                 await self.board_coordinator.async_refresh()
                 if match_id := self.board_coordinator.item.match_id:
                     if not self.item or (self.item and self.item.id != match_id):
-                        match = await Match.from_id(self.session, match_id)
+                        match = await self.async_fetch_match(match_id)
                         self.load(match)
                         while handler_cb:
                             handler = handler_cb.pop()
@@ -141,45 +728,68 @@ class AutoDartsBoardMatchCoordinator(AutoDartsGenericMatchCoordinator):
                 self.is_waiting.clear()
 
         handler_cb.append(
-            self.board_coordinator.item.register_async_callback(
-                on_board_reset, "Manual reset"
+            self.board_coordinator.register_async_callback(
+                self.profiled("on_board_reset", on_board_reset), "Manual reset"
             )
         )
 
     async def async_refresh(self):
         if match_id := self.board_coordinator.item.match_id:
             if not self.item or (self.item and self.item.id != match_id):
-                match = await Match.from_id(self.session, match_id)
+                match = await self.async_fetch_match(match_id)
                 self.load(match, forward_state=False)
             else:
-                await self.item.async_load()
+                await self.async_fetch(("match load", match_id), self.item.async_load)
         self.async_set_updated_data(self.item)
 
+    async def async_resync(self):
+        if self.item and self.item.id == self.board_coordinator.item.match_id:
+            await super().async_resync()
+        else:
+            # another match started meanwhile
+            await self.async_refresh()
+
+    async def async_load_item(self):
+        await self.async_fetch(("match load", self.item.id), self.item.async_load)
+
     def load(self, item, forward_state=True):
-        async def async_on_match_ended(msg):
-            await self.board_coordinator.async_refresh()
-            self.unload()
-            self.wait()
+        def on_match_ended(event):
+            async def async_on_match_ended(msg):
+                if self.recorder is not None:
+                    self.recorder.record(self.__channel__, msg, event=event)
+                await self.board_coordinator.async_refresh()
+                self.unload()
+                self.wait()
+
+            return self.profiled("async_on_match_ended", async_on_match_ended)
 
         super().load(item, forward_state)
-        self._unregister_cb.append(
-            self.item.register_async_callback(
-                async_on_match_ended, event="delete", topic="events"
-            )
-        )
-        self._unregister_cb.append(
-            self.item.register_async_callback(
-                async_on_match_ended, event="finish", topic="events"
+        for event in ("delete", "finish"):
+            self._unregister_cb.append(
+                self.register_async_callback(
+                    on_match_ended(event), event=event, topic="events"
+                )
             )
-        )
         self.connect()
 
+    async def async_fetch_match(self, match_id):
+        """Fetch a match, sharing any identical request already in flight."""
+        return await self.async_fetch(
+            ("match", match_id), lambda: Match.from_id(self.session, match_id)
+        )
+
+    async def async_discover(self):
+        """Look for the board match without blocking entry setup."""
+        try:
+            self.async_set_updated_data(await self._async_update_data())
+        except Exception as e:  # pylint: disable=broad-except
+            _LOGGER.warning(f"Unable to load board match, waiting for next one : {e}")
+            self.wait()
+
     async def _async_update_data(self):
         if not self.board_coordinator.item.match_id:
             self.wait()
         else:
-            match = await Match.from_id(
-                self.session, self.board_coordinator.item.match_id
-            )
+            match = await self.async_fetch_match(self.board_coordinator.item.match_id)
             self.load(match, False)
         return self.item
@@ -0,0 +1,51 @@
+"""Diagnostics support for autodarts."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_EMAIL, CONF_PASSWORD, "client_secret_key", "token"}
+
+
+def coordinator_diagnostics(coordinator):
+    return {
+        "item": coordinator.item.id if coordinator.item else None,
+        "connected": coordinator.connected,
+        "coalesce_window": coordinator.coalesce_window,
+        **coordinator.coalesce_stats,
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    board_coordinator = data["board_coordinator"]
+    match_coordinator = data["match_coordinator"]
+    profiler = board_coordinator.profiler
+    recorder = board_coordinator.recorder
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "board": coordinator_diagnostics(board_coordinator),
+        "match": {
+            **coordinator_diagnostics(match_coordinator),
+            "operations": [
+                operation.as_dict() for operation in match_coordinator.operations
+            ],
+        },
+        "reconnect": board_coordinator.supervisor.attributes,
+        "socket": socket.attributes if (socket := board_coordinator.socket) else None,
+        "fetches": board_coordinator.flights.stats,
+        "telemetry": board_coordinator.telemetry.as_dict(),
+        "profiling": profiler.as_dict() if profiler else None,
+        "recording": recorder.attributes if recorder else None,
+        "local": local.attributes if (local := board_coordinator.local) else None,
+    }
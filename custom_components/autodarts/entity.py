@@ -26,6 +26,7 @@ class AutoDartEntity(CoordinatorEntity):
         super().__init__(coordinator, context=idx)
         self.coordinator = coordinator
         self.idx = idx
+        self._last_render_key = None
 
     @property
     def name(self):
@@ -59,9 +60,31 @@ class AutoDartEntity(CoordinatorEntity):
             sw_version=self.coordinator.item.version if self.coordinator.item else None,
         )
 
+    def render_key(self):
+        """Return what the state is rendered from, None to write every update.
+
+        Compared with the key of the last write instead of the rendered
+        state, it must be cheap: a slice of the coordinator view, rebuilt
+        immutable on every update.
+        """
+        return None
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
+        if (profiler := self.coordinator.profiler) is not None:
+            with profiler.measure(f"render.{type(self).__name__}"):
+                self._async_render()
+        else:
+            self._async_render()
+
+    @callback
+    def _async_render(self) -> None:
+        """Write the state, unless it is rendered from the same inputs."""
+        key = self.render_key()
+        if key is not None and key == self._last_render_key:
+            return
+        self._last_render_key = key
         self.async_write_ha_state()
 
 
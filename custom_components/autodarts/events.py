@@ -0,0 +1,106 @@
+"""Home Assistant bus events derived from consecutive match states."""
+from __future__ import annotations
+
+from homeassistant.core import callback
+
+from .const import DOMAIN
+from .history import iter_new_throws
+
+EVENT_THROW = f"{DOMAIN}_throw"
+EVENT_BUST = f"{DOMAIN}_bust"
+EVENT_TURN_END = f"{DOMAIN}_turn_end"
+EVENT_LEG_WON = f"{DOMAIN}_leg_won"
+EVENT_MATCH_WON = f"{DOMAIN}_match_won"
+
+
+def player_name(state, idx):
+    try:
+        return state["players"][idx].get("name")
+    except (IndexError, KeyError, TypeError):
+        return None
+
+
+def turn_player(state, turn, default):
+    """Return the index of the player of turn, default when unknown."""
+    if (player_id := turn.get("playerId")) is not None:
+        for idx, player in enumerate(state.get("players") or ()):
+            if player.get("id") == player_id:
+                return idx
+    return default
+
+
+def match_events(previous, state, changed):
+    """Yield (event type, data) for what changed between two match states.
+
+    Nothing happened without a previous state, a loaded match is not
+    played again.
+    """
+    if previous is None:
+        return
+
+    base = {"match_id": state.get("id"), "variant": state.get("variant")}
+    player = state.get("player")
+
+    if "turns" in changed:
+        for turn, dart, throw in iter_new_throws(previous, state):
+            segment = throw.get("segment") or {}
+            thrower = turn_player(state, turn, player)
+            yield EVENT_THROW, {
+                **base,
+                "player": player_name(state, thrower),
+                "player_index": thrower,
+                "round": turn.get("round"),
+                "dart": dart + 1,
+                "segment": segment.get("name"),
+                "number": segment.get("number"),
+                "multiplier": segment.get("multiplier"),
+                "marks": throw.get("marks"),
+            }
+
+    if "turnBusted" in changed and state.get("turnBusted"):
+        yield EVENT_BUST, {
+            **base,
+            "player": player_name(state, player),
+            "player_index": player,
+            "round": state.get("round"),
+        }
+
+    if "player" in changed and (ended := previous.get("player")) is not None:
+        yield EVENT_TURN_END, {
+            **base,
+            "player": player_name(previous, ended),
+            "player_index": ended,
+            "points": previous.get("turnScore"),
+            "busted": previous.get("turnBusted"),
+            "next_player": player_name(state, player),
+        }
+
+    if "gameFinished" in changed and state.get("gameFinished"):
+        yield EVENT_LEG_WON, {
+            **base,
+            "player": player_name(state, player),
+            "player_index": player,
+            "leg": state.get("leg"),
+            "set": state.get("set"),
+        }
+
+    if "finished" in changed and state.get("finished"):
+        winner = state.get("winner")
+        yield EVENT_MATCH_WON, {
+            **base,
+            "player": player_name(state, winner),
+            "player_index": winner,
+        }
+
+
+@callback
+def event_listener(hass, board_id):
+    """Return a match coordinator frame listener firing the match events."""
+
+    @callback
+    def on_frame(previous, state, changed):
+        for event_type, data in match_events(previous, state, changed):
+            data["board_id"] = board_id
+            hass.bus.async_fire(event_type, data)
+
+    return on_frame
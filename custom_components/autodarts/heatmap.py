@@ -0,0 +1,159 @@
+"""Dart coordinate heatmaps, fixed size grids stored memory mapped."""
+from __future__ import annotations
+
+import base64
+from collections import defaultdict
+import logging
+import os
+import zlib
+
+import numpy as np
+
+from aiohttp import web
+
+from homeassistant.components.http.view import HomeAssistantView
+from homeassistant.core import callback
+from homeassistant.util import slugify
+
+from .const import HEATMAP_EXTENT, HEATMAP_SIZE
+from .history import COLUMN_INDEX
+
+_LOGGER = logging.getLogger(__name__)
+
+KINDS = ("board", "player")
+
+
+class HeatmapStore:
+    """All time grids of dart coordinates, per board and per player.
+
+    A grid is a HEATMAP_SIZE square of uint32 counts over
+    [-HEATMAP_EXTENT, HEATMAP_EXTENT] in board coordinates, whatever the
+    number of darts. Grids are numpy memmaps: a dart is one increment in
+    memory, the page cache writes it back and flush only syncs it. An
+    undone or corrected dart is one decrement.
+    """
+
+    def __init__(self, hass, directory, size=HEATMAP_SIZE, extent=HEATMAP_EXTENT):
+        self.hass = hass
+        self.directory = directory
+        self.size = size
+        self.extent = extent
+        self._grids = {}
+        self._pending = defaultdict(list)
+        self._opening = set()
+
+    def _path(self, key):
+        kind, name = key
+        return os.path.join(self.directory, f"{kind}_{slugify(str(name))}.npy")
+
+    def _open(self, key):
+        """Open or create the grid of key, blocking."""
+        path = self._path(key)
+        if os.path.exists(path):
+            grid = np.lib.format.open_memmap(path, mode="r+")
+            if grid.shape == (self.size, self.size):
+                return grid
+            _LOGGER.warning(f"Discarding heatmap {path} of shape {grid.shape}")
+            del grid
+        return np.lib.format.open_memmap(
+            path, mode="w+", dtype=np.uint32, shape=(self.size, self.size)
+        )
+
+    def _open_existing(self):
+        os.makedirs(self.directory, exist_ok=True)
+        for filename in os.listdir(self.directory):
+            kind, _, slug = filename[:-4].partition("_")
+            if filename.endswith(".npy") and kind in KINDS:
+                self._grids[(kind, slug)] = self._open((kind, slug))
+
+    async def async_setup(self):
+        await self.hass.async_add_executor_job(self._open_existing)
+
+    def cell(self, x, y):
+        """Return the (row, column) of a coordinate, None if outside the grid."""
+        scale = self.size / (2 * self.extent)
+        column = int((x + self.extent) * scale)
+        row = int((self.extent - y) * scale)
+        if 0 <= row < self.size and 0 <= column < self.size:
+            return row, column
+
+    @staticmethod
+    def _add(grid, cell, sign):
+        # a dart recorded before the grid existed can't be taken out of it
+        if sign > 0:
+            grid[cell] += 1
+        elif grid[cell] > 0:
+            grid[cell] -= 1
+
+    @callback
+    def record(self, board_id, player, x, y, sign=1):
+        """Count a dart, or uncount it with a negative sign."""
+        if x is None or y is None or (cell := self.cell(x, y)) is None:
+            return
+        for key in (("board", slugify(str(board_id))), ("player", slugify(str(player)))):
+            if (grid := self._grids.get(key)) is not None:
+                self._add(grid, cell, sign)
+            else:
+                self._pending[key].append((cell, sign))
+                if key not in self._opening:
+                    self._opening.add(key)
+                    self.hass.async_create_task(self._async_open(key))
+
+    async def _async_open(self, key):
+        try:
+            grid = await self.hass.async_add_executor_job(self._open, key)
+        finally:
+            self._opening.discard(key)
+        for cell, sign in self._pending.pop(key, ()):
+            self._add(grid, cell, sign)
+        self._grids[key] = grid
+
+    @callback
+    def history_listener(self):
+        """Return a history listener adding and removing throws of the heatmaps."""
+        board, player = COLUMN_INDEX["board_id"], COLUMN_INDEX["player"]
+        x, y = COLUMN_INDEX["x"], COLUMN_INDEX["y"]
+
+        @callback
+        def on_throw(row, sign):
+            self.record(row[board], row[player], row[x], row[y], sign)
+
+        return on_throw
+
+    def _flush(self, grids):
+        for grid in grids:
+            grid.flush()
+
+    async def async_flush(self, _now=None):
+        await self.hass.async_add_executor_job(self._flush, list(self._grids.values()))
+
+    def payload(self, kind, name):
+        """Return the grid as zlib compressed little endian uint32, base64 encoded."""
+        grid = self._grids.get((kind, slugify(name)))
+        if grid is None:
+            grid = np.zeros((self.size, self.size), dtype=np.uint32)
+        data = np.ascontiguousarray(grid, dtype="<u4").tobytes()
+        return {
+            "size": self.size,
+            "extent": self.extent,
+            "total": int(grid.sum()),
+            "max": int(grid.max()),
+            "encoding": "zlib+base64",
+            "dtype": "uint32le",
+            "grid": base64.b64encode(zlib.compress(data)).decode(),
+        }
+
+
+class HeatmapView(HomeAssistantView):
+    """Return a heatmap for a dashboard card."""
+
+    url = "/api/autodarts/heatmap/{kind}/{name}"
+    name = "api:autodarts:heatmap"
+
+    def __init__(self, store):
+        self.store = store
+
+    async def get(self, request, kind, name):
+        if kind not in KINDS:
+            raise web.HTTPNotFound()
+        return self.json(self.store.payload(kind, name))
@@ -0,0 +1,440 @@
+"""Local throw history, in a sqlite database of the config directory."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from itertools import islice
+import json
+import logging
+import sqlite3
+import time
+
+import numpy as np
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import HISTORY_BATCH_SIZE, HISTORY_FLUSH_DELAY, HISTORY_MAX_QUEUE
+from .statistics import PERIODS, RECORD
+
+_LOGGER = logging.getLogger(__name__)
+
+COLUMNS = (
+    "match_id",
+    "turn_id",
+    "dart",
+    "board_id",
+    "player_id",
+    "player",
+    "variant",
+    "round",
+    "segment",
+    "number",
+    "multiplier",
+    "bed",
+    "x",
+    "y",
+    "marks",
+    "entry",
+    "remaining",
+    "busted",
+    "timestamp",
+)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS throws (
+    match_id TEXT NOT NULL,
+    turn_id TEXT NOT NULL,
+    dart INTEGER NOT NULL,
+    board_id TEXT,
+    player_id TEXT,
+    player TEXT,
+    variant TEXT,
+    round INTEGER,
+    segment TEXT,
+    number INTEGER,
+    multiplier INTEGER,
+    bed TEXT,
+    x REAL,
+    y REAL,
+    marks INTEGER,
+    entry TEXT,
+    remaining INTEGER,
+    busted INTEGER,
+    timestamp REAL NOT NULL,
+    PRIMARY KEY (match_id, turn_id, dart)
+);
+CREATE INDEX IF NOT EXISTS throws_player ON throws (player_id, timestamp);
+CREATE INDEX IF NOT EXISTS throws_timestamp ON throws (timestamp);
+CREATE TABLE IF NOT EXISTS statistics_cache (
+    last_rowid INTEGER NOT NULL,
+    sums TEXT NOT NULL
+);
+"""
+
+# columns read by the statistics engine
+STATISTICS_COLUMNS = (
+    "player",
+    "variant",
+    "round",
+    "number",
+    "multiplier",
+    "marks",
+    "remaining",
+    "busted",
+    "timestamp",
+)
+STATISTICS_INDEXES = tuple(COLUMNS.index(column) for column in STATISTICS_COLUMNS)
+# the same columns as statistics RECORD fields, read straight into arrays
+STATISTICS_SELECT = (
+    "COALESCE(player, '')",
+    "COALESCE(variant = 'Cricket', 0)",
+    "COALESCE(round, 0)",
+    "COALESCE(number, 0)",
+    "COALESCE(multiplier, 0)",
+    "COALESCE(marks, 0)",
+    "COALESCE(remaining, -1)",
+    "COALESCE(busted, 0)",
+    "timestamp",
+)
+COLUMN_INDEX = {column: idx for idx, column in enumerate(COLUMNS)}
+
+KEY_SIZE = 3  # match_id, turn_id, dart
+
+# a corrected dart updates the recorded one, keeping when it was thrown
+UPSERT = (
+    f"INSERT INTO throws ({', '.join(COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(COLUMNS))}) "
+    f"ON CONFLICT (match_id, turn_id, dart) DO UPDATE SET "
+    + ", ".join(
+        f"{column} = excluded.{column}"
+        for column in COLUMNS[KEY_SIZE:]
+        if column != "timestamp"
+    )
+)
+DELETE = "DELETE FROM throws WHERE match_id = ? AND turn_id = ? AND dart = ?"
+
+# timestamps of the throws recorded by this process, for corrections
+MAX_TIMESTAMPS = 10000
+
+
+def iter_changed_turns(previous, state):
+    """Yield (old turn, turn) of turns added, changed or removed by a frame.
+
+    A missing turn is None. Only turns which differ from the previous state
+    are looked at, from the last one, that is the last one or two of a
+    match. Nothing is yielded without a previous state: a state loaded
+    from the api is a baseline, not a change.
+    """
+    if previous is None:
+        return
+    turns = state.get("turns") or ()
+    old_turns = previous.get("turns") or ()
+    for idx in range(max(len(turns), len(old_turns)) - 1, -1, -1):
+        turn = turns[idx] if idx < len(turns) else None
+        old = old_turns[idx] if idx < len(old_turns) else None
+        if turn is old or turn == old:
+            break
+        yield old, turn
+
+
+def iter_new_throws(previous, state):
+    """Yield (turn, dart index, throw) of throws added or changed by a frame."""
+    for old, turn in reversed(list(iter_changed_turns(previous, state))):
+        if turn is None:
+            continue
+        old_throws = (old or {}).get("throws") or ()
+        for dart, throw in enumerate(turn.get("throws") or ()):
+            if dart >= len(old_throws) or old_throws[dart] != throw:
+                yield turn, dart, throw
+
+
+def iter_removed_throws(previous, state):
+    """Yield (old turn, dart index, throw) of throws removed or changed by a frame."""
+    for old, turn in reversed(list(iter_changed_turns(previous, state))):
+        if old is None:
+            continue
+        throws = (turn or {}).get("throws") or ()
+        for dart, throw in enumerate(old.get("throws") or ()):
+            if dart >= len(throws) or throws[dart] != throw:
+                yield old, dart, throw
+
+
+def segment_points(segment):
+    return (segment.get("number") or 0) * (segment.get("multiplier") or 0)
+
+
+def throw_row(board_id, state, turn, dart, throw):
+    players = {player.get("id"): player.get("name") for player in state["players"]}
+    segment = throw.get("segment") or {}
+    coords = throw.get("coords") or {}
+    # X01 score left before this dart, turn score is the one at turn start
+    if (remaining := turn.get("score")) is not None:
+        for previous in turn["throws"][:dart]:
+            remaining -= segment_points(previous.get("segment") or {})
+    return (
+        state.get("id"),
+        turn.get("id"),
+        dart,
+        board_id,
+        turn.get("playerId"),
+        players.get(turn.get("playerId")),
+        state.get("variant"),
+        turn.get("round"),
+        segment.get("name"),
+        segment.get("number"),
+        segment.get("multiplier"),
+        segment.get("bed"),
+        coords.get("x"),
+        coords.get("y"),
+        throw.get("marks"),
+        throw.get("entry"),
+        remaining,
+        1 if turn.get("busted") else 0,
+        time.time(),
+    )
+
+
+def turn_rows(board_id, state, turn):
+    """Return the rows of the throws of turn by key, none for no turn."""
+    if turn is None:
+        return {}
+    rows = (
+        throw_row(board_id, state, turn, dart, throw)
+        for dart, throw in enumerate(turn.get("throws") or ())
+    )
+    return {row[:KEY_SIZE]: row for row in rows}
+
+
+def statistics_listener(engine):
+    """Return a history listener feeding a statistics engine."""
+
+    @callback
+    def on_throw(row, sign):
+        engine.record(tuple(row[idx] for idx in STATISTICS_INDEXES), sign)
+
+    return on_throw
+
+
+class ThrowHistory:
+    """Store of every throw, following undo and corrections.
+
+    Throws are queued in memory and written by batch in an executor, so the
+    event loop never waits on the disk. The queue is bounded, when the disk
+    can't keep up the oldest throws are dropped.
+
+    Listeners see a throw as a row added (sign 1) or removed (sign -1), a
+    correction is the old row removed then the new one added.
+
+    All time statistics are saved with the rowid they cover when closing,
+    the next start only reads the throws after it, and today's ones. The
+    saved sums are deleted once loaded: after a crash, or a lost throw,
+    the whole history is read again.
+    """
+
+    def __init__(self, hass, db_path, max_queue=HISTORY_MAX_QUEUE):
+        self.hass = hass
+        self.db_path = db_path
+        self.queue = deque(maxlen=max_queue)
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._db = None
+        self._statistics = None
+        self._lock = asyncio.Lock()
+        self._cancel_flush = None
+        self._listeners = []
+        # throws loaded before this process started are older than this
+        self._started = time.time()
+        self._timestamps = {}
+
+    def _open(self):
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(throws)")}
+        if "busted" not in columns:
+            with self._db:
+                self._db.execute("ALTER TABLE throws ADD COLUMN busted INTEGER")
+
+    def _write(self, operations):
+        with self._db:
+            for sql, params in operations:
+                self._db.execute(sql, params)
+
+    def _close(self):
+        if self._db:
+            self._db.close()
+            self._db = None
+
+    async def async_setup(self):
+        await self.hass.async_add_executor_job(self._open)
+
+    def _feed(self, engine, where, params, chunk, periods=PERIODS):
+        cursor = self._db.execute(
+            f"SELECT {', '.join(STATISTICS_SELECT)} FROM throws WHERE {where}", params
+        )
+        while rows := cursor.fetchmany(chunk):
+            engine.add_records(np.array(rows, dtype=RECORD), periods=periods)
+
+    def _load_statistics(self, engine, chunk=50000):
+        last_rowid = 0
+        row = self._db.execute("SELECT last_rowid, sums FROM statistics_cache").fetchone()
+        if row is not None:
+            try:
+                loaded = engine.load_all_time_sums(json.loads(row[1]))
+            except (ValueError, KeyError, TypeError):
+                loaded = False
+            if loaded:
+                last_rowid = row[0]
+                # throws of the saved sums still count for today and the session
+                self._feed(
+                    engine,
+                    "rowid <= ? AND timestamp >= ?",
+                    (last_rowid, min(engine.day, engine.session_start)),
+                    chunk,
+                    ("day", "session"),
+                )
+        self._feed(engine, "rowid > ?", (last_rowid,), chunk)
+        with self._db:
+            self._db.execute("DELETE FROM statistics_cache")
+
+    def _save_statistics(self, sums):
+        last_rowid = self._db.execute("SELECT MAX(rowid) FROM throws").fetchone()[0]
+        with self._db:
+            self._db.execute("DELETE FROM statistics_cache")
+            self._db.execute(
+                "INSERT INTO statistics_cache VALUES (?, ?)",
+                (last_rowid or 0, json.dumps(sums)),
+            )
+
+    async def async_load_statistics(self, engine):
+        """Feed the history to a statistics engine, kept up to date by listeners.
+
+        Loaded in an executor, the engine only counts live throws once done.
+        """
+        engine.loading = True
+        try:
+            async with self._lock:
+                await self.hass.async_add_executor_job(self._load_statistics, engine)
+        finally:
+            engine.loading = False
+        self._statistics = engine
+
+    @callback
+    def async_add_listener(self, listener):
+        """Call listener(row, sign) for every recorded or removed throw.
+
+        row is in COLUMNS order, sign is 1 for a recorded throw, -1 for a
+        removed one.
+        """
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener():
+            self._listeners.remove(listener)
+
+        return remove_listener
+
+    def _timestamp(self, key, default):
+        if len(self._timestamps) >= MAX_TIMESTAMPS:
+            for old in list(islice(self._timestamps, MAX_TIMESTAMPS // 2)):
+                del self._timestamps[old]
+        return self._timestamps.setdefault(key, default)
+
+    @callback
+    def record(self, row, replaced=None):
+        """Record a throw, replaced is the row of the throw it corrects."""
+        key = row[:KEY_SIZE]
+        timestamp = self._timestamp(
+            key, self._started - 1 if replaced is not None else row[-1]
+        )
+        row = row[:-1] + (timestamp,)
+        if replaced is not None:
+            self._notify(replaced[:-1] + (timestamp,), -1)
+        self._notify(row, 1)
+        self._queue((UPSERT, row))
+
+    @callback
+    def remove(self, row):
+        """Remove an undone throw."""
+        key = row[:KEY_SIZE]
+        timestamp = self._timestamps.pop(key, self._started - 1)
+        self._notify(row[:-1] + (timestamp,), -1)
+        self._queue((DELETE, key))
+
+    def _notify(self, row, sign):
+        for listener in self._listeners:
+            listener(row, sign)
+
+    def _queue(self, operation):
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(operation)
+        if len(self.queue) >= HISTORY_BATCH_SIZE:
+            self.hass.async_create_task(self.async_flush())
+        elif self._cancel_flush is None:
+            self._cancel_flush = async_call_later(
+                self.hass, HISTORY_FLUSH_DELAY, self._on_flush_timer
+            )
+
+    @callback
+    def frame_listener(self, board_id):
+        """Return a match coordinator frame listener recording its throws."""
+
+        @callback
+        def on_frame(previous, state, changed):
+            if previous is None or "turns" not in changed:
+                return
+            for old_turn, turn in reversed(list(iter_changed_turns(previous, state))):
+                old_rows = turn_rows(board_id, previous, old_turn)
+                rows = turn_rows(board_id, state, turn)
+                for key, old in old_rows.items():
+                    if key not in rows:
+                        self.remove(old)
+                for key, row in rows.items():
+                    if (old := old_rows.get(key)) is None:
+                        self.record(row)
+                    elif old[:-1] != row[:-1]:
+                        self.record(row, old)
+
+        return on_frame
+
+    @callback
+    def _on_flush_timer(self, _now):
+        self._cancel_flush = None
+        self.hass.async_create_task(self.async_flush())
+
+    async def async_flush(self):
+        async with self._lock:
+            if self._cancel_flush:
+                self._cancel_flush()
+                self._cancel_flush = None
+            if not self.queue or self._db is None:
+                return
+            operations = list(self.queue)
+            self.queue.clear()
+            try:
+                await self.hass.async_add_executor_job(self._write, operations)
+            except sqlite3.Error as e:
+                self.failed += len(operations)
+                _LOGGER.error(f"Unable to write {len(operations)} throws : {e}")
+            else:
+                self.written += len(operations)
+
+    async def async_close(self, _event=None):
+        await self.async_flush()
+        async with self._lock:
+            # sums only match the database if every throw made it there
+            if (
+                self._statistics is not None
+                and self._db is not None
+                and not self.dropped
+                and not self.failed
+            ):
+                try:
+                    await self.hass.async_add_executor_job(
+                        self._save_statistics, self._statistics.all_time_sums()
+                    )
+                except sqlite3.Error as e:
+                    _LOGGER.warning(f"Unable to save throw statistics : {e}")
+            await self.hass.async_add_executor_job(self._close)
@@ -0,0 +1,152 @@
+"""Board manager client on the LAN, for throws without the cloud round trip."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+
+import aiohttp
+
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    LOCAL_EVENTS_PATH,
+    LOCAL_PORT,
+    RECONNECT_BASE_DELAY,
+    RECONNECT_MAX_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# board manager state keys mirrored in the cloud board state
+BOARD_KEYS = ("connected", "status", "event", "numThrows")
+
+
+class LocalBoardClient:
+    """Follow the board manager websocket on the LAN.
+
+    Board status is applied to the board coordinator, and kept over the
+    slower cloud frames while connected, and detected throws are shown on
+    the match right away, until the cloud state confirms them. The cloud
+    stays in charge of the match: a throw not echoed by the cloud is rolled
+    back like any other optimistic update.
+    """
+
+    def __init__(
+        self, hass, board_coordinator, match_coordinator, host, port=LOCAL_PORT
+    ):
+        self.hass = hass
+        self.board_coordinator = board_coordinator
+        self.match_coordinator = match_coordinator
+        self.url = f"ws://{host}:{port}{LOCAL_EVENTS_PATH}"
+        self.connected = False
+        self.messages = 0
+        self.throws = 0
+        self.reconnects = 0
+        self.last_error = None
+        self._seen = 0
+        # cloud turn of the darts seen since the last takeout
+        self._turn = None
+        self._task = None
+
+    @property
+    def attributes(self):
+        return {
+            "url": self.url,
+            "connected": self.connected,
+            "messages": self.messages,
+            "throws": self.throws,
+            "reconnects": self.reconnects,
+            "last_error": self.last_error,
+        }
+
+    @callback
+    def start(self, entry):
+        self._task = entry.async_create_background_task(
+            self.hass, self._async_run(), f"autodarts local board {self.url}"
+        )
+
+    @callback
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _async_run(self):
+        session = async_get_clientsession(self.hass)
+        failures = 0
+        while True:
+            try:
+                async with session.ws_connect(self.url, heartbeat=30) as ws:
+                    if failures:
+                        self.reconnects += 1
+                    failures = 0
+                    self.connected = True
+                    _LOGGER.debug(f"Connected to board manager {self.url}")
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            self._handle(msg.data)
+                        elif msg.type == aiohttp.WSMsgType.ERROR:
+                            break
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                self.last_error = str(e) or type(e).__name__
+                _LOGGER.debug(f"Board manager {self.url} unavailable : {e}")
+            except Exception as e:  # pylint: disable=broad-except
+                # reconnected like any other failure, never the end of the task
+                self.last_error = str(e) or type(e).__name__
+                _LOGGER.exception(f"Unexpected error on board manager {self.url}")
+            finally:
+                self.connected = False
+                self.board_coordinator.clear_local()
+            failures += 1
+            delay = min(
+                RECONNECT_MAX_DELAY, RECONNECT_BASE_DELAY * 2 ** (failures - 1)
+            )
+            await asyncio.sleep(delay / 2 + random.uniform(0, delay / 2))
+
+    @callback
+    def _handle(self, data):
+        """Apply a websocket message, its errors are logged and skipped."""
+        try:
+            message = json.loads(data)
+        except ValueError:
+            _LOGGER.debug(f"Invalid board manager message {data!r}")
+            return
+        try:
+            self.on_message(message)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception(f"Error applying board manager message {data!r}")
+
+    @callback
+    def on_message(self, message):
+        """Apply a board manager state message."""
+        if not isinstance(message, dict):
+            return
+        state = message.get("data", message)
+        if not isinstance(state, dict):
+            return
+        self.messages += 1
+
+        # board keys over the cloud state, the rest is cloud only
+        self.board_coordinator.apply_local(
+            {key: state[key] for key in BOARD_KEYS if key in state}
+        )
+
+        throws = state.get("throws") or ()
+        if len(throws) < self._seen:
+            # takeout, a new turn starts
+            self._seen = 0
+            self._turn = None
+        for dart in range(self._seen, min(len(throws), 3)):
+            if segment := throws[dart].get("segment"):
+                turn = self.match_coordinator.apply_local_throw(
+                    segment, dart, self._turn
+                )
+                if turn is None:
+                    # no match or turn yet, shown with the next message
+                    break
+                self._turn = turn
+                self.throws += 1
+            self._seen = dart + 1
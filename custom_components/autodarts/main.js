@@ -54,10 +54,45 @@ const preProcessIcon = async (iconSet, iconName) => {
   return { viewBox, path, paths, format, fullCode };
 };
 
+const ICON_SETS = {};
+
+// Whole icon set, parsed server side, in a single request
+const loadIconSet = (iconSet) => {
+  if (!ICON_SETS[iconSet]) {
+    // revalidated with its etag, icons may be edited at runtime
+    ICON_SETS[iconSet] = fetch(`/${DOMAIN}/iconset/${iconSet}`)
+      .then((data) => (data.ok ? data.json() : {}))
+      .catch(() => ({}))
+      .then((icons) => {
+        for (const [name, icon] of Object.entries(icons)) {
+          const paths = {};
+          if (icon.primary) paths.primary = icon.primary;
+          if (icon.secondary) paths.secondary = icon.secondary;
+          ICON_STORE[`${iconSet}:${name}`] = Promise.resolve({
+            viewBox: icon.viewBox,
+            path: icon.path,
+            paths,
+          });
+        }
+      });
+  }
+  return ICON_SETS[iconSet];
+};
+
 const getIcon = (iconSet, iconName) => {
   return new Promise(async (resolve, reject) => {
     const icon = `${iconSet}:${iconName}`;
-    if (ICON_STORE[icon]) resolve(ICON_STORE[icon]);
+    const [name, format] = iconName.split("#");
+
+    // fullcolor needs the svg element itself, not in the bundle
+    if (!ICON_STORE[icon] && format !== "fullcolor") {
+      await loadIconSet(iconSet);
+      const bundled = ICON_STORE[`${iconSet}:${name}`];
+      if (bundled && format) {
+        ICON_STORE[icon] = bundled.then((data) => ({ ...data, format }));
+      }
+    }
+    if (ICON_STORE[icon]) return resolve(ICON_STORE[icon]);
 
     ICON_STORE[icon] = preProcessIcon(iconSet, iconName);
 
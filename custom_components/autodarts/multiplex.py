@@ -0,0 +1,174 @@
+"""One cloud websocket per account, multiplexing the topics of every board."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+
+import aiohttp
+
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MultiplexSocket:
+    """Websocket shared by the board and match coordinators of an account.
+
+    Coordinators register callbacks by channel and topic, like they would on
+    a library item. A topic is subscribed with its first callback and
+    unsubscribed with its last one, every frame is dispatched to the
+    callbacks of its topic. The socket does not reconnect by itself: once
+    closed, a disconnected event is sent on every events topic and the
+    reconnect supervisors of the boards call connect() again.
+    """
+
+    def __init__(self, hass, url, token):
+        self.hass = hass
+        self.url = url
+        # returns the current access token, read on every connection
+        self._token = token
+        self._callbacks = {}
+        self._ws = None
+        self._task = None
+        self._closing = False
+        self.connections = 0
+        self.messages = 0
+
+    @property
+    def connected(self):
+        return self._ws is not None and not self._ws.closed
+
+    @property
+    def attributes(self):
+        return {
+            "url": self.url,
+            "connected": self.connected,
+            "topics": len(self._callbacks),
+            "connections": self.connections,
+            "messages": self.messages,
+        }
+
+    @callback
+    def register_callback(self, channel, topic, handler, event=None):
+        """Call handler(data) for frames of topic, only event ones if event is set.
+
+        handler may be a coroutine function. Return the unregister function.
+        """
+        key = (channel, topic)
+        entry = (handler, event)
+        callbacks = self._callbacks.setdefault(key, [])
+        callbacks.append(entry)
+        if len(callbacks) == 1:
+            self._send({"type": "subscribe", "channel": channel, "topic": topic})
+
+        @callback
+        def unregister():
+            callbacks.remove(entry)
+            if callbacks:
+                return
+            del self._callbacks[key]
+            self._send({"type": "unsubscribe", "channel": channel, "topic": topic})
+            if not self._callbacks:
+                self.disconnect()
+
+        return unregister
+
+    @callback
+    def connect(self):
+        """Open the socket, unless it is already open or opening."""
+        if self._task is not None or not self._callbacks:
+            return
+        self._closing = False
+        self._task = self.hass.async_create_background_task(
+            self._async_run(), f"autodarts websocket {self.url}"
+        )
+
+    @callback
+    def disconnect(self):
+        self._closing = True
+        self._ws = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _async_run(self):
+        session = async_get_clientsession(self.hass)
+        headers = {}
+        if token := self._token():
+            headers[aiohttp.hdrs.AUTHORIZATION] = f"Bearer {token}"
+        try:
+            async with session.ws_connect(
+                self.url, headers=headers, heartbeat=30
+            ) as ws:
+                self._ws = ws
+                self.connections += 1
+                for channel, topic in list(self._callbacks):
+                    await ws.send_json(
+                        {"type": "subscribe", "channel": channel, "topic": topic}
+                    )
+                async for msg in ws:
+                    if msg.type == aiohttp.WSMsgType.TEXT:
+                        try:
+                            message = json.loads(msg.data)
+                        except ValueError:
+                            _LOGGER.debug(f"Invalid websocket message {msg.data!r}")
+                            continue
+                        self._dispatch(message)
+                    elif msg.type == aiohttp.WSMsgType.ERROR:
+                        break
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            _LOGGER.debug(f"Websocket {self.url} closed : {e}")
+        except Exception:  # pylint: disable=broad-except
+            # still a closed socket, the supervisors are told below
+            _LOGGER.exception(f"Unexpected error on websocket {self.url}")
+        finally:
+            # a disconnect may have started another connection meanwhile
+            if self._task is asyncio.current_task():
+                self._ws = None
+                self._task = None
+        if not self._closing:
+            self._dispatch_all_events({"event": "disconnected"})
+
+    def _send(self, message):
+        if self.connected:
+            self.hass.async_create_task(self._ws.send_json(message))
+
+    @callback
+    def _dispatch(self, message):
+        if not isinstance(message, dict):
+            return
+        key = (message.get("channel"), message.get("topic"))
+        if (callbacks := self._callbacks.get(key)) is None:
+            return
+        self.messages += 1
+        data = message.get("data")
+        for handler, event in list(callbacks):
+            if event is None or (isinstance(data, dict) and data.get("event") == event):
+                self._call(handler, data)
+
+    @callback
+    def _dispatch_all_events(self, data):
+        for (_channel, topic), callbacks in list(self._callbacks.items()):
+            if not topic.endswith(".events"):
+                continue
+            for handler, event in list(callbacks):
+                if event in (None, data["event"]):
+                    self._call(handler, data)
+
+    def _call(self, handler, data):
+        """Call a handler, its errors are logged and never reach the socket."""
+        try:
+            result = handler(data)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception(f"Error in websocket handler {handler}")
+            return
+        if asyncio.iscoroutine(result):
+            self.hass.async_create_task(self._async_call(handler, result))
+
+    async def _async_call(self, handler, coro):
+        try:
+            await coro
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception(f"Error in websocket handler {handler}")
@@ -0,0 +1,169 @@
+"""Optimistic match updates, applied locally until the cloud confirms them."""
+from __future__ import annotations
+
+import time
+
+PENDING = "pending"
+SENT = "sent"
+CONFIRMED = "confirmed"
+FAILED = "failed"
+EXPIRED = "expired"
+
+
+class Operation:
+    """A user action on the match and its expected effect on the state.
+
+    apply returns a state with the effect, expect tells whether a cloud
+    state shows it.
+    """
+
+    __slots__ = (
+        "id",
+        "action",
+        "dart",
+        "status",
+        "apply",
+        "expect",
+        "created",
+        "cancel",
+    )
+
+    def __init__(self, id, action, apply=None, dart=None, expect=None):
+        self.id = id
+        self.action = action
+        self.apply = apply
+        self.expect = expect
+        self.dart = dart
+        self.status = PENDING
+        self.created = time.time()
+        self.cancel = None
+
+    @property
+    def in_flight(self):
+        return self.status in (PENDING, SENT)
+
+    def as_dict(self):
+        return {
+            "id": self.id,
+            "action": self.action,
+            "dart": self.dart,
+            "status": self.status,
+            "created": self.created,
+        }
+
+
+def segment_key(segment):
+    """Return (multiplier, number) of a segment, every miss is the same."""
+    segment = segment or {}
+    multiplier = segment.get("multiplier") or 0
+    return multiplier, (segment.get("number") or 0) if multiplier else 0
+
+
+def _last_turn(state):
+    """Return (index, throw count) of the last turn of state, None without turn."""
+    turns = state.get("turns") if state else None
+    if not turns:
+        return None
+    return len(turns) - 1, len(turns[-1].get("throws") or ())
+
+
+def _with_last_turn(state, throws):
+    turns = state.get("turns")
+    if not turns:
+        return state
+    return {**state, "turns": turns[:-1] + [{**turns[-1], "throws": throws}]}
+
+
+def apply_throw(segment, dart, turn_id=None):
+    """Return the expected effect of throwing segment as dart (None to add one).
+
+    The throw goes to the last turn, only while it is turn_id if given.
+    """
+
+    def apply(state):
+        turns = state.get("turns")
+        if not turns or (turn_id is not None and turns[-1].get("id") != turn_id):
+            return state
+        throws = list(turns[-1].get("throws") or ())
+        throw = {"segment": segment, "coords": None, "marks": None, "entry": "manual"}
+        if dart is not None and dart < len(throws):
+            throws[dart] = {**throws[dart], **throw}
+        elif len(throws) < 3:
+            throws.append(throw)
+        return _with_last_turn(state, throws)
+
+    return apply
+
+
+def expect_throw(base, segment, dart):
+    """Return a check of a state showing segment thrown as dart on top of base.
+
+    dart None is the next dart of the turn. A later turn ends the check
+    too, the throw was either echoed meanwhile or dropped by the cloud.
+    """
+    if (last := _last_turn(base)) is None:
+        return None
+    turn, count = last
+    dart = count if dart is None else dart
+    key = segment_key(segment)
+
+    def expect(state):
+        turns = state.get("turns") or ()
+        if len(turns) > turn + 1:
+            return True
+        if len(turns) <= turn:
+            return False
+        throws = turns[turn].get("throws") or ()
+        return dart < len(throws) and segment_key(throws[dart].get("segment")) == key
+
+    return expect
+
+
+def expect_undo(base):
+    """Return a check of a state showing the last dart of base undone."""
+    if (last := _last_turn(base)) is None:
+        return None
+    turn, count = last
+
+    def expect(state):
+        turns = state.get("turns") or ()
+        if len(turns) != turn + 1:
+            return True
+        return len(turns[turn].get("throws") or ()) < count
+
+    return expect
+
+
+def expect_next_player(base):
+    """Return a check of a state showing the turn after the last one of base."""
+    if not base:
+        return None
+    turns = len(base.get("turns") or ())
+    player = base.get("player")
+
+    def expect(state):
+        return (
+            len(state.get("turns") or ()) > turns or state.get("player") != player
+        )
+
+    return expect
+
+
+def apply_undo(state):
+    turns = state.get("turns")
+    if not turns or not turns[-1].get("throws"):
+        return state
+    return _with_last_turn(state, turns[-1]["throws"][:-1])
+
+
+def apply_next_player(state):
+    players = state.get("players") or ()
+    if not players or state.get("player") is None:
+        return state
+    return {
+        **state,
+        "player": (state["player"] + 1) % len(players),
+        "turns": list(state.get("turns") or ()) + [{"throws": []}],
+        "turnScore": 0,
+        "turnBusted": False,
+    }
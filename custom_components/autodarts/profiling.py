@@ -0,0 +1,108 @@
+"""Opt-in profiling of coordinator callbacks and entity renders."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+import heapq
+import inspect
+from itertools import count
+import time
+
+from .const import PROFILE_BUCKETS, PROFILE_SLOWEST
+
+
+class Histogram:
+    """Durations counted in fixed buckets, upper bounds in ms."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds=PROFILE_BUCKETS):
+        self.bounds = bounds
+        # last bucket counts what is above the last bound
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration):
+        self.counts[bisect_left(self.bounds, duration)] += 1
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    def as_dict(self):
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else None,
+            "max": round(self.max, 3),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class Profiler:
+    """Time named callbacks into histograms, keeping the slowest calls.
+
+    Durations are in ms and inclusive: a websocket callback also counts the
+    entity renders it triggers.
+    """
+
+    def __init__(self, slowest=PROFILE_SLOWEST):
+        self.histograms = {}
+        self.size = slowest
+        self._slowest = []
+        self._ids = count()
+
+    def record(self, name, duration):
+        if (histogram := self.histograms.get(name)) is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(duration)
+        # min heap, the fastest of the kept calls is the first evicted
+        frame = (duration, next(self._ids), name, time.time())
+        if len(self._slowest) < self.size:
+            heapq.heappush(self._slowest, frame)
+        elif duration > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, frame)
+
+    @contextmanager
+    def measure(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def wrap(self, name, func):
+        """Return func, sync or async, timed under name."""
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_timed(*args, **kwargs):
+                with self.measure(name):
+                    return await func(*args, **kwargs)
+
+            return async_timed
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            with self.measure(name):
+                return func(*args, **kwargs)
+
+        return timed
+
+    @property
+    def slowest(self):
+        return [
+            {"name": name, "duration": round(duration, 3), "at": at}
+            for duration, _, name, at in sorted(self._slowest, reverse=True)
+        ]
+
+    def as_dict(self):
+        return {
+            "histograms": {
+                name: histogram.as_dict()
+                for name, histogram in sorted(self.histograms.items())
+            },
+            "slowest": self.slowest,
+        }
@@ -0,0 +1,167 @@
+"""Reconnect supervisor for autodarts websockets."""
+from __future__ import annotations
+
+import logging
+import random
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    RECONNECT_BASE_DELAY,
+    RECONNECT_CONFIRM_DELAY,
+    RECONNECT_FAILURE_THRESHOLD,
+    RECONNECT_MAX_DELAY,
+    RECONNECT_OPEN_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ReconnectSupervisor:
+    """Reconnect the coordinators of a board with backoff and a circuit breaker.
+
+    The board and match coordinators share one supervisor and one retry timer,
+    but consecutive failures are counted per socket. Retries use a capped
+    exponential backoff with jitter. After too many consecutive failures of a
+    socket the circuit opens and a single retry is tried after a longer delay
+    (half open). A retry not confirmed by the socket counts as a failure.
+    Once every socket is back, board and match are resynced from the REST api.
+    """
+
+    def __init__(
+        self,
+        hass,
+        base_delay=RECONNECT_BASE_DELAY,
+        max_delay=RECONNECT_MAX_DELAY,
+        failure_threshold=RECONNECT_FAILURE_THRESHOLD,
+        open_delay=RECONNECT_OPEN_DELAY,
+    ):
+        self.hass = hass
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.open_delay = open_delay
+
+        self.state = CIRCUIT_CLOSED
+        self._failures = {}
+        self.reconnects = 0
+        self.next_delay = None
+        self._coordinators = []
+        self._lost = set()
+        self._cancel_retry = None
+        self._cancel_confirm = None
+
+    @property
+    def failures(self):
+        """Consecutive failures of the most failing socket."""
+        return max(self._failures.values(), default=0)
+
+    @property
+    def attributes(self):
+        return {
+            "circuit": self.state,
+            "failures": self.failures,
+            "reconnects": self.reconnects,
+            "retry_in": self.next_delay if self._cancel_retry else None,
+        }
+
+    def attach(self, coordinator):
+        """Supervise a coordinator, resynced in attach order."""
+        self._coordinators.append(coordinator)
+
+    def backoff(self, failures):
+        """Return the delay before next retry, equal jitter on a capped exponential."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (failures - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    @callback
+    def connection_lost(self, coordinator):
+        self._lost.add(coordinator)
+        failures = self._failures[coordinator] = self._failures.get(coordinator, 0) + 1
+        if self.state == CIRCUIT_HALF_OPEN or failures >= self.failure_threshold:
+            if self.state != CIRCUIT_OPEN:
+                _LOGGER.warning(
+                    f"Autodarts cloud unreachable after {failures} attempts"
+                    f" of {coordinator.name}, next retry in {self.open_delay}s"
+                )
+            self.state = CIRCUIT_OPEN
+            self.next_delay = self.open_delay
+        else:
+            self.next_delay = self.backoff(failures)
+
+        if self._cancel_retry:
+            self._cancel_retry()
+        self._cancel_retry = async_call_later(
+            self.hass, self.next_delay, self._on_retry_timer
+        )
+
+    @callback
+    def _on_retry_timer(self, _now):
+        self._cancel_retry = None
+        if self.state == CIRCUIT_OPEN:
+            self.state = CIRCUIT_HALF_OPEN
+        for coordinator in list(self._lost):
+            if coordinator.item:
+                _LOGGER.debug(f"Reconnecting {coordinator.name}")
+                self.reconnects += 1
+                coordinator.reconnect()
+            else:
+                self._lost.discard(coordinator)
+                self._failures.pop(coordinator, None)
+        # an idle board may send nothing once back, check the socket itself
+        if self._cancel_confirm:
+            self._cancel_confirm()
+        self._cancel_confirm = async_call_later(
+            self.hass, RECONNECT_CONFIRM_DELAY, self._on_confirm_timer
+        )
+
+    @callback
+    def _on_confirm_timer(self, _now):
+        self._cancel_confirm = None
+        for coordinator in list(self._lost):
+            if coordinator.connected:
+                self.connection_ok(coordinator)
+            else:
+                # the attempt failed without error nor disconnected event
+                self.connection_lost(coordinator)
+
+    @callback
+    def connection_ok(self, coordinator):
+        """Report that coordinator socket delivered data."""
+        if coordinator not in self._lost:
+            return
+        self._lost.discard(coordinator)
+        self._failures.pop(coordinator, None)
+        if self._lost:
+            return
+        self.state = CIRCUIT_CLOSED
+        self.hass.async_create_task(self.async_resync())
+
+    async def async_resync(self):
+        """Apply board and match state missed while disconnected, like a frame."""
+        for coordinator in self._coordinators:
+            try:
+                await coordinator.async_resync()
+            except Exception as e:  # pylint: disable=broad-except
+                _LOGGER.warning(f"Resync of {coordinator.name} failed : {e}")
+
+    @callback
+    def cancel(self, coordinator=None):
+        """Stop reconnecting coordinator, or all of them."""
+        if coordinator is None:
+            self._lost.clear()
+            self._failures.clear()
+        else:
+            self._lost.discard(coordinator)
+            self._failures.pop(coordinator, None)
+        if not self._lost:
+            if self._cancel_retry:
+                self._cancel_retry()
+                self._cancel_retry = None
+            if self._cancel_confirm:
+                self._cancel_confirm()
+                self._cancel_confirm = None
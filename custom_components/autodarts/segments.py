@@ -0,0 +1,46 @@
+"""Dart segment notation, as shown by the dart selects."""
+from __future__ import annotations
+
+
+def segment_from_name(name):
+    """Return the autodarts segment of Miss, 25, Bull, Sxx, Dxx, Txx or Mxx.
+
+    Raise ValueError on anything else.
+    """
+    if name == "Miss":
+        number = 0
+        bed = "Outside"
+        multiplier = 0
+    elif name == "Bull":
+        number = 25
+        bed = "Double"
+        multiplier = 2
+    elif name == "25":
+        number = 25
+        bed = "Double"
+        multiplier = 1
+    else:
+        status = name[:1]
+        try:
+            number = int(name[1:])
+        except ValueError:
+            raise ValueError(f"Invalid dart {name}") from None
+        if status == "M":
+            name = "Miss"  # we don't want MXX as it add a lot options for nothing
+            bed = "Outside"
+            multiplier = 0
+        elif status == "S":
+            bed = "Single"
+            multiplier = 1
+        elif status == "D":
+            bed = "Double"
+            multiplier = 2
+        elif status == "T":
+            bed = "Triple"
+            multiplier = 3
+        else:
+            raise ValueError(f"Invalid dart {name}")
+        if not 0 <= number <= 20 and not (number == 25 and multiplier < 3):
+            raise ValueError(f"Invalid dart {name}")
+
+    return {"name": name, "number": number, "bed": bed, "multiplier": multiplier}
@@ -3,17 +3,25 @@ from __future__ import annotations
 
 import logging
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
     AUTODART_MATCH_URL,
+    DATA_STATISTICS,
     DOMAIN,
     MATCH_STARTED,
     MATCH_STOPPED,
     MATCH_WAITING,
+    SIGNAL_STATISTICS_LOADED,
 )
 from .entity import AutoDartChildEntity, AutoDartEntity, to_translation_key
 
@@ -30,8 +38,25 @@ async def async_setup_entry(
     match_sensor = MatchSensor(match_coordinator)
     turn_sensor = TurnSensor(match_coordinator)
     player_sensors = [PlayerSensor(match_coordinator, idx) for idx in range(6)]
-
-    async_add_entities([match_sensor, turn_sensor, board_state_sensor] + player_sensors)
+    statistics = hass.data[DOMAIN][DATA_STATISTICS]
+    statistics_sensors = [
+        PlayerStatisticsSensor(match_coordinator, statistics, idx) for idx in range(6)
+    ]
+
+    telemetry_sensors = [
+        MessageRateSensor(board_coordinator),
+        WriteLatencySensor(board_coordinator),
+        ReconnectsSensor(board_coordinator),
+        LastMessageAgeSensor(board_coordinator),
+        RestLatencySensor(board_coordinator),
+    ]
+
+    async_add_entities(
+        [match_sensor, turn_sensor, board_state_sensor]
+        + player_sensors
+        + statistics_sensors
+        + telemetry_sensors
+    )
 
 
 async def async_remove_entry(hass, entry) -> None:
@@ -61,51 +86,15 @@ class PlayerSensor(AutoDartChildEntity, SensorEntity):
 
     @property
     def player(self):
-        if self.is_playing:
-            return self.coordinator.data.players[self.idx]
-
-    @property
-    def score(self):
-        if self.is_playing:
-            return self.coordinator.data.scores[self.idx]
-
-    @property
-    def game_score(self):
-        if self.is_playing:
-            return self.coordinator.data.game_scores[self.idx]
-
-    @property
-    def segments(self):
-        if self.is_playing:
-            return {
-                number: value[self.idx]
-                for number, value in self.coordinator.data.state["segments"].items()
-            }
-
-    @property
-    def winner(self):
-        if self.is_playing and self.coordinator.data.finished:
-            return self.coordinator.data.winner == self.idx
-
-    @property
-    def stats(self):
-        if self.is_playing:
-            stats = self.coordinator.data.stats[self.idx].copy()
-            stats.pop("game", None)
-            stats.pop("indices", None)
-            return stats
+        if (view := self.coordinator.view) and self.idx < len(view.players):
+            return view.players[self.idx]
 
     @property
     def is_playing(self):
-        if self.coordinator.data:
-            return self.idx < len(self.coordinator.data.players)
-        return False
+        return self.player is not None
 
-    @property
-    def current(self):
-        if self.coordinator.data:
-            return (self.idx == self.coordinator.data.player,)
-        return False
+    def render_key(self):
+        return (self.available, self.player)
 
     @property
     def native_value(self) -> str | None:
@@ -118,25 +107,66 @@ class PlayerSensor(AutoDartChildEntity, SensorEntity):
         attributes = {"index": self.idx, "play": self.is_playing}
 
         if player := self.player:
-            attributes["ppr"] = player.cpuPPR
-            attributes["winner"] = self.winner
-            attributes["sets"] = self.score["sets"]
-            attributes["legs"] = self.score["legs"]
-            attributes["current"] = self.current
-            if self.coordinator.data.variant == "Cricket":
+            attributes["ppr"] = player.ppr
+            attributes["winner"] = player.winner
+            attributes["sets"] = player.sets
+            attributes["legs"] = player.legs
+            attributes["current"] = player.current
+            if player.segments is not None:
                 attributes["score"] = {
-                    "point": self.game_score,
-                    "segments": self.segments,
+                    "point": player.score,
+                    "segments": player.segments,
                 }
             else:
-                attributes["score"] = self.game_score
-            attributes["stats"] = self.stats
+                attributes["score"] = player.score
+            attributes["stats"] = player.stats
             if player.user_id:
                 attributes["autodarts_id"] = player.user_id
 
         return attributes
 
 
+class PlayerStatisticsSensor(AutoDartChildEntity, SensorEntity):
+    """Statistics of a player over the local throw history."""
+
+    __name__ = "player statistics"
+
+    def __init__(self, coordinator, statistics, idx):
+        super().__init__(coordinator, idx=idx)
+        self.statistics = statistics
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_STATISTICS_LOADED, self._handle_coordinator_update
+            )
+        )
+
+    @property
+    def player(self):
+        if (view := self.coordinator.view) and self.idx < len(view.players):
+            return view.players[self.idx]
+
+    def render_key(self):
+        # metrics are the same object until the sums change
+        if player := self.player:
+            return (self.available, player.name, self.statistics.metrics(player.name))
+        return (self.available, None, None)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the all time 3 darts average."""
+        if player := self.player:
+            return self.statistics.metrics(player.name)["all_time"]["average"]
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        if player := self.player:
+            return {"player": player.name, **self.statistics.metrics(player.name)}
+        return {"player": None}
+
+
 class TurnSensor(AutoDartChildEntity, SensorEntity):
     """Sensor for Autodart Match."""
 
@@ -147,20 +177,23 @@ class TurnSensor(AutoDartChildEntity, SensorEntity):
     # entity_description = "Autodarts' match"
     configuration_url = AUTODART_MATCH_URL
 
+    def render_key(self):
+        if view := self.coordinator.view:
+            return (self.available, view.turn_score, view.turn_busted, view.player)
+        return (self.available, None)
+
     @property
     def native_value(self) -> str | None:
         """Return the state of the match."""
-        if not self.coordinator.data:
-            return None
-        else:
-            return self.coordinator.data.turn_score
+        if view := self.coordinator.view:
+            return view.turn_score
 
     @property
     def extra_state_attributes(self) -> dict | None:
-        if self.coordinator.data:
+        if view := self.coordinator.view:
             return {
-                "bust": self.coordinator.data.turn_busted,
-                "player": self.coordinator.data.player,
+                "bust": view.turn_busted,
+                "player": view.player,
             }
         return {}
 
@@ -177,6 +210,17 @@ class MatchSensor(AutoDartChildEntity, SensorEntity):
     # entity_description = "Autodarts' match"
     configuration_url = AUTODART_MATCH_URL
 
+    def render_key(self):
+        return (
+            self.available,
+            self.native_value,
+            self.coordinator.view,
+            tuple(
+                (operation.id, operation.status)
+                for operation in self.coordinator.operations
+            ),
+        )
+
     @property
     def native_value(self) -> str | None:
         """Return the state of the match."""
@@ -185,19 +229,115 @@ class MatchSensor(AutoDartChildEntity, SensorEntity):
                 return MATCH_WAITING
             else:
                 return None
-        elif self.coordinator.data:
-            if self.coordinator.data.finished:
+        elif view := self.coordinator.view:
+            if view.finished:
                 return MATCH_STOPPED
             else:
                 return MATCH_STARTED
 
     @property
     def extra_state_attributes(self) -> dict | None:
-        if self.coordinator.data:
+        if view := self.coordinator.view:
             return {
-                "leg": self.coordinator.data.leg,
-                "set": self.coordinator.data.set,
-                "round": self.coordinator.data.round,
-                "variant": self.coordinator.data.variant,
-                "settings": self.coordinator.data.settings,
+                "leg": view.leg,
+                "set": view.set,
+                "round": view.round,
+                "variant": view.variant,
+                "settings": view.settings,
+                "pending": len(self.coordinator.pending_operations),
+                "operations": [
+                    operation.as_dict() for operation in self.coordinator.operations
+                ],
             }
+
+
+class TelemetrySensor(AutoDartEntity, SensorEntity):
+    """Diagnostic sensor of the board coordinators telemetry, polled."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def should_poll(self) -> bool:
+        # telemetry changes with every message, only sample it
+        return True
+
+    @property
+    def telemetry(self):
+        return self.coordinator.telemetry
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        pass
+
+    async def async_update(self) -> None:
+        """Sample the telemetry, without refreshing the coordinator."""
+
+
+class MessageRateSensor(TelemetrySensor):
+    __name__ = "message rate"
+
+    _attr_native_unit_of_measurement = "msg/s"
+
+    @property
+    def native_value(self) -> float:
+        return self.telemetry.message_rate
+
+
+class WriteLatencySensor(TelemetrySensor):
+    """Delay between a websocket message and the entities state write."""
+
+    __name__ = "write latency"
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+
+    @property
+    def native_value(self) -> float | None:
+        return self.telemetry.write_latency.percentile("p50")
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        return self.telemetry.write_latency.as_dict()
+
+
+class ReconnectsSensor(TelemetrySensor):
+    __name__ = "reconnects"
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self) -> int:
+        return self.coordinator.supervisor.reconnects
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        return self.coordinator.supervisor.attributes
+
+
+class LastMessageAgeSensor(TelemetrySensor):
+    __name__ = "last message age"
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+
+    @property
+    def native_value(self) -> float | None:
+        return self.telemetry.last_message_age
+
+
+class RestLatencySensor(TelemetrySensor):
+    """Duration of REST calls, percentiles per action in attributes."""
+
+    __name__ = "rest latency"
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+
+    @property
+    def native_value(self) -> float | None:
+        return self.telemetry.rest_latency
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        return self.telemetry.rest_latencies
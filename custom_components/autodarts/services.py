@@ -0,0 +1,150 @@
+"""Autodarts services."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import device_registry as dr
+
+from .const import DOMAIN, TRAFFIC_DIR
+from .segments import segment_from_name
+from .traffic import async_replay
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_THROW = "throw"
+SERVICE_SET_TURN = "set_turn"
+SERVICE_REPLAY = "replay"
+
+ATTR_DEVICE_ID = "device_id"
+ATTR_DARTS = "darts"
+ATTR_FILE = "file"
+ATTR_REALTIME = "realtime"
+
+
+def darts(value):
+    """Validate a list of darts, as a list or a comma separated string."""
+    if isinstance(value, str):
+        value = [dart.strip() for dart in value.split(",") if dart.strip()]
+    value = vol.All(cv.ensure_list, vol.Length(min=1, max=3))(value)
+    try:
+        return [segment_from_name(str(dart)) for dart in value]
+    except ValueError as e:
+        raise vol.Invalid(str(e)) from e
+
+
+SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_DARTS): darts,
+    }
+)
+
+
+REPLAY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_FILE): cv.string,
+        vol.Optional(ATTR_REALTIME, default=True): cv.boolean,
+    }
+)
+
+
+def get_entry_data(hass: HomeAssistant, device_id):
+    """Return the coordinators of a board or board match device."""
+    if not (device := dr.async_get(hass).async_get(device_id)):
+        raise HomeAssistantError(f"Unknown device {device_id}")
+    for entry_id in device.config_entries:
+        if data := hass.data.get(DOMAIN, {}).get(entry_id):
+            return data
+    raise HomeAssistantError(f"{device.name} is not an autodarts board")
+
+
+def get_match_coordinator(hass: HomeAssistant, device_id):
+    """Return the match coordinator of a board or board match device."""
+    coordinator = get_entry_data(hass, device_id)["match_coordinator"]
+    # the live match, a replayed one is only shown
+    if coordinator.item is None:
+        raise HomeAssistantError("No match running on this board")
+    return coordinator
+
+
+async def async_submit(coordinator, segments, replace):
+    """Send the darts of a turn through the optimistic layer, then resync once.
+
+    Commands are started in order without waiting for each answer: with
+    replace, darts of the turn beyond the given ones are undone and the
+    others corrected, then new darts are added after the darts of the
+    turn. Answers are awaited together, a turn costs one round trip.
+    Entities are written once with every expected dart, and once with the
+    resynced state.
+    """
+    state = coordinator.expected_state()
+    turns = (state or {}).get("turns") or ()
+    existing = len(turns[-1].get("throws") or ()) if turns else 0
+
+    commands = []
+    if replace:
+        commands += [coordinator.async_undo() for _ in range(existing - len(segments))]
+        commands += [
+            coordinator.async_throw(segment, throw_id=idx)
+            for idx, segment in enumerate(segments[:existing])
+        ]
+        segments = segments[existing:]
+    commands += [
+        coordinator.async_throw(segment, dart=idx)
+        for idx, segment in enumerate(segments, existing)
+    ]
+
+    async with coordinator.async_hold_updates():
+        # tasks run in creation order up to their request
+        tasks = [coordinator.hass.async_create_task(command) for command in commands]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        await coordinator.async_resync()
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register autodarts services."""
+
+    async def async_throw(call: ServiceCall) -> None:
+        coordinator = get_match_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        await async_submit(coordinator, call.data[ATTR_DARTS], replace=False)
+
+    async def async_set_turn(call: ServiceCall) -> None:
+        coordinator = get_match_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        await async_submit(coordinator, call.data[ATTR_DARTS], replace=True)
+
+    async def async_replay_traffic(call: ServiceCall) -> None:
+        data = get_entry_data(hass, call.data[ATTR_DEVICE_ID])
+        # only recordings, no arbitrary file of the host
+        name = os.path.basename(call.data[ATTR_FILE])
+        path = hass.config.path(TRAFFIC_DIR, name)
+        if not await hass.async_add_executor_job(os.path.isfile, path):
+            raise HomeAssistantError(f"No recording {name} in {TRAFFIC_DIR}")
+        frames = await async_replay(
+            hass,
+            {
+                "board": data["board_coordinator"],
+                "match": data["match_coordinator"],
+            },
+            path,
+            call.data[ATTR_REALTIME],
+        )
+        _LOGGER.info(f"Replayed {frames} frames of {name}")
+
+    hass.services.async_register(DOMAIN, SERVICE_THROW, async_throw, SERVICE_SCHEMA)
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_TURN, async_set_turn, SERVICE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_REPLAY, async_replay_traffic, REPLAY_SCHEMA
+    )
@@ -0,0 +1,282 @@
+"""Authenticated autodarts sessions shared between config entries."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+
+from autodarts import AutoDartSession
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from keycloak import KeycloakOpenID
+from keycloak.exceptions import KeycloakError
+
+from .const import (
+    AUTODART_AUTH_URL,
+    AUTODART_CLIENT_ID,
+    AUTODART_CLIENT_SECRET,
+    AUTODART_REALM_NAME,
+    AUTODART_WEBSOCKET_URL,
+    DATA_SESSIONS,
+    DOMAIN,
+    SESSION_IDLE_TIMEOUT,
+    SESSION_REFRESH_MARGIN,
+    TOKENS_VERSION,
+)
+from .multiplex import MultiplexSocket
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class InvalidAuth(HomeAssistantError):
+    """Error to indicate there is invalid auth."""
+
+
+@callback
+def async_get_session_pool(hass: HomeAssistant) -> SessionPool:
+    """Return the session pool, created on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_SESSIONS not in domain_data:
+        domain_data[DATA_SESSIONS] = SessionPool(hass)
+    return domain_data[DATA_SESSIONS]
+
+
+def account_key(email, password):
+    """Return the pool key of credentials, a wrong password is another account."""
+    return hashlib.sha256(f"{email}\0{password}".encode()).hexdigest()
+
+
+def with_expiry(token, now=None):
+    """Return token with absolute expiry times, from its relative ones."""
+    now = now or time.time()
+    token = dict(token)
+    token.setdefault("expires_at", now + token.get("expires_in", 0))
+    token.setdefault("refresh_expires_at", now + token.get("refresh_expires_in", 0))
+    return token
+
+
+def create_session(email, password):
+    return AutoDartSession(
+        email=email,
+        password=password,
+        client_id=AUTODART_CLIENT_ID,
+        realm_name=AUTODART_REALM_NAME,
+        client_secret_key=AUTODART_CLIENT_SECRET,
+    )
+
+
+def create_openid():
+    return KeycloakOpenID(
+        server_url=AUTODART_AUTH_URL,
+        client_id=AUTODART_CLIENT_ID,
+        realm_name=AUTODART_REALM_NAME,
+        client_secret_key=AUTODART_CLIENT_SECRET,
+    )
+
+
+class SessionPool:
+    """One authenticated session per account, reference counted across entries.
+
+    Accounts are keyed by email and password, so an entry with a wrong
+    password never gets the session of another one. A session without entry
+    (handed over by the config flow, or released by an entry being reloaded)
+    is kept for a while so the next setup does not login again.
+
+    The boards of an account share one websocket, instead of one socket per
+    board and match. The library session neither exposes its token nor
+    accepts one, so the socket is authenticated with a keycloak token of the
+    pool, obtained with python-keycloak. The library keeps its own login for
+    the REST api. Pool tokens are persisted: a setup after a restart
+    exchanges the stored refresh token instead of a password grant, and
+    tokens are refreshed shortly before they expire. Without a token, every
+    item opens its own socket through the library.
+    """
+
+    def __init__(self, hass):
+        self.hass = hass
+        self._sessions = {}
+        self._sockets = {}
+        self._refs = {}
+        self._locks = {}
+        self._expire = {}
+        self._credentials = {}
+        self._cancel_refresh = {}
+        self._store = Store(hass, TOKENS_VERSION, f"{DOMAIN}.tokens")
+        self._tokens = None
+        self._openid = None
+
+    def __len__(self):
+        return len(self._sessions)
+
+    async def _async_tokens(self):
+        if self._tokens is None:
+            self._tokens = await self._store.async_load() or {}
+        return self._tokens
+
+    async def async_acquire(self, email, password):
+        """Return the account session, login only for the first entry."""
+        key = account_key(email, password)
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            if session := self._sessions.get(key):
+                self._refs[key] += 1
+                self._cancel_expire(key)
+                _LOGGER.debug(f"Reusing account session ({self._refs[key]} boards)")
+            else:
+                session = create_session(email, password)
+                if not await session.is_authenticated():
+                    raise InvalidAuth
+                self._add(key, session, 1)
+            self._credentials[key] = (email, password)
+            if key not in self._cancel_refresh:
+                await self._async_authorize(key)
+            return session
+
+    async def _async_authorize(self, key):
+        """Get a socket token, from the stored refresh token when it is valid."""
+        token = (await self._async_tokens()).get(key)
+        try:
+            if token and token.get("refresh_expires_at", 0) > time.time():
+                try:
+                    token = await self._async_refresh_token(token)
+                    _LOGGER.debug("Autodarts token resumed from its refresh token")
+                except KeycloakError as e:
+                    _LOGGER.debug(f"Stored autodarts token refused, login again : {e}")
+                    token = await self._async_password_token(key)
+            else:
+                token = await self._async_password_token(key)
+        except KeycloakError as e:
+            _LOGGER.warning(f"No autodarts token, boards keep their own sockets : {e}")
+            return
+        self._save_token(key, token)
+
+    def _get_openid(self):
+        if self._openid is None:
+            self._openid = create_openid()
+        return self._openid
+
+    async def _async_password_token(self, key):
+        email, password = self._credentials[key]
+        token = await self.hass.async_add_executor_job(
+            self._get_openid().token, email, password
+        )
+        return with_expiry(token)
+
+    async def _async_refresh_token(self, token):
+        refreshed = await self.hass.async_add_executor_job(
+            self._get_openid().refresh_token, token["refresh_token"]
+        )
+        return with_expiry(refreshed)
+
+    def _access_token(self, key):
+        """Return the current access token of an account, None without one."""
+        return ((self._tokens or {}).get(key) or {}).get("access_token")
+
+    @callback
+    def socket(self, email, password):
+        """Return the websocket shared by the boards of an account.
+
+        None when the pool has no token for the account, every item then
+        opens its own socket through the library.
+        """
+        key = account_key(email, password)
+        if key not in self._sessions or not self._access_token(key):
+            return None
+        if (socket := self._sockets.get(key)) is None:
+            socket = self._sockets[key] = MultiplexSocket(
+                self.hass,
+                AUTODART_WEBSOCKET_URL,
+                lambda: self._access_token(key),
+            )
+        return socket
+
+    @callback
+    def adopt(self, email, password, session):
+        """Keep an already authenticated session for the next setup."""
+        key = account_key(email, password)
+        if key in self._sessions:
+            return
+        self._add(key, session, 0)
+        self._schedule_expire(key)
+
+    @callback
+    def release(self, email, password):
+        """Drop a reference, forget the session after a while without entry."""
+        key = account_key(email, password)
+        if key not in self._refs:
+            return
+        self._refs[key] -= 1
+        if self._refs[key] <= 0:
+            self._schedule_expire(key)
+
+    def _add(self, key, session, refs):
+        self._sessions[key] = session
+        self._refs[key] = refs
+
+    def _save_token(self, key, token):
+        """Persist token and schedule its refresh before it expires."""
+        self._tokens[key] = token
+        self._store.async_delay_save(lambda: self._tokens, 0)
+        self._schedule_refresh(key, token)
+
+    def _schedule_refresh(self, key, token):
+        if cancel := self._cancel_refresh.pop(key, None):
+            cancel()
+        delay = max(0, token["expires_at"] - time.time() - SESSION_REFRESH_MARGIN)
+
+        @callback
+        def refresh(_now):
+            self._cancel_refresh.pop(key, None)
+            self.hass.async_create_task(self._async_refresh(key))
+
+        self._cancel_refresh[key] = async_call_later(self.hass, delay, refresh)
+
+    async def _async_refresh(self, key):
+        """Refresh the token of an account before it expires."""
+        if key not in self._sessions or (token := self._tokens.get(key)) is None:
+            return
+        try:
+            try:
+                token = await self._async_refresh_token(token)
+            except KeycloakError as e:
+                # refresh token expired or revoked, only a login can help
+                _LOGGER.debug(f"Autodarts token not refreshed, login again : {e}")
+                token = await self._async_password_token(key)
+        except KeycloakError as e:
+            _LOGGER.warning(f"Unable to renew an autodarts token : {e}")
+            return
+        if key in self._sessions:
+            self._save_token(key, token)
+
+    async def async_remove(self, email, password):
+        """Forget the stored token of an account."""
+        key = account_key(email, password)
+        if (await self._async_tokens()).pop(key, None) is not None:
+            self._store.async_delay_save(lambda: self._tokens, 0)
+
+    def _schedule_expire(self, key):
+        self._cancel_expire(key)
+
+        @callback
+        def expire(_now):
+            self._expire.pop(key, None)
+            if self._refs.get(key, 0) <= 0:
+                self._forget(key)
+
+        self._expire[key] = async_call_later(self.hass, SESSION_IDLE_TIMEOUT, expire)
+
+    def _cancel_expire(self, key):
+        if cancel := self._expire.pop(key, None):
+            cancel()
+
+    def _forget(self, key):
+        self._sessions.pop(key, None)
+        self._refs.pop(key, None)
+        self._locks.pop(key, None)
+        self._credentials.pop(key, None)
+        if cancel := self._cancel_refresh.pop(key, None):
+            cancel()
+        if socket := self._sockets.pop(key, None):
+            socket.disconnect()
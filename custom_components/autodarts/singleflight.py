@@ -0,0 +1,53 @@
+"""Deduplication of concurrent cloud fetches."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class SingleFlight:
+    """Share one in flight request between concurrent callers of a resource.
+
+    With a ttl, a result is also reused by callers within ttl seconds.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self.cached = 0
+        self._in_flight = {}
+        self._results = {}
+
+    @property
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "shared": self.shared,
+            "cached": self.cached,
+            "saved": self.shared + self.cached,
+        }
+
+    async def async_do(self, key, factory, ttl=None):
+        """Return the result of factory(), unless key is already being fetched."""
+        if ttl and (result := self._results.get(key)):
+            expires, value = result
+            if time.monotonic() < expires:
+                self.cached += 1
+                return value
+
+        if (task := self._in_flight.get(key)) is not None:
+            self.shared += 1
+            return await asyncio.shield(task)
+
+        self.calls += 1
+        task = asyncio.ensure_future(factory())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _task: self._in_flight.pop(key, None))
+        # a cancelled caller must not cancel the others
+        value = await asyncio.shield(task)
+        if ttl:
+            self._results[key] = (time.monotonic() + ttl, value)
+        return value
+
+    def invalidate(self, key):
+        self._results.pop(key, None)
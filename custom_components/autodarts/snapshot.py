@@ -0,0 +1,66 @@
+"""Last known match state, persisted across restarts."""
+from __future__ import annotations
+
+import logging
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    SNAPSHOT_MAX_AGE,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Snapshot:
+    """Debounced store of the match state of a config entry.
+
+    Only the match, discovered in background, is restored from here. The
+    board is not saved: setup waits for its REST fetch, needed anyway for
+    its match id and commands, so a saved board would be replaced before
+    any entity is created. Without the cloud, setup is retried
+    (ConfigEntryNotReady) rather than showing a board that can't be used.
+    """
+
+    def __init__(self, hass, entry_id, board_coordinator, match_coordinator):
+        self._store = Store(hass, SNAPSHOT_VERSION, f"{DOMAIN}.{entry_id}")
+        self.board_coordinator = board_coordinator
+        self.match_coordinator = match_coordinator
+
+    @staticmethod
+    async def async_remove(hass, entry_id):
+        await Store(hass, SNAPSHOT_VERSION, f"{DOMAIN}.{entry_id}").async_remove()
+
+    def _data(self, match):
+        return {
+            "saved_at": dt_util.utcnow().timestamp(),
+            "board_id": self.board_coordinator.id,
+            "match": match,
+        }
+
+    @callback
+    def async_schedule_save(self):
+        # the store is empty between a load and the first frame, or without
+        # match: keep the last snapshot, restore checks it is the board match
+        if (match := self.match_coordinator.store.state) is None:
+            return
+        self._store.async_delay_save(lambda: self._data(match), SNAPSHOT_SAVE_DELAY)
+
+    async def async_restore(self):
+        """Populate coordinators from the snapshot, stale data is discarded."""
+        if not (data := await self._store.async_load()):
+            return
+        age = dt_util.utcnow().timestamp() - data.get("saved_at", 0)
+        if age > SNAPSHOT_MAX_AGE:
+            _LOGGER.debug(f"Discarding snapshot saved {age:.0f}s ago")
+            return
+
+        match = data.get("match")
+        match_id = self.board_coordinator.item and self.board_coordinator.item.match_id
+        if match and match_id and match.get("id") == match_id:
+            self.match_coordinator.restore(match)
@@ -0,0 +1,278 @@
+"""Per player statistics computed with numpy over the throw history."""
+from __future__ import annotations
+
+from datetime import datetime
+import time
+
+import numpy as np
+
+# accumulated per player, metrics are ratios of these
+FIELDS = (
+    "darts",
+    "points",
+    "first9_darts",
+    "first9_points",
+    "checkout_attempts",
+    "checkouts",
+    "trebles",
+    "doubles",
+    "cricket_darts",
+    "marks",
+)
+(
+    DARTS,
+    POINTS,
+    FIRST9_DARTS,
+    FIRST9_POINTS,
+    CHECKOUT_ATTEMPTS,
+    CHECKOUTS,
+    TREBLES,
+    DOUBLES,
+    CRICKET_DARTS,
+    MARKS,
+) = range(len(FIELDS))
+
+PERIODS = ("session", "day", "all_time")
+
+
+def day_start(timestamp):
+    return datetime.fromtimestamp(timestamp).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    ).timestamp()
+
+
+# throw columns the sums are computed from, player is a player_code
+COLUMNS = {
+    "player": np.int32,
+    "cricket": np.bool_,
+    "round": np.int16,
+    "number": np.int16,
+    "multiplier": np.int8,
+    "marks": np.int8,
+    "remaining": np.int16,
+    "busted": np.bool_,
+    "timestamp": np.float64,
+}
+# a throw with its player name, as read from the history
+RECORD = np.dtype(
+    [("player", object)]
+    + [(name, dtype) for name, dtype in COLUMNS.items() if name != "player"]
+)
+
+
+class Accumulator:
+    """FIELDS sums per player code, updated with np.bincount."""
+
+    def __init__(self):
+        self.sums = np.zeros((0, len(FIELDS)))
+
+    def add(self, columns, mask=None, sign=1):
+        """Accumulate the throws of columns, optionally only where mask."""
+        player = columns["player"]
+        if mask is not None:
+            player = player[mask]
+            columns = {name: columns[name][mask] for name in COLUMNS}
+        if not len(player):
+            return
+
+        cricket = columns["cricket"]
+        x01 = ~cricket
+        multiplier = columns["multiplier"]
+        # darts of a busted turn are thrown but score nothing
+        points = np.where(
+            columns["busted"], 0, columns["number"].astype(np.int32) * multiplier
+        )
+        remaining = columns["remaining"]
+        # double out : a finish is possible on an even score up to 40, or bull
+        attempt = x01 & (remaining > 0) & (
+            ((remaining <= 40) & (remaining % 2 == 0)) | (remaining == 50)
+        )
+        checkout = attempt & (multiplier == 2) & (points == remaining)
+        first9 = x01 & (columns["round"] <= 3)
+
+        weights = (
+            x01,
+            np.where(x01, points, 0),
+            first9,
+            np.where(first9, points, 0),
+            attempt,
+            checkout,
+            x01 & (multiplier == 3),
+            x01 & (multiplier == 2),
+            cricket,
+            np.where(cricket, columns["marks"], 0),
+        )
+        size = self.grow(int(player.max()) + 1)
+        for field, weight in enumerate(weights):
+            self.sums[:size, field] += np.bincount(
+                player, weights=sign * weight.astype(np.float64), minlength=size
+            )
+
+    def grow(self, size):
+        """Make room for player codes below size, return the number of rows."""
+        size = max(len(self.sums), size)
+        if size > len(self.sums):
+            self.sums = np.vstack([self.sums, np.zeros((size - len(self.sums), len(FIELDS)))])
+        return size
+
+    def reset(self):
+        self.sums[:] = 0
+
+    def metrics(self, code):
+        if code is None or code >= len(self.sums):
+            sums = np.zeros(len(FIELDS))
+        else:
+            sums = self.sums[code]
+
+        def ratio(numerator, denominator, scale=1):
+            if not sums[denominator]:
+                return None
+            return round(float(scale * sums[numerator] / sums[denominator]), 2)
+
+        return {
+            "darts": int(sums[DARTS] + sums[CRICKET_DARTS]),
+            "average": ratio(POINTS, DARTS, 3),
+            "first9_average": ratio(FIRST9_POINTS, FIRST9_DARTS, 3),
+            "checkout_percentage": ratio(CHECKOUTS, CHECKOUT_ATTEMPTS, 100),
+            "treble_rate": ratio(TREBLES, DARTS, 100),
+            "double_rate": ratio(DOUBLES, DARTS, 100),
+            "mpr": ratio(MARKS, CRICKET_DARTS, 3),
+        }
+
+
+class StatisticsEngine:
+    """Session, day and all time statistics of every player.
+
+    The history is loaded once as column arrays and reduced with bincount,
+    then every new or removed throw only updates the per player sums. Live
+    throws are queued and applied when metrics are next read, and metrics
+    are cached until the sums change, so the throw callback and entity
+    renders stay cheap. While loading, sums are only added by the loader,
+    live throws wait in the queue and metrics are empty.
+    """
+
+    def __init__(self, session_start=None):
+        self.players = {}
+        self.session_start = session_start or time.time()
+        self.day = day_start(time.time())
+        self.accumulators = {period: Accumulator() for period in PERIODS}
+        self._pending = []
+        self._metrics = {}
+        self.loading = False
+
+    def player_code(self, name):
+        if (code := self.players.get(name)) is None:
+            code = self.players[name] = len(self.players)
+        return code
+
+    def add_columns(self, columns, sign=1, periods=PERIODS):
+        """Add throws given as a dict of equal length COLUMNS arrays."""
+        timestamp = columns["timestamp"]
+        if len(timestamp) and timestamp.max() >= self.day + 86400:
+            self.day = day_start(float(timestamp.max()))
+            self.accumulators["day"].reset()
+        self._metrics.clear()
+        if "all_time" in periods:
+            self.accumulators["all_time"].add(columns, sign=sign)
+        if "day" in periods:
+            self.accumulators["day"].add(columns, timestamp >= self.day, sign)
+        if "session" in periods:
+            self.accumulators["session"].add(
+                columns, timestamp >= self.session_start, sign
+            )
+
+    def add_records(self, records, sign=1, periods=PERIODS):
+        """Add throws given as a RECORD array."""
+        if not len(records):
+            return
+        names, inverse = np.unique(records["player"], return_inverse=True)
+        codes = np.array([self.player_code(name) for name in names], np.int32)
+        columns = {name: records[name] for name in COLUMNS if name != "player"}
+        columns["player"] = codes[inverse]
+        self.add_columns(columns, sign, periods)
+
+    def add_rows(self, rows, sign=1, periods=PERIODS):
+        """Add throws given as (player, variant, round, number, multiplier, marks, remaining, busted, timestamp)."""
+        self.add_records(
+            np.array(
+                [
+                    (
+                        player or "",
+                        variant == "Cricket",
+                        rnd or 0,
+                        number or 0,
+                        multiplier or 0,
+                        marks or 0,
+                        -1 if remaining is None else remaining,
+                        bool(busted),
+                        timestamp,
+                    )
+                    for (
+                        player,
+                        variant,
+                        rnd,
+                        number,
+                        multiplier,
+                        marks,
+                        remaining,
+                        busted,
+                        timestamp,
+                    ) in rows
+                ],
+                dtype=RECORD,
+            ),
+            sign,
+            periods,
+        )
+
+    def record(self, row, sign=1):
+        """Queue a live throw row, -1 sign for a removed one."""
+        self._pending.append((row, sign))
+
+    def apply_pending(self):
+        """Add the queued live throws to the sums."""
+        if not self._pending or self.loading:
+            return
+        pending, self._pending = self._pending, []
+        for sign in (1, -1):
+            self.add_rows([row for row, row_sign in pending if row_sign == sign], sign)
+
+    def all_time_sums(self):
+        """Return the all time sums by player name, to be loaded back later."""
+        self.apply_pending()
+        sums = self.accumulators["all_time"].sums
+        return {
+            "fields": list(FIELDS),
+            "players": {
+                name: sums[code].tolist()
+                for name, code in self.players.items()
+                if code < len(sums)
+            },
+        }
+
+    def load_all_time_sums(self, data):
+        """Add sums returned by all_time_sums, False if they don't fit FIELDS."""
+        if data.get("fields") != list(FIELDS):
+            return False
+        accumulator = self.accumulators["all_time"]
+        for name, sums in data["players"].items():
+            code = self.player_code(name)
+            accumulator.grow(code + 1)
+            accumulator.sums[code] += sums
+        self._metrics.clear()
+        return True
+
+    def metrics(self, name):
+        if self.loading:
+            return {
+                period: accumulator.metrics(None)
+                for period, accumulator in self.accumulators.items()
+            }
+        self.apply_pending()
+        if (metrics := self._metrics.get(name)) is None:
+            code = self.players.get(name)
+            metrics = self._metrics[name] = {
+                period: accumulator.metrics(code)
+                for period, accumulator in self.accumulators.items()
+            }
+        return metrics
@@ -0,0 +1,77 @@
+"""Long lived board and match state patched by websocket frames."""
+from __future__ import annotations
+
+
+class StateStore:
+    """Latest state of an autodarts item.
+
+    Every frame is applied onto the previous state: values equal to the
+    previous ones are replaced by the previous objects, so unchanged
+    sub-trees are shared between consecutive states and can be compared
+    by identity.
+    """
+
+    __slots__ = ("state", "frames")
+
+    # list keys only growing at the end, where only the last item may change
+    __append_only__ = ()
+
+    def __init__(self, state=None):
+        self.state = state
+        self.frames = 0
+
+    def apply(self, frame) -> set:
+        """Apply a frame, return the set of top level keys that changed."""
+        self.frames += 1
+        previous = self.state
+        if previous is None:
+            self.state = dict(frame)
+            return set(frame)
+
+        state = {}
+        changed = set()
+        for key, value in frame.items():
+            old = previous.get(key)
+            if key in self.__append_only__:
+                value = self._share_list(old, value)
+            elif old is not value and old == value:
+                value = old
+            if value is not old:
+                changed.add(key)
+            state[key] = value
+        changed.update(key for key in previous if key not in frame)
+        self.state = state
+        return changed
+
+    @staticmethod
+    def _share_list(old, new):
+        if not old or not new or len(new) < len(old) or new[0] != old[0]:
+            return new
+        last = len(old) - 1
+        if new[last] == old[last]:
+            if len(new) == len(old):
+                return old
+            return old + new[len(old) :]
+        # the last known item was patched, older ones are final
+        return old[:last] + new[last:]
+
+    def reset(self, state=None):
+        """Replace the state without counting a frame, the baseline of the next one."""
+        self.state = dict(state) if state is not None else None
+
+    def clear(self):
+        self.reset()
+
+
+class BoardStore(StateStore):
+    """State of a cloud board."""
+
+    __slots__ = ()
+
+
+class MatchStore(StateStore):
+    """State of a match, turns history is append only."""
+
+    __slots__ = ()
+
+    __append_only__ = ("turns",)
@@ -58,6 +58,21 @@ class CloudConnectionBinarySensor(AutoDartChildEntity, SwitchEntity):
         # force a match refresh to set state to unknown
         await self.coordinator.async_refresh()
 
+    def render_key(self):
+        # match frames don't change the connection, the attributes are cheap
+        return (self.available, self.is_on, self.extra_state_attributes)
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        # counters change with every frame, they are in the diagnostics
+        socket = self.board_coordinator.socket
+        local = self.board_coordinator.local
+        return {
+            "circuit": self.board_coordinator.supervisor.state,
+            "socket": socket.connected if socket else None,
+            "local": local.connected if local else None,
+        }
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return the device info."""
@@ -88,11 +103,11 @@ class CloudBoardBinarySensor(AutoDartEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs):
         """Turn the entity on."""
-        await self.coordinator.data.async_start()
+        await self.coordinator.async_start()
 
     async def async_turn_off(self, **kwargs):
         """Turn the entity off."""
-        await self.coordinator.data.async_stop()
+        await self.coordinator.async_stop()
 
     @property
     def extra_state_attributes(self) -> dict | None:
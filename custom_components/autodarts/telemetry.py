@@ -0,0 +1,184 @@
+"""Connection and latency telemetry with constant memory estimators."""
+from __future__ import annotations
+
+from bisect import insort
+import math
+import time
+
+from .const import TELEMETRY_RATE_WINDOW
+
+PERCENTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+
+class Rate:
+    """Events per second, exponentially decayed over a time window."""
+
+    __slots__ = ("window", "_value", "_last")
+
+    def __init__(self, window=TELEMETRY_RATE_WINDOW):
+        self.window = window
+        self._value = 0.0
+        self._last = None
+
+    def add(self, now):
+        self._value = self.value(now) + 1 / self.window
+        self._last = now
+
+    def value(self, now):
+        if self._last is None:
+            return 0.0
+        return self._value * math.exp(-(now - self._last) / self.window)
+
+
+class P2Quantile:
+    """Streaming estimate of a quantile, the P² algorithm of Jain and Chlamtac."""
+
+    __slots__ = ("p", "heights", "positions", "desired", "increments")
+
+    def __init__(self, p):
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        q = self.heights
+        if len(q) < 5:
+            insort(q, x)
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+
+        n = self.positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # move the middle markers toward their desired position
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    def _parabolic(self, i, d):
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self):
+        if not (q := self.heights):
+            return None
+        if len(q) < 5:
+            return q[round(self.p * (len(q) - 1))]
+        return q[2]
+
+
+class Latency:
+    """Count, mean, max and percentiles of durations, in constant memory."""
+
+    __slots__ = ("count", "total", "max", "quantiles")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.quantiles = {name: P2Quantile(p) for name, p in PERCENTILES.items()}
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        for quantile in self.quantiles.values():
+            quantile.add(duration)
+
+    def percentile(self, name):
+        """Return a percentile in ms."""
+        value = self.quantiles[name].value
+        return None if value is None else round(value * 1000, 1)
+
+    def as_dict(self):
+        """Return the estimates in ms."""
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count * 1000, 1) if self.count else None,
+            "max": round(self.max * 1000, 1),
+            **{name: self.percentile(name) for name in self.quantiles},
+        }
+
+
+class Telemetry:
+    """Telemetry of the coordinators of a board.
+
+    Tracks the websocket message rate and last message time, the delay
+    between a message receipt and the entities writing its state, and the
+    duration of REST calls per action.
+    """
+
+    def __init__(self):
+        self.messages = Rate()
+        self.last_message = None
+        self.write_latency = Latency()
+        self.rest = {}
+
+    def message_received(self, now):
+        self.messages.add(now)
+        self.last_message = now
+
+    @property
+    def message_rate(self):
+        return round(self.messages.value(time.monotonic()), 2)
+
+    @property
+    def last_message_age(self):
+        if self.last_message is not None:
+            return round(time.monotonic() - self.last_message, 1)
+
+    @property
+    def rest_latency(self):
+        """Return REST latencies of all actions together."""
+        latency = self.rest.get(None)
+        return latency.percentile("p50") if latency else None
+
+    @property
+    def rest_latencies(self):
+        """Return REST latencies per action."""
+        return {
+            action: latency.as_dict()
+            for action, latency in self.rest.items()
+            if action is not None
+        }
+
+    async def async_timed(self, action, awaitable):
+        """Await a REST call, recording its duration under action."""
+        start = time.monotonic()
+        try:
+            return await awaitable
+        finally:
+            duration = time.monotonic() - start
+            for key in (action, None):
+                self.rest.setdefault(key, Latency()).add(duration)
+
+    def as_dict(self):
+        return {
+            "message_rate": self.message_rate,
+            "last_message_age": self.last_message_age,
+            "write_latency": self.write_latency.as_dict(),
+            "rest_latency": self.rest_latencies,
+        }
@@ -0,0 +1,203 @@
+"""Record and replay of the websocket traffic of a board."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import ExitStack
+import gzip
+import json
+import logging
+import os
+import time
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    TRAFFIC_BACKUPS,
+    TRAFFIC_BATCH_SIZE,
+    TRAFFIC_FLUSH_DELAY,
+    TRAFFIC_MAX_BYTES,
+    TRAFFIC_MAX_QUEUE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def traffic_path(directory, name, index=0):
+    suffix = f".{index}" if index else ""
+    return os.path.join(directory, f"{name}{suffix}.jsonl.gz")
+
+
+def read_messages(path):
+    """Return the messages of a recorded file, in order."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def is_frame(message):
+    """Return True for a recorded state frame, not an event, command or marker."""
+    return not message.keys() & {"event", "command", "session"}
+
+
+class TrafficRecorder:
+    """Gzipped JSONL log of incoming frames, events and outgoing commands.
+
+    Messages are stamped with the wall clock and queued in memory, then
+    serialized and written by batch in an executor. The file is rotated once
+    it reaches max_bytes, keeping backups older files. Every file opened,
+    after a restart or a rotation, starts with a session marker line
+    {"t": ..., "session": ...}, the start time of the recorder. Same format
+    as the traces of scripts/traces.py, so a recording can be benchmarked
+    too.
+    """
+
+    def __init__(
+        self,
+        hass,
+        directory,
+        name,
+        max_bytes=TRAFFIC_MAX_BYTES,
+        backups=TRAFFIC_BACKUPS,
+        max_queue=TRAFFIC_MAX_QUEUE,
+    ):
+        self.hass = hass
+        self.directory = directory
+        self.name = name
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.queue = deque(maxlen=max_queue)
+        self.written = 0
+        self.dropped = 0
+        self.session = time.time()
+        self._file = None
+        self._lock = asyncio.Lock()
+        self._cancel_flush = None
+
+    @property
+    def path(self):
+        return traffic_path(self.directory, self.name)
+
+    def _open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        # appending adds a gzip member, read back as one stream
+        self._file = gzip.open(self.path, "at", encoding="utf-8")
+        marker = {"t": time.time(), "session": self.session}
+        self._file.write(json.dumps(marker, separators=(",", ":")) + "\n")
+
+    def _rotate(self):
+        self._close()
+        for index in range(self.backups, 0, -1):
+            source = traffic_path(self.directory, self.name, index - 1)
+            if os.path.exists(source):
+                os.replace(source, traffic_path(self.directory, self.name, index))
+        self._open()
+
+    def _write(self, messages):
+        if self._file is None:
+            self._open()
+        for message in messages:
+            line = json.dumps(message, separators=(",", ":"), default=str)
+            self._file.write(line + "\n")
+        self._file.flush()
+        if os.path.getsize(self.path) >= self.max_bytes:
+            self._rotate()
+
+    def _close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    @callback
+    def record(self, channel, data, **kind):
+        """Queue a message, kind is event=name or command=name for non frames."""
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(
+            {"t": time.time(), "channel": channel, **kind, "data": data}
+        )
+        if len(self.queue) >= TRAFFIC_BATCH_SIZE:
+            self.hass.async_create_task(self.async_flush())
+        elif self._cancel_flush is None:
+            self._cancel_flush = async_call_later(
+                self.hass, TRAFFIC_FLUSH_DELAY, self._on_flush_timer
+            )
+
+    @callback
+    def _on_flush_timer(self, _now):
+        self._cancel_flush = None
+        self.hass.async_create_task(self.async_flush())
+
+    async def async_flush(self):
+        async with self._lock:
+            if self._cancel_flush:
+                self._cancel_flush()
+                self._cancel_flush = None
+            if not self.queue:
+                return
+            messages = list(self.queue)
+            self.queue.clear()
+            try:
+                await self.hass.async_add_executor_job(self._write, messages)
+            except (OSError, TypeError, ValueError) as e:
+                _LOGGER.error(f"Unable to record {len(messages)} messages : {e}")
+            else:
+                self.written += len(messages)
+
+    async def async_close(self, _event=None):
+        await self.async_flush()
+        async with self._lock:
+            await self.hass.async_add_executor_job(self._close)
+
+    @property
+    def attributes(self):
+        return {
+            "path": self.path,
+            "written": self.written,
+            "queued": len(self.queue),
+            "dropped": self.dropped,
+        }
+
+
+async def async_replay(hass, coordinators, path, realtime=True):
+    """Publish the frames of a recording through coordinators.
+
+    coordinators maps a channel to its coordinator. Frames are delayed as
+    recorded when realtime, else sent as fast as the loop allows; a session
+    marker, or a clock going back in older recordings, starts the timing
+    again instead of waiting for the restart. Frames are published from a
+    replay store of each coordinator: frame listeners, recording and the
+    live state are left alone. Events and commands are not replayed, they
+    would reach the cloud.
+    """
+    messages = await hass.async_add_executor_job(read_messages, path)
+    messages = [
+        message
+        for message in messages
+        if "session" in message
+        or is_frame(message) and message.get("channel") in coordinators
+    ]
+    if not any(map(is_frame, messages)):
+        return 0
+
+    loop = asyncio.get_running_loop()
+    frames = 0
+    origin = previous = None
+    with ExitStack() as stack:
+        for coordinator in set(coordinators.values()):
+            stack.enter_context(coordinator.replaying())
+        for message in messages:
+            if "session" in message or (previous is not None and message["t"] < previous):
+                origin = None
+            previous = message["t"]
+            if "session" in message:
+                continue
+            if origin is None:
+                start, origin = loop.time(), message["t"]
+            if realtime and (delay := start + message["t"] - origin - loop.time()) > 0:
+                await asyncio.sleep(delay)
+            else:
+                await asyncio.sleep(0)
+            coordinators[message["channel"]].replay_frame(message["data"])
+            frames += 1
+    return frames
@@ -0,0 +1,137 @@
+"""Precomputed view of a match, built once per coordinator update."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from .const import CRICKET_ALLOWED_DARTS, X01_ALLOWED_DARTS
+
+
+def unique(sequence):
+    seen = set()
+    return [x for x in sequence if not (x in seen or seen.add(x))]
+
+
+CRICKET_OPTIONS = tuple(unique(CRICKET_ALLOWED_DARTS))
+X01_OPTIONS = tuple(unique(X01_ALLOWED_DARTS))
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerView:
+    """Everything a player sensor renders."""
+
+    name: str
+    ppr: Any
+    user_id: str | None
+    sets: Any
+    legs: Any
+    score: Any
+    segments: dict | None
+    stats: dict | None
+    winner: bool | None
+    # a 1-tuple before, see the README breaking changes
+    current: bool
+
+
+@dataclass(frozen=True, slots=True)
+class DartView:
+    """Everything a dart select renders."""
+
+    throw: dict | None
+    checkout_guide: str | None
+    current_option: str
+    options: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class MatchView:
+    """Immutable snapshot of a match."""
+
+    id: str
+    variant: str
+    finished: bool
+    player: int
+    leg: Any
+    set: Any
+    round: Any
+    settings: Any
+    turn_score: Any
+    turn_busted: Any
+    players: tuple[PlayerView, ...]
+    darts: tuple[DartView, ...]
+
+    @classmethod
+    def from_match(cls, match) -> MatchView:
+        state = match.state
+        cricket = match.variant == "Cricket"
+        finished = match.finished
+
+        # transpose {number: [per player]} once for all players
+        segments = [{} for _ in match.players]
+        if cricket:
+            for number, values in state["segments"].items():
+                for idx, value in enumerate(values[: len(segments)]):
+                    segments[idx][number] = value
+
+        players = []
+        for idx, player in enumerate(match.players):
+            score = match.scores[idx]
+            stats = dict(match.stats[idx])
+            stats.pop("game", None)
+            stats.pop("indices", None)
+            players.append(
+                PlayerView(
+                    name=player.name,
+                    ppr=player.cpuPPR,
+                    user_id=player.user_id,
+                    sets=score["sets"],
+                    legs=score["legs"],
+                    score=match.game_scores[idx],
+                    segments=segments[idx] if cricket else None,
+                    stats=stats,
+                    winner=match.winner == idx if finished else None,
+                    current=idx == match.player,
+                )
+            )
+
+        throws = match.turns[-1]["throws"] if match.turns else []
+        checkout = state.get("checkoutGuide") or []
+        allowed = CRICKET_OPTIONS if cricket else X01_OPTIONS
+        darts = []
+        for idx in range(3):
+            throw = throws[idx] if idx < len(throws) else None
+            option = ""
+            if throw:
+                name = throw["segment"]["name"]
+                # we don't want MXX as it add a lot options for nothing
+                option = "Miss" if name[0] == "M" else name
+            if (idx <= len(throws) and not finished) or (
+                idx < len(throws) and finished
+            ):
+                # we can change only an already play dart or next one (if match is not finished)
+                options = allowed if option in allowed else allowed + (option,)
+            else:
+                options = (option,)
+            darts.append(
+                DartView(
+                    throw=throw,
+                    checkout_guide=checkout[idx]["name"] if idx < len(checkout) else None,
+                    current_option=option,
+                    options=options,
+                )
+            )
+
+        return cls(
+            id=match.id,
+            variant=match.variant,
+            finished=finished,
+            player=match.player,
+            leg=match.leg,
+            set=match.set,
+            round=match.round,
+            settings=match.settings,
+            turn_score=match.turn_score,
+            turn_busted=match.turn_busted,
+            players=tuple(players),
+            darts=tuple(darts),
+        )
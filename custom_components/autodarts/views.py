@@ -0,0 +1,166 @@
+"""Http views for the autodarts frontend."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+from os import path, stat, walk
+import time
+from xml.etree import ElementTree
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http.view import HomeAssistantView
+
+from .const import ICON_INDEX_CHECK_INTERVAL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+PATH_CLASSES = {
+    "fa-primary": "primary",
+    "fa-secondary": "secondary",
+    "primary": "primary",
+    "secondary": "secondary",
+}
+
+
+def etag_of(body):
+    return f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+
+
+def parse_svg(filepath):
+    """Reduce an svg file to what ha-icon draws, as main.js preProcessIcon does."""
+    root = ElementTree.parse(filepath).getroot()
+    icon = {"viewBox": root.get("viewBox"), "path": ""}
+    for element in root.iter():
+        if not element.tag.endswith("path") or not (d := element.get("d")):
+            continue
+        icon["path"] += d
+        classes = (element.get("class") or "").split()
+        if classes and (cls := PATH_CLASSES.get(classes[0])):
+            icon[cls] = d
+    return icon
+
+
+class IconIndex:
+    """Listing of an icon directory, rebuilt only when a directory or icon changes.
+
+    The whole set is also kept parsed and gzipped, main.js loads it in one
+    request instead of fetching and parsing every svg.
+    """
+
+    def __init__(self, iconpath):
+        self.iconpath = iconpath
+        self.body = b"[]"
+        self.etag = None
+        self.bundle = b"{}"
+        self.bundle_gz = gzip.compress(self.bundle)
+        self.bundle_etag = None
+        self._mtimes = {}
+        self._checked = 0
+
+    def _mtimes_of(self, paths):
+        mtimes = {}
+        for filepath in paths:
+            try:
+                mtimes[filepath] = stat(filepath).st_mtime_ns
+            except OSError:
+                mtimes[filepath] = None
+        return mtimes
+
+    def build(self):
+        """Walk the icon directory, blocking."""
+        icons = []
+        bundle = {}
+        # directories change on added or removed icons, files on edited ones
+        paths = []
+        for dirpath, _dirnames, filenames in walk(self.iconpath):
+            paths.append(dirpath)
+            for fn in sorted(filenames):
+                if not fn.endswith(".svg"):
+                    continue
+                name = path.join(dirpath[len(self.iconpath) :], fn[:-4])
+                icons.append({"name": name})
+                paths.append(path.join(dirpath, fn))
+                try:
+                    bundle[name] = parse_svg(paths[-1])
+                except ElementTree.ParseError as e:
+                    _LOGGER.warning(f"Invalid icon {name} : {e}")
+        self._mtimes = self._mtimes_of(paths)
+        self.body = json.dumps(icons).encode()
+        self.etag = etag_of(self.body)
+        self.bundle = json.dumps(bundle, separators=(",", ":")).encode()
+        self.bundle_gz = gzip.compress(self.bundle, compresslevel=9)
+        self.bundle_etag = etag_of(self.bundle)
+        _LOGGER.debug(f"Indexed {len(icons)} icons in {self.iconpath}")
+
+    def refresh(self):
+        """Rebuild the index if an indexed directory or icon changed, blocking."""
+        if self._mtimes_of(self._mtimes) != self._mtimes:
+            self.build()
+
+    async def async_refresh(self, hass):
+        """Check directories at most every ICON_INDEX_CHECK_INTERVAL seconds."""
+        now = time.monotonic()
+        if self.etag and now - self._checked < ICON_INDEX_CHECK_INTERVAL:
+            return
+        self._checked = now
+        await hass.async_add_executor_job(
+            self.refresh if self.etag else self.build
+        )
+
+
+def cached_response(request, body, etag, content_type, max_age, body_gz=None):
+    """Return body, or a 304 if the client already has this etag.
+
+    The gzipped body is another representation, with its own etag.
+    """
+    headers = {hdrs.CACHE_CONTROL: f"public, max-age={max_age}, must-revalidate"}
+    if body_gz is not None:
+        headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
+        if "gzip" in request.headers.get(hdrs.ACCEPT_ENCODING, ""):
+            headers[hdrs.CONTENT_ENCODING] = "gzip"
+            body = body_gz
+            etag = f'{etag[:-1]}-gzip"'
+    headers[hdrs.ETAG] = etag
+    if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+        headers.pop(hdrs.CONTENT_ENCODING, None)
+        return web.Response(status=304, headers=headers)
+    return web.Response(body=body, content_type=content_type, headers=headers)
+
+
+class ListingView(HomeAssistantView):
+    requires_auth = False
+
+    def __init__(self, url, index):
+        self.url = url
+        self.index = index
+        self.name = "Icon Listing"
+
+    async def get(self, request):
+        await self.index.async_refresh(request.app["hass"])
+        return cached_response(
+            request, self.index.body, self.index.etag, "application/json", 0
+        )
+
+
+class IconSetView(HomeAssistantView):
+    requires_auth = False
+
+    def __init__(self, url, index):
+        self.url = url
+        self.index = index
+        self.name = "Icon Set"
+
+    async def get(self, request):
+        await self.index.async_refresh(request.app["hass"])
+        return cached_response(
+            request,
+            self.index.bundle,
+            self.index.bundle_etag,
+            "application/json",
+            0,
+            self.index.bundle_gz,
+        )
@@ -0,0 +1,322 @@
+"""Trace replay benchmark of the coordinators and entity platforms.
+
+Replays websocket traces through AutoDartsBoardCoordinator,
+AutoDartsBoardMatchCoordinator and the entities of every platform, on a
+minimal Home Assistant instance and the offline autodarts stub of
+scripts/stubs. By default synthetic X01 and Cricket matches of 2 to 6
+players are replayed; recorded traces, like the traffic recordings of
+the integration, can be given with --trace.
+
+Reports per scenario messages per second, p50/p99 latency of a message
+(from delivery to the end of the state writes it causes), state writes
+per message and peak memory of the replay.
+
+    python scripts/bench_replay.py
+    python scripts/bench_replay.py --variant X01 --players 4 --coalesce 150
+    python scripts/bench_replay.py --save baseline.json
+    python scripts/bench_replay.py --baseline baseline.json --tolerance 0.2
+
+With --baseline, exits with status 1 when a scenario got slower, or
+writes more, than the baseline by more than the tolerance. Requires
+homeassistant and numpy, runs offline.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import timedelta
+import importlib
+import importlib.util
+import json
+import logging
+from pathlib import Path
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = Path(__file__).parent.parent
+INTEGRATION = ROOT / "custom_components/autodarts"
+sys.path.insert(0, str(Path(__file__).parent / "stubs"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from traces import match_trace, read_trace  # noqa: E402
+
+_LOGGER = logging.getLogger("bench_replay")
+
+PLATFORMS = ("sensor", "select", "button", "switch")
+ENTRY_ID = "bench"
+
+
+def register_integration():
+    """Register the integration package without running its setup module."""
+    if "custom_components.autodarts" not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            "custom_components.autodarts",
+            INTEGRATION / "__init__.py",
+            submodule_search_locations=[str(INTEGRATION)],
+        )
+        # not executed : http views and frontend are not part of the benchmark
+        sys.modules[spec.name] = importlib.util.module_from_spec(spec)
+
+
+def load_integration():
+    """Import the integration modules the replay needs."""
+    register_integration()
+    return {
+        name: importlib.import_module(f"custom_components.autodarts.{name}")
+        for name in ("const", "coordinator", "entity", "events", "statistics")
+        + PLATFORMS
+    }
+
+
+async def async_minimal_hass(config_dir):
+    """Return a Home Assistant core with state machine, bus and registries only."""
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import device_registry, entity_registry
+
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    await device_registry.async_load(hass)
+    await entity_registry.async_load(hass)
+    return hass
+
+
+class WriteCounter:
+    """Count state writes of the integration entities."""
+
+    def __init__(self, entity_cls):
+        self.count = 0
+        write = entity_cls.async_write_ha_state
+
+        def counting_write(entity):
+            self.count += 1
+            write(entity)
+
+        entity_cls.async_write_ha_state = counting_write
+
+
+class Replay:
+    """A minimal hass with one board entry, fed from a trace."""
+
+    def __init__(self, modules, trace, coalesce_window):
+        self.modules = modules
+        self.trace = trace
+        self.coalesce_window = coalesce_window
+        self.hass = None
+        self.platforms = []
+
+    async def async_setup(self, config_dir):
+        from autodarts import StubSession
+        from homeassistant.helpers.entity_platform import EntityPlatform
+
+        const = self.modules["const"]
+        coordinator = self.modules["coordinator"]
+        self.hass = hass = await async_minimal_hass(config_dir)
+
+        # boards and matches the stub cloud knows about before replay
+        self.session = StubSession()
+        board_id = None
+        for message in self.trace:
+            if not message.keys() & {"event", "command", "session"}:
+                self.states(message).setdefault(message["data"]["id"], message["data"])
+                board_id = board_id or message["data"]["id"]
+        # the board is idle when the replay starts
+        board = self.session.boards[board_id]
+        self.session.boards[board_id] = dict(board, matchId=None)
+
+        self.board = coordinator.AutoDartsBoardCoordinator(
+            hass, self.session, board_id, coalesce_window=self.coalesce_window
+        )
+        self.board.async_set_updated_data(await self.board._async_update_data())
+        self.match = coordinator.AutoDartsBoardMatchCoordinator(
+            hass, self.board, coalesce_window=self.coalesce_window
+        )
+        self.match.async_add_frame_listener(
+            self.modules["events"].event_listener(hass, board_id)
+        )
+        await self.match.async_discover()
+
+        hass.data[const.DOMAIN] = {
+            const.DATA_STATISTICS: self.modules["statistics"].StatisticsEngine(),
+            ENTRY_ID: {
+                "board_coordinator": self.board,
+                "match_coordinator": self.match,
+            },
+        }
+
+        entry = type("Entry", (), {"entry_id": ENTRY_ID})()
+        for name in PLATFORMS:
+            entities = []
+            await self.modules[name].async_setup_entry(hass, entry, entities.extend)
+            platform = EntityPlatform(
+                hass=hass,
+                logger=_LOGGER,
+                domain=name,
+                platform_name=const.DOMAIN,
+                platform=None,
+                scan_interval=timedelta(seconds=30),
+                entity_namespace=None,
+            )
+            await platform.async_add_entities(entities)
+            self.platforms.append(platform)
+
+    def states(self, message):
+        if message["channel"] == "board":
+            return self.session.boards
+        return self.session.matches
+
+    async def async_run(self):
+        """Replay the trace, return the latency of every message in s."""
+        latencies = []
+        for message in self.trace:
+            if "command" in message or "session" in message:
+                # recorded actions sent to the cloud, answered by later frames,
+                # and the session markers of recordings
+                continue
+            coordinator = self.board if message["channel"] == "board" else self.match
+            item = coordinator.item
+            start = time.perf_counter()
+            if "event" in message:
+                if item:
+                    await item.async_emit_event(message["event"], message["data"])
+            elif item and item.id == message["data"]["id"]:
+                item.emit(message["data"])
+            else:
+                # not subscribed, the next fetch will see it
+                self.states(message)[message["data"]["id"]] = message["data"]
+            latencies.append(time.perf_counter() - start)
+            # let coalescing timers and tasks run
+            await asyncio.sleep(0)
+        for coordinator in (self.match, self.board):
+            coordinator.flush()
+        await self.hass.async_block_till_done()
+        return latencies
+
+    async def async_teardown(self):
+        for platform in self.platforms:
+            await platform.async_reset()
+        for coordinator in (self.match, self.board):
+            coordinator.cancel_pending()
+            coordinator.disconnect()
+        await self.hass.async_stop(force=True)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+async def async_scenario(modules, writes, name, trace, coalesce_window):
+    with tempfile.TemporaryDirectory() as config_dir:
+        # timing run
+        replay = Replay(modules, trace, coalesce_window)
+        await replay.async_setup(config_dir)
+        writes.count = 0
+        start = time.perf_counter()
+        latencies = await replay.async_run()
+        elapsed = time.perf_counter() - start
+        write_count = writes.count
+        await replay.async_teardown()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        # memory run, tracemalloc slows everything down
+        replay = Replay(modules, trace, coalesce_window)
+        await replay.async_setup(config_dir)
+        tracemalloc.start()
+        await replay.async_run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        await replay.async_teardown()
+
+    return {
+        "scenario": name,
+        "messages": len(latencies),
+        "messages_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "writes_per_message": round(write_count / len(latencies), 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def regressions(results, baseline, tolerance):
+    """Return the descriptions of results worse than baseline."""
+    found = []
+    reference = {result["scenario"]: result for result in baseline}
+    for result in results:
+        if (base := reference.get(result["scenario"])) is None:
+            continue
+        for key, higher_is_better in (
+            ("messages_per_sec", True),
+            ("p99_ms", False),
+            ("writes_per_message", False),
+        ):
+            if higher_is_better:
+                worse = result[key] < base[key] * (1 - tolerance)
+            else:
+                worse = result[key] > base[key] * (1 + tolerance)
+            if worse:
+                found.append(f"{result['scenario']} {key}: {base[key]} -> {result[key]}")
+    return found
+
+
+def scenarios(args):
+    if args.trace:
+        for path in args.trace:
+            yield Path(path).name, read_trace(path)
+        return
+    for variant in args.variant:
+        for players in args.players:
+            yield f"{variant}-{players}p", match_trace(
+                variant, players, legs=args.legs, matches=args.matches
+            )
+
+
+async def async_main(args):
+    modules = load_integration()
+    writes = WriteCounter(modules["entity"].AutoDartEntity)
+    results = []
+
+    print(
+        f"{'scenario':<16} {'msgs':>6} {'msg/s':>9} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'writes/msg':>11} {'peak KiB':>9}"
+    )
+    for name, trace in scenarios(args):
+        result = await async_scenario(modules, writes, name, trace, args.coalesce)
+        results.append(result)
+        print(
+            f"{name:<16} {result['messages']:>6} {result['messages_per_sec']:>9} "
+            f"{result['p50_ms']:>8} {result['p99_ms']:>8} "
+            f"{result['writes_per_message']:>11} {result['peak_kib']:>9}"
+        )
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if found := regressions(results, baseline, args.tolerance):
+            print("\nRegressions:\n  " + "\n  ".join(found))
+            return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--variant", nargs="+", default=["X01", "Cricket"])
+    parser.add_argument("--players", nargs="+", type=int, default=[2, 3, 4, 5, 6])
+    parser.add_argument("--legs", type=int, default=2, help="legs to win a match")
+    parser.add_argument("--matches", type=int, default=1, help="matches per trace")
+    parser.add_argument("--trace", nargs="+", help="replay recorded traces instead")
+    parser.add_argument("--coalesce", type=int, default=0, help="coalescing window, ms")
+    parser.add_argument("--save", help="write results as json")
+    parser.add_argument("--baseline", help="results json to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(asyncio.run(async_main(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark of the statistics load path over a synthetic throw history.
+
+Writes a sqlite throw history through ThrowHistory, then times what a
+Home Assistant start does with it: a cold load reading every throw (no
+saved sums, first start or after a crash) and a warm load from the sums
+saved at the previous stop, followed by the live updates of a turn.
+
+    python scripts/bench_statistics.py [throws]
+
+Requires homeassistant and numpy, runs offline.
+"""
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_replay import register_integration  # noqa: E402
+
+PLAYERS = 8
+
+
+def synthetic_rows(history, count, seed=0):
+    """Yield history rows of count throws over the last year, in COLUMNS order."""
+    rng = np.random.default_rng(seed)
+    now = time.time()
+    rounds = rng.integers(1, 15, count)
+    numbers = rng.integers(0, 21, count)
+    multipliers = rng.integers(0, 4, count)
+    remaining = rng.integers(-1, 170, count)
+    busted = rng.random(count) < 0.05
+    timestamps = np.sort(now - rng.random(count) * 86400 * 365)
+    for idx in range(count):
+        match = idx // 60
+        values = {
+            "match_id": f"match-{match}",
+            "turn_id": f"turn-{idx // 3}",
+            "dart": idx % 3,
+            "board_id": "board",
+            "player_id": f"player-{idx // 3 % PLAYERS}",
+            "player": f"player {idx // 3 % PLAYERS}",
+            "variant": "Cricket" if match % 5 == 0 else "X01",
+            "round": int(rounds[idx]),
+            "segment": f"S{numbers[idx]}",
+            "number": int(numbers[idx]),
+            "multiplier": int(multipliers[idx]),
+            "bed": "SingleOuter",
+            "x": 0.1,
+            "y": -0.2,
+            "marks": int(multipliers[idx]),
+            "entry": None,
+            "remaining": int(remaining[idx]),
+            "busted": int(busted[idx]),
+            "timestamp": float(timestamps[idx]),
+        }
+        yield tuple(values[column] for column in history.COLUMNS)
+
+
+def write_history(history, path, count, batch=10000):
+    throws = history.ThrowHistory(None, path)
+    throws._open()
+    operations = []
+    for row in synthetic_rows(history, count):
+        operations.append((history.UPSERT, row))
+        if len(operations) == batch:
+            throws._write(operations)
+            operations.clear()
+    throws._write(operations)
+    throws._close()
+
+
+def timed_load(history, statistics, path):
+    """Return (seconds, engine, history) of a start: open the history and load it."""
+    start = time.perf_counter()
+    throws = history.ThrowHistory(None, path)
+    throws._open()
+    engine = statistics.StatisticsEngine()
+    throws._load_statistics(engine)
+    elapsed = time.perf_counter() - start
+    return elapsed, engine, throws
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    register_integration()
+    history = importlib.import_module("custom_components.autodarts.history")
+    statistics = importlib.import_module("custom_components.autodarts.statistics")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "history.db")
+        start = time.perf_counter()
+        write_history(history, path, count)
+        print(f"history of {count} throws written in {time.perf_counter() - start:.1f} s")
+
+        cold, engine, throws = timed_load(history, statistics, path)
+        throws._save_statistics(engine.all_time_sums())
+        throws._close()
+        warm, engine, throws = timed_load(history, statistics, path)
+        throws._close()
+
+        row = ("player 1", "X01", 2, 20, 3, 3, 101, 0, time.time())
+        turns = 1000
+        start = time.perf_counter()
+        for _ in range(turns):
+            for _ in range(3):
+                engine.record(row)
+        record = (time.perf_counter() - start) / turns / 3
+        engine.apply_pending()
+        start = time.perf_counter()
+        for _ in range(turns):
+            for _ in range(3):
+                engine.record(row)
+            engine.metrics("player 1")
+        turn = (time.perf_counter() - start) / turns
+
+    print(f"cold load (every throw read) : {cold * 1000:.0f} ms")
+    print(f"warm load (saved sums, today's throws) : {warm * 1000:.0f} ms")
+    print(f"live throw, throw callback : {record * 1e6:.1f} us")
+    print(f"live turn, 3 throws and a metrics read : {turn * 1e6:.0f} us")
+    print(engine.metrics("player 1")["all_time"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark of the incremental match store.
+
+Feeds synthetic match frames with a growing turn history into MatchStore
+and reports, per frame:
+
+- decode: time to decode the JSON frame, like the websocket client does
+- apply: time of MatchStore.apply on the decoded frame
+- allocated: peak memory allocated while applying the frame
+- retained: memory still held once every frame is applied, divided by
+  the number of frames, that is the latest turns list, not a leak
+
+Timings are taken without tracemalloc, which slows allocations down, and
+allocations in a second run. apply is not flat: the references of the
+turns list are copied once per frame, so it grows with the history, while
+decode, which the cloud full state frames impose, grows much faster.
+
+    python scripts/bench_store.py
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+from pathlib import Path
+import time
+import tracemalloc
+
+STORE_PATH = Path(__file__).parent.parent / "custom_components/autodarts/store.py"
+
+
+def load_store():
+    spec = importlib.util.spec_from_file_location("autodarts_store", STORE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_turn(idx, throws=3):
+    return {
+        "id": f"turn-{idx}",
+        "playerId": f"player-{idx % 2}",
+        "round": idx // 2 + 1,
+        "points": 60,
+        "busted": False,
+        "throws": [
+            {
+                "segment": {"name": "T20", "number": 20, "bed": "Triple", "multiplier": 3},
+                "coords": {"x": 0.01 * dart, "y": 0.6},
+                "marks": 3,
+                "entry": "detected",
+            }
+            for dart in range(throws)
+        ],
+    }
+
+
+def make_frames(turns, count):
+    """Return count encoded frames, each adding one dart to the current turn."""
+    settings = {"baseScore": 501, "inMode": "Straight", "outMode": "Double"}
+    history = [make_turn(idx) for idx in range(turns)]
+    frames = []
+    for dart in range(count):
+        current = make_turn(turns, throws=dart % 3 + 1)
+        frames.append(
+            json.dumps(
+                {
+                    "id": "match",
+                    "variant": "X01",
+                    "settings": settings,
+                    "players": [{"name": "A"}, {"name": "B"}],
+                    "player": turns % 2,
+                    "turns": history + [current],
+                    "turnScore": 60 * (dart % 3 + 1),
+                    "turnBusted": False,
+                    "finished": False,
+                }
+            )
+        )
+    return frames
+
+
+def time_frames(store_cls, frames):
+    """Return decode and apply time per frame, in s."""
+    store = store_cls()
+    store.apply(json.loads(frames[0]))
+
+    start = time.perf_counter()
+    decoded = [json.loads(frame) for frame in frames[1:]]
+    decode = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for frame in decoded:
+        store.apply(frame)
+    apply = time.perf_counter() - start
+    return decode / len(decoded), apply / len(decoded)
+
+
+def trace_frames(store_cls, frames):
+    """Return mean peak allocation and retained memory per frame, in bytes."""
+    store = store_cls()
+    store.apply(json.loads(frames[0]))
+    decoded = [json.loads(frame) for frame in frames[1:]]
+
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    allocated = 0
+    for frame in decoded:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        store.apply(frame)
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    # decoded frames are held by the list, only the store growth is left
+    retained = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return allocated / len(decoded), retained / len(decoded)
+
+
+def main():
+    store = load_store()
+    print(
+        f"{'turns':>6} {'decode us':>10} {'apply us':>9} "
+        f"{'allocated B':>12} {'retained B':>11}"
+    )
+    for turns in (10, 100, 500, 1000):
+        frames = make_frames(turns, 300)
+        decode, apply = time_frames(store.MatchStore, frames)
+        allocated, retained = trace_frames(store.MatchStore, frames)
+        print(
+            f"{turns:>6} {decode * 1e6:>10.1f} {apply * 1e6:>9.1f} "
+            f"{allocated:>12.0f} {retained:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Local stand-in for an autodarts board manager on the LAN.
+
+Serves the board manager state on GET /api/state and pushes it on the
+/api/events websocket, as {"type": "state", "data": {...}}. Throws are
+detected at a random rate, three per turn followed by a takeout, or sent
+by hand with the control api:
+
+    POST /_control/throw?segment=T20   detect a throw
+    POST /_control/takeout             remove the darts
+    POST /_control/drop                close every open socket
+
+    python scripts/fake_board.py --port 3180 --throw-rate 0.5
+
+Point the integration local mode to this host (board manager address).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+
+from aiohttp import WSMsgType, web
+
+from fake_cloud import parse_segment
+
+_LOGGER = logging.getLogger("fake_board")
+
+TAKEOUT_DELAY = 3  # s
+
+
+class FakeBoardManager:
+    def __init__(self, throw_rate=0.5):
+        self.throw_rate = throw_rate
+        self.sockets = set()
+        self.throws = []
+        self.status = "Throw"
+        self.event = "Started"
+
+    def state(self):
+        return {
+            "connected": True,
+            "running": True,
+            "status": self.status,
+            "event": self.event,
+            "numThrows": len(self.throws),
+            "throws": self.throws,
+        }
+
+    def publish(self):
+        message = json.dumps({"type": "state", "data": self.state()})
+        for ws in list(self.sockets):
+            asyncio.ensure_future(self._send(ws, message))
+
+    async def _send(self, ws, message):
+        try:
+            await ws.send_str(message)
+        except ConnectionError:
+            pass
+
+    def throw(self, name):
+        if len(self.throws) >= 3:
+            return False
+        self.throws = self.throws + [
+            {
+                "segment": parse_segment(name),
+                "coords": {
+                    "x": round(random.uniform(-1, 1), 4),
+                    "y": round(random.uniform(-1, 1), 4),
+                },
+            }
+        ]
+        self.status = "Takeout" if len(self.throws) == 3 else "Throw"
+        self.event = "Throw detected"
+        self.publish()
+        return True
+
+    def takeout(self):
+        self.throws = []
+        self.status = "Throw"
+        self.event = "Takeout finished"
+        self.publish()
+
+    async def play(self):
+        """Throw at random, taking the darts out after every turn."""
+        names = ["T20", "S20", "S1", "S5", "D20", "Bull", "25", "M20"]
+        while True:
+            await asyncio.sleep(random.expovariate(self.throw_rate))
+            self.throw(random.choice(names))
+            if len(self.throws) == 3:
+                await asyncio.sleep(TAKEOUT_DELAY)
+                self.takeout()
+
+    async def get_state(self, request):
+        return web.json_response(self.state())
+
+    async def events(self, request):
+        ws = web.WebSocketResponse(heartbeat=10)
+        await ws.prepare(request)
+        self.sockets.add(ws)
+        _LOGGER.info(f"socket opened ({len(self.sockets)} open)")
+        await ws.send_str(json.dumps({"type": "state", "data": self.state()}))
+        try:
+            async for msg in ws:
+                if msg.type == WSMsgType.ERROR:
+                    break
+        finally:
+            self.sockets.discard(ws)
+            _LOGGER.info(f"socket closed ({len(self.sockets)} open)")
+        return ws
+
+    async def control_throw(self, request):
+        accepted = self.throw(request.query.get("segment", "T20"))
+        return web.json_response(self.state(), status=200 if accepted else 409)
+
+    async def control_takeout(self, request):
+        self.takeout()
+        return web.json_response(self.state())
+
+    async def control_drop(self, request):
+        sockets = list(self.sockets)
+        for ws in sockets:
+            await ws.close(code=1011, message=b"dropped")
+        return web.json_response({"dropped": len(sockets)})
+
+    def app(self, auto=True):
+        app = web.Application()
+        app.router.add_get("/api/state", self.get_state)
+        app.router.add_get("/api/events", self.events)
+        app.router.add_post("/_control/throw", self.control_throw)
+        app.router.add_post("/_control/takeout", self.control_takeout)
+        app.router.add_post("/_control/drop", self.control_drop)
+        if auto:
+
+            async def start_play(app):
+                app["play"] = asyncio.create_task(self.play())
+
+            async def stop_play(app):
+                app["play"].cancel()
+
+            app.on_startup.append(start_play)
+            app.on_cleanup.append(stop_play)
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=3180)
+    parser.add_argument("--throw-rate", type=float, default=0.5, help="darts/s")
+    parser.add_argument("--manual", action="store_true", help="only control api throws")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    board = FakeBoardManager(args.throw_rate)
+    web.run_app(board.app(auto=not args.manual), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+"""Local stand-in for the autodarts cloud, REST and websocket.
+
+Simulates N boards playing synthetic X01 or Cricket matches one after the
+other, at a configurable throw rate. Paths follow the cloud api used by
+the autodarts library:
+
+    GET    /bs/v0/boards/{id}                   board
+    POST   /bs/v0/boards/{id}/{reset|start|stop}
+    GET    /gs/v0/matches/{id}/state            match
+    POST   /gs/v0/matches/{id}/throws           throw, json {"segment": ...}
+    DELETE /gs/v0/matches/{id}/throws           undo
+    POST   /gs/v0/matches/{id}/players/next     next player
+    POST   /gs/v0/matches/{id}/games/next       next leg
+    POST   /gs/v0/matches/{id}/finish
+    DELETE /gs/v0/matches/{id}                  abort, ends the match
+    GET    /ms/v0/subscribe                     websocket
+
+A thrown segment is a segment object, as sent by the library, or a name
+like "T20".
+
+Websocket clients send {"type": "subscribe", "channel": ..., "topic": ...}
+for "<id>.state" and "<id>.events" topics of the autodarts.boards and
+autodarts.matches channels, and receive {"channel", "topic", "data"}.
+
+A control api injects faults and reports counters:
+
+    POST /_control/drop                close every open socket
+    POST /_control/down?seconds=N      refuse new sockets for N seconds
+    POST /_control/latency?ms=N        delay every REST answer by N ms
+    POST /_control/errors?rate=R       answer a ratio R of REST calls with 500
+    GET  /_control/stats               counters
+
+    python scripts/fake_cloud.py --boards 50 --throw-rate 0.5 --port 8765
+
+Neither the library nor the integration has a configurable api url:
+benchmarks use this server through the offline library of scripts/stubs
+or their own clients. To run Home Assistant against it, resolve
+api.autodarts.io to a TLS reverse proxy forwarding https and wss to this
+port (an /etc/hosts entry of the Home Assistant host, and a certificate
+it trusts). Login still goes to login.autodarts.io, a real account is
+needed and its token is accepted here without check. Board ids are
+board-0, board-1...
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+
+from aiohttp import WSMsgType, web
+
+from traces import MatchSimulation, board_state, segment
+
+_LOGGER = logging.getLogger("fake_cloud")
+
+BOARDS = "autodarts.boards"
+MATCHES = "autodarts.matches"
+
+
+def parse_segment(name):
+    """Return the segment of a name like T20, D16, S5, 25, Bull, Miss or M3.
+
+    A segment object, with number and multiplier, is normalized as well.
+    """
+    if isinstance(name, dict):
+        return segment(int(name.get("number") or 0), int(name.get("multiplier") or 0))
+    if name == "Bull":
+        return segment(25, 2)
+    if name == "25":
+        return segment(25, 1)
+    if name[0] == "M":
+        return segment(int(name[1:] or 0) if name != "Miss" else 0, 0)
+    return segment(int(name[1:]), "SDT".index(name[0]) + 1)
+
+
+class FakeBoard:
+    """A board playing synthetic matches, publishing every state change."""
+
+    def __init__(self, cloud, idx, variant, players):
+        self.cloud = cloud
+        self.id = f"board-{idx}"
+        self.idx = idx
+        self.variant = variant
+        self.players = players
+        self.running = True
+        self.matches = 0
+        self.match = None
+        self.aborted = False
+        self.state = board_state(self.id, None, "Started", 0)
+
+    def publish_board(self, status, throws):
+        match_id = self.match["id"] if self.match else None
+        self.state = board_state(self.id, match_id, status, throws)
+        self.cloud.publish(BOARDS, f"{self.id}.state", self.state)
+
+    def publish_match(self, state):
+        self.match = state
+        self.cloud.matches[state["id"]] = self
+        self.cloud.publish(MATCHES, f"{state['id']}.state", state)
+
+    async def run(self):
+        rng = random.Random(self.idx)
+        while True:
+            if not self.running:
+                await asyncio.sleep(1)
+                continue
+            self.matches += 1
+            simulation = MatchSimulation(
+                self.variant,
+                self.players,
+                seed=self.idx * 1000 + self.matches,
+                match_id=f"{self.id}-match-{self.matches}",
+            )
+            self.match = simulation.state()
+            self.publish_match(self.match)
+            self.publish_board("Started", 0)
+            self.cloud.publish(BOARDS, f"{self.id}.events", {"event": "Manual reset"})
+
+            darts = 0
+            for _channel, state in simulation:
+                thrown = len(state["turns"][-1]["throws"]) if state["turns"] else 0
+                if thrown != darts:
+                    # exponential inter throw delay around the configured rate
+                    await asyncio.sleep(rng.expovariate(self.cloud.throw_rate))
+                    if self.aborted:
+                        break
+                    self.publish_board("Takeout" if thrown == 3 else "Throw", thrown)
+                    darts = thrown
+                self.publish_match(state)
+                while not self.running and not self.aborted:
+                    await asyncio.sleep(1)
+                if self.aborted:
+                    break
+
+            if not self.aborted:
+                await asyncio.sleep(self.cloud.match_pause)
+            if self.aborted:
+                # already ended by abort()
+                self.aborted = False
+                await asyncio.sleep(self.cloud.match_pause)
+                continue
+            self.end_match("finish")
+
+    def end_match(self, event):
+        self.cloud.publish(MATCHES, f"{self.match['id']}.events", {"event": event})
+        self.cloud.matches.pop(self.match["id"], None)
+        self.match = None
+        self.publish_board("Started", 0)
+
+    # manual actions, applied to the current state and echoed on the socket
+
+    def throw(self, name):
+        turn = self.match["turns"][-1] if self.match["turns"] else None
+        if turn is None or len(turn["throws"]) >= 3:
+            return
+        throw = {"segment": parse_segment(name), "coords": None, "marks": 0, "entry": "manual"}
+        turn = dict(turn, throws=turn["throws"] + [throw])
+        self.publish_match(dict(self.match, turns=self.match["turns"][:-1] + [turn]))
+
+    def undo(self):
+        if self.match["turns"] and (turn := self.match["turns"][-1])["throws"]:
+            turn = dict(turn, throws=turn["throws"][:-1])
+            self.publish_match(dict(self.match, turns=self.match["turns"][:-1] + [turn]))
+
+    def abort(self):
+        """End the match now, the simulation starts the next one after a pause."""
+        self.aborted = True
+        self.end_match("delete")
+
+    def next_player(self):
+        player = (self.match["player"] + 1) % len(self.match["players"])
+        self.publish_match(dict(self.match, player=player, turnScore=0, turnBusted=False))
+
+
+class FakeCloud:
+    def __init__(self, boards=1, variant="X01", players=2, throw_rate=0.5, match_pause=5):
+        self.throw_rate = throw_rate
+        self.match_pause = match_pause
+        self.boards = {
+            board.id: board
+            for board in (FakeBoard(self, idx, variant, players) for idx in range(boards))
+        }
+        self.matches = {}
+        self.subscriptions = {}
+        self.sockets = set()
+        self.down_until = 0
+        self.latency = 0
+        self.error_rate = 0
+        self.stats = {
+            "connections": 0,
+            "requests": 0,
+            "errors": 0,
+            "messages": 0,
+            "actions": 0,
+        }
+
+    # websocket
+
+    def publish(self, channel, topic, data):
+        message = None
+        for ws in self.subscriptions.get((channel, topic), ()):
+            if not ws.closed:
+                message = message or json.dumps(
+                    {"channel": channel, "topic": topic, "data": data}
+                )
+                self.stats["messages"] += 1
+                asyncio.ensure_future(self._send(ws, message))
+
+    async def _send(self, ws, message):
+        try:
+            await ws.send_str(message)
+        except ConnectionError:
+            # closed meanwhile, the client reconnects
+            pass
+
+    async def subscribe(self, request):
+        if time.monotonic() < self.down_until:
+            return web.Response(status=503, text="outage")
+
+        ws = web.WebSocketResponse(heartbeat=10)
+        await ws.prepare(request)
+        self.stats["connections"] += 1
+        self.sockets.add(ws)
+        topics = set()
+        _LOGGER.info(f"socket opened ({len(self.sockets)} open)")
+        try:
+            async for msg in ws:
+                if msg.type == WSMsgType.ERROR:
+                    break
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                command = json.loads(msg.data)
+                key = (command.get("channel"), command.get("topic"))
+                if command.get("type") == "subscribe":
+                    topics.add(key)
+                    self.subscriptions.setdefault(key, set()).add(ws)
+                elif command.get("type") == "unsubscribe":
+                    topics.discard(key)
+                    self.subscriptions.get(key, set()).discard(ws)
+        finally:
+            for key in topics:
+                self.subscriptions.get(key, set()).discard(ws)
+            self.sockets.discard(ws)
+            _LOGGER.info(f"socket closed ({len(self.sockets)} open)")
+        return ws
+
+    # REST
+
+    @web.middleware
+    async def faults(self, request, handler):
+        if request.path.startswith("/_control") or request.path.startswith("/ms/"):
+            return await handler(request)
+        self.stats["requests"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency / 1000 * random.uniform(0.5, 1.5))
+        if random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return web.json_response({"error": "injected"}, status=500)
+        return await handler(request)
+
+    def board(self, request):
+        if (board := self.boards.get(request.match_info["id"])) is None:
+            raise web.HTTPNotFound()
+        return board
+
+    def match_board(self, request):
+        board = self.matches.get(request.match_info["id"])
+        if board is None or board.match is None:
+            raise web.HTTPNotFound()
+        return board
+
+    async def get_board(self, request):
+        return web.json_response(self.board(request).state)
+
+    async def board_action(self, request):
+        board = self.board(request)
+        action = request.match_info["action"]
+        self.stats["actions"] += 1
+        if action == "reset":
+            board.publish_board("Started", 0)
+            self.publish(BOARDS, f"{board.id}.events", {"event": "Manual reset"})
+        else:
+            board.running = action == "start"
+            board.publish_board("Started" if board.running else "Stopped", 0)
+        return web.Response(status=204)
+
+    async def get_match(self, request):
+        return web.json_response(self.match_board(request).match)
+
+    async def match_action(self, request):
+        board = self.match_board(request)
+        self.stats["actions"] += 1
+        action = request.match_info.get("action")
+        if action == "throws" and request.method == "POST":
+            board.throw((await request.json())["segment"])
+        elif action == "throws":
+            board.undo()
+        elif action == "players/next":
+            board.next_player()
+        elif request.method == "DELETE":
+            board.abort()
+        else:
+            # leg and match flow is driven by the simulation, just echo
+            board.publish_match(board.match)
+        return web.Response(status=204)
+
+    # control
+
+    async def drop(self, request):
+        sockets = list(self.sockets)
+        for ws in sockets:
+            await ws.close(code=1011, message=b"dropped")
+        return web.json_response({"dropped": len(sockets)})
+
+    async def down(self, request):
+        seconds = float(request.query.get("seconds", 60))
+        self.down_until = time.monotonic() + seconds
+        await self.drop(request)
+        return web.json_response({"down_for": seconds})
+
+    async def set_latency(self, request):
+        self.latency = float(request.query.get("ms", 0))
+        return web.json_response({"latency": self.latency})
+
+    async def set_errors(self, request):
+        self.error_rate = float(request.query.get("rate", 0))
+        return web.json_response({"error_rate": self.error_rate})
+
+    async def get_stats(self, request):
+        return web.json_response(
+            {
+                **self.stats,
+                "open_sockets": len(self.sockets),
+                "boards": len(self.boards),
+                "matches_played": sum(board.matches for board in self.boards.values()),
+            }
+        )
+
+    async def on_startup(self, app):
+        self._tasks = [
+            asyncio.create_task(board.run()) for board in self.boards.values()
+        ]
+
+    async def on_cleanup(self, app):
+        for task in self._tasks:
+            task.cancel()
+
+    def app(self):
+        app = web.Application(middlewares=[self.faults])
+        app.router.add_get("/ms/v0/subscribe", self.subscribe)
+        app.router.add_get("/bs/v0/boards/{id}", self.get_board)
+        app.router.add_post("/bs/v0/boards/{id}/{action:reset|start|stop}", self.board_action)
+        app.router.add_get("/gs/v0/matches/{id}/state", self.get_match)
+        app.router.add_post("/gs/v0/matches/{id}/{action:throws}", self.match_action)
+        app.router.add_delete("/gs/v0/matches/{id}/{action:throws}", self.match_action)
+        app.router.add_post(
+            "/gs/v0/matches/{id}/{action:players/next|games/next|finish}",
+            self.match_action,
+        )
+        app.router.add_delete("/gs/v0/matches/{id}", self.match_action)
+        app.router.add_post("/_control/drop", self.drop)
+        app.router.add_post("/_control/down", self.down)
+        app.router.add_post("/_control/latency", self.set_latency)
+        app.router.add_post("/_control/errors", self.set_errors)
+        app.router.add_get("/_control/stats", self.get_stats)
+        app.on_startup.append(self.on_startup)
+        app.on_cleanup.append(self.on_cleanup)
+        return app
+
+
+async def drop_periodically(cloud, interval):
+    """Close every socket every interval seconds, with jitter."""
+    while True:
+        await asyncio.sleep(interval * random.uniform(0.5, 1.5))
+        for ws in list(cloud.sockets):
+            await ws.close(code=1011, message=b"dropped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--boards", type=int, default=1)
+    parser.add_argument("--variant", default="X01", choices=["X01", "Cricket"])
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--throw-rate", type=float, default=0.5, help="darts/s per board")
+    parser.add_argument("--latency", type=float, default=0, help="REST delay, ms")
+    parser.add_argument("--error-rate", type=float, default=0, help="REST 500 ratio")
+    parser.add_argument("--drop-every", type=float, help="drop sockets every N s")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    cloud = FakeCloud(args.boards, args.variant, args.players, args.throw_rate)
+    cloud.latency = args.latency
+    cloud.error_rate = args.error_rate
+    app = cloud.app()
+    if args.drop_every:
+
+        async def start_drops(app):
+            app["drops"] = asyncio.create_task(drop_periodically(cloud, args.drop_every))
+
+        app.on_startup.append(start_drops)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Offline stand-in for the autodarts library, for benchmarks.
+
+Implements the part of the library api the integration uses. Nothing
+touches the network: items are served from the states known to a
+StubSession, and a harness delivers websocket messages with emit() and
+async_emit_event(). Actions are recorded in StubSession.actions.
+"""
+from __future__ import annotations
+
+import inspect
+
+__all__ = ["AutoDartSession", "CloudBoard", "Match", "StubSession"]
+
+
+class StubSession:
+    """Session serving items from in memory states."""
+
+    def __init__(self):
+        self.boards = {}
+        self.matches = {}
+        self.actions = []
+
+    async def is_authenticated(self):
+        return True
+
+
+class AutoDartSession(StubSession):
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+
+
+class Item:
+    __states__ = None
+
+    def __init__(self, state, session):
+        self.state = state
+        self.session = session
+        self.is_connected = False
+        self._callbacks = []
+        self._async_callbacks = []
+
+    @classmethod
+    async def from_id(cls, session, id):
+        return cls(getattr(session, cls.__states__)[id], session)
+
+    @property
+    def id(self):
+        return self.state["id"]
+
+    async def async_load(self):
+        self.state = getattr(self.session, self.__states__)[self.id]
+
+    def register_callback(self, callback):
+        self._callbacks.append(callback)
+        return lambda: self._callbacks.remove(callback)
+
+    def register_async_callback(self, callback, event=None, topic="events"):
+        entry = (callback, event, topic)
+        self._async_callbacks.append(entry)
+        return lambda: self._async_callbacks.remove(entry)
+
+    def connect(self):
+        self.is_connected = True
+
+    def disconnect(self):
+        self.is_connected = False
+
+    def emit(self, state):
+        """Deliver a websocket state frame."""
+        self.state = getattr(self.session, self.__states__)[self.id] = state
+        for callback in list(self._callbacks):
+            callback(state)
+
+    async def async_emit_event(self, event, data, topic="events"):
+        """Deliver a websocket event."""
+        for callback, on_event, on_topic in list(self._async_callbacks):
+            if on_event in (None, event) and on_topic == topic:
+                # plain callbacks are accepted too, like the library does
+                if inspect.isawaitable(result := callback(data)):
+                    await result
+
+    async def _action(self, name, *args, **kwargs):
+        self.session.actions.append((self.id, name, args, kwargs))
+
+
+class CloudBoard(Item):
+    __states__ = "boards"
+
+    name = property(lambda self: self.state.get("name"))
+    version = property(lambda self: self.state.get("version"))
+    ip = property(lambda self: self.state.get("ip"))
+    os = property(lambda self: self.state.get("os"))
+    connected = property(lambda self: self.state.get("connected"))
+    match_id = property(lambda self: self.state.get("matchId"))
+
+    async def async_start(self):
+        await self._action("start")
+
+    async def async_stop(self):
+        await self._action("stop")
+
+    async def async_reset(self):
+        await self._action("reset")
+
+
+class Player:
+    def __init__(self, state):
+        self.name = state.get("name")
+        self.cpuPPR = state.get("cpuPPR")
+        self.user_id = state.get("userId")
+
+
+class Match(Item):
+    __states__ = "matches"
+
+    variant = property(lambda self: self.state["variant"])
+    settings = property(lambda self: self.state.get("settings"))
+    finished = property(lambda self: self.state.get("finished", False))
+    winner = property(lambda self: self.state.get("winner"))
+    player = property(lambda self: self.state.get("player"))
+    turns = property(lambda self: self.state.get("turns") or [])
+    leg = property(lambda self: self.state.get("leg"))
+    set = property(lambda self: self.state.get("set"))
+    round = property(lambda self: self.state.get("round"))
+    scores = property(lambda self: self.state.get("scores") or [])
+    game_scores = property(lambda self: self.state.get("gameScores") or [])
+    stats = property(lambda self: self.state.get("stats") or [])
+    turn_score = property(lambda self: self.state.get("turnScore"))
+    turn_busted = property(lambda self: self.state.get("turnBusted"))
+
+    @property
+    def players(self):
+        return [Player(player) for player in self.state.get("players") or ()]
+
+    async def async_throw(self, segment, throw_id=None):
+        await self._action("throw", segment, throw_id=throw_id)
+
+    async def async_undo(self):
+        await self._action("undo")
+
+    async def async_next_player(self):
+        await self._action("next player")
+
+    async def async_next_match(self):
+        await self._action("next match")
+
+    async def async_finish(self):
+        await self._action("finish")
+
+    async def async_abort(self):
+        await self._action("abort")
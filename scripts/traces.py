@@ -0,0 +1,316 @@
+"""Synthetic autodarts websocket traces.
+
+A trace is a list of messages, stored one JSON object per line:
+
+    {"t": 1.5, "channel": "board", "data": {...}}              state frame
+    {"t": 9.0, "channel": "match", "event": "finish", "data": {}}  event
+
+Recordings of the integration also hold the commands it sent, with a
+"command" key, and a {"t": ..., "session": ...} marker starting every
+recorder session.
+
+Board and match frames carry the full state, like the cloud does. Matches
+are simulated dart by dart with seeded random players, so a trace is the
+same on every run.
+
+    python scripts/traces.py X01 4 > x01-4.jsonl
+"""
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+import random
+import sys
+
+CRICKET_NUMBERS = ("15", "16", "17", "18", "19", "20", "25")
+DART_INTERVAL = 1.5  # s
+TURN_INTERVAL = 4.0  # s
+
+
+def segment(number, multiplier):
+    if multiplier == 0:
+        return {"name": f"M{number}", "number": number, "bed": "Outside", "multiplier": 0}
+    if number == 25:
+        name = "Bull" if multiplier == 2 else "25"
+    else:
+        name = f"{'SDT'[multiplier - 1]}{number}"
+    bed = {1: "SingleInner", 2: "Double", 3: "Triple"}[multiplier]
+    return {"name": name, "number": number, "bed": bed, "multiplier": multiplier}
+
+
+class Player:
+    """A player hitting the aimed bed with a given accuracy."""
+
+    def __init__(self, idx, rng):
+        self.id = f"player-{idx}"
+        self.name = f"Player {idx + 1}"
+        self.rng = rng
+        self.accuracy = rng.uniform(0.1, 0.4)
+
+    def throw(self, number, multiplier):
+        roll = self.rng.random()
+        if roll < self.accuracy:
+            return segment(number, multiplier)
+        if roll < 0.95:
+            if number == 25:
+                return segment(25, 1)
+            return segment(number, 1)
+        return segment(number, 0)
+
+
+class MatchSimulation:
+    """Simulate an autodarts match, yielding its successive states."""
+
+    def __init__(self, variant, players, legs=2, seed=0, match_id="match-0"):
+        self.variant = variant
+        self.rng = random.Random(seed)
+        self.players = [Player(idx, self.rng) for idx in range(players)]
+        self.legs_to_win = legs
+        self.id = match_id
+        self.base_score = 501 if variant == "X01" else 0
+
+        self.scores = [{"sets": 0, "legs": 0} for _ in self.players]
+        self.darts = [0] * len(self.players)
+        self.points = [0] * len(self.players)
+        self.leg = 1
+        self.winner = -1
+        self.finished = False
+        self.new_leg()
+
+    def new_leg(self):
+        self.game_scores = [self.base_score] * len(self.players)
+        self.marks = {number: [0] * len(self.players) for number in CRICKET_NUMBERS}
+        self.turns = []
+        self.player = (self.leg - 1) % len(self.players)
+        self.round = 1
+        self.game_finished = False
+        self.busted = False
+
+    def state(self):
+        turn = self.turns[-1] if self.turns else None
+        state = {
+            "id": self.id,
+            "variant": self.variant,
+            "settings": {"baseScore": 501, "inMode": "Straight", "outMode": "Double"}
+            if self.variant == "X01"
+            else {"mode": "Standard"},
+            "players": [
+                {"id": player.id, "name": player.name, "cpuPPR": None, "userId": None}
+                for player in self.players
+            ],
+            "player": self.player,
+            "round": self.round,
+            "leg": self.leg,
+            "set": 1,
+            "turns": [dict(turn, throws=list(turn["throws"])) for turn in self.turns],
+            "turnScore": turn["points"] if turn else 0,
+            "turnBusted": self.busted,
+            "scores": [dict(score) for score in self.scores],
+            "gameScores": list(self.game_scores),
+            "stats": [
+                {
+                    "average": round(self.points[idx] / self.darts[idx] * 3, 2)
+                    if self.darts[idx]
+                    else 0,
+                    "dartsThrown": self.darts[idx],
+                }
+                for idx in range(len(self.players))
+            ],
+            "winner": self.winner,
+            "gameFinished": self.game_finished,
+            "finished": self.finished,
+            "checkoutGuide": [],
+        }
+        if self.variant == "Cricket":
+            state["segments"] = {
+                number: list(marks) for number, marks in self.marks.items()
+            }
+        return state
+
+    def aim(self):
+        remaining = self.game_scores[self.player]
+        if self.variant == "Cricket":
+            for number in reversed(CRICKET_NUMBERS):
+                if self.marks[number][self.player] < 3:
+                    return int(number), 3 if number != "25" else 2
+            return 20, 3
+        if remaining <= 40 and remaining % 2 == 0:
+            return remaining // 2, 2
+        if remaining == 50:
+            return 25, 2
+        if remaining < 60:
+            return (remaining - 32 if remaining > 32 else 1), 1
+        return 20, 3
+
+    def play_dart(self, turn):
+        thrower = self.players[self.player]
+        hit = thrower.throw(*self.aim())
+        points = hit["number"] * hit["multiplier"]
+        throw = {
+            "segment": hit,
+            "coords": {
+                "x": round(self.rng.uniform(-1, 1), 4),
+                "y": round(self.rng.uniform(-1, 1), 4),
+            },
+            "marks": 0,
+            "entry": "detected",
+        }
+        self.darts[self.player] += 1
+
+        if self.variant == "Cricket":
+            number = str(hit["number"])
+            if number in self.marks and hit["multiplier"]:
+                marks = self.marks[number]
+                scored = max(0, marks[self.player] + hit["multiplier"] - 3)
+                marks[self.player] = min(3, marks[self.player] + hit["multiplier"])
+                throw["marks"] = hit["multiplier"]
+                if scored and any(
+                    mark < 3 for idx, mark in enumerate(marks) if idx != self.player
+                ):
+                    self.game_scores[self.player] += scored * hit["number"]
+                    self.points[self.player] += scored * hit["number"]
+                    turn["points"] += scored * hit["number"]
+            closed = all(self.marks[n][self.player] == 3 for n in CRICKET_NUMBERS)
+            if closed and self.game_scores[self.player] >= max(self.game_scores):
+                self.game_finished = True
+        else:
+            remaining = self.game_scores[self.player] - points
+            if remaining < 0 or remaining == 1 or (remaining == 0 and hit["multiplier"] != 2):
+                self.busted = True
+            else:
+                self.game_scores[self.player] = remaining
+                self.points[self.player] += points
+                turn["points"] += points
+                self.game_finished = remaining == 0
+        turn["throws"].append(throw)
+
+    def __iter__(self):
+        """Yield ("match", state) for every dart and turn change."""
+        yield "match", self.state()
+        while not self.finished:
+            turn = {
+                "id": f"{self.id}-leg{self.leg}-turn{len(self.turns)}",
+                "playerId": self.players[self.player].id,
+                "round": self.round,
+                "score": self.game_scores[self.player],
+                "points": 0,
+                "busted": False,
+                "throws": [],
+            }
+            self.turns.append(turn)
+            start_score = self.game_scores[self.player]
+            for _dart in range(3):
+                self.play_dart(turn)
+                if self.busted:
+                    self.game_scores[self.player] = start_score
+                    turn["busted"] = True
+                yield "match", self.state()
+                if self.busted or self.game_finished:
+                    break
+
+            if self.game_finished:
+                self.scores[self.player]["legs"] += 1
+                if self.scores[self.player]["legs"] >= self.legs_to_win:
+                    self.winner = self.player
+                    self.finished = True
+                    yield "match", self.state()
+                    break
+                yield "match", self.state()
+                self.leg += 1
+                self.new_leg()
+            else:
+                self.busted = False
+                self.player = (self.player + 1) % len(self.players)
+                if self.player == (self.leg - 1) % len(self.players):
+                    self.round += 1
+            yield "match", self.state()
+
+
+def board_state(board_id, match_id, status, throws):
+    return {
+        "id": board_id,
+        "name": "Bench board",
+        "version": "0.0.0",
+        "ip": "127.0.0.1",
+        "os": "bench",
+        "connected": True,
+        "matchId": match_id,
+        "status": status,
+        "event": status,
+        "numThrows": throws,
+    }
+
+
+def match_trace(variant, players, legs=2, seed=0, board_id="board-0", matches=1):
+    """Return the messages of a board playing matches one after the other."""
+    messages = []
+    t = 0.0
+    for number in range(matches):
+        match_id = f"{variant.lower()}-{players}-{seed}-{number}"
+        # the board reset announcing a match is what the coordinator waits for
+        messages.append(
+            {
+                "t": t,
+                "channel": "board",
+                "data": board_state(board_id, match_id, "Started", 0),
+            }
+        )
+        messages.append(
+            {"t": t, "channel": "board", "event": "Manual reset", "data": {}}
+        )
+        simulation = MatchSimulation(variant, players, legs, seed + number, match_id)
+        darts = 0
+        for channel, state in simulation:
+            thrown = len(state["turns"][-1]["throws"]) if state["turns"] else 0
+            if thrown != darts:
+                t += DART_INTERVAL
+                status = "Takeout" if thrown == 3 else "Throw"
+                messages.append(
+                    {
+                        "t": t,
+                        "channel": "board",
+                        "data": board_state(board_id, match_id, status, thrown),
+                    }
+                )
+                darts = thrown
+            elif thrown == 0:
+                t += TURN_INTERVAL
+            messages.append({"t": t, "channel": channel, "data": state})
+        t += TURN_INTERVAL
+        messages.append({"t": t, "channel": "match", "event": "finish", "data": {}})
+        messages.append(
+            {
+                "t": t,
+                "channel": "board",
+                "data": board_state(board_id, None, "Started", 0),
+            }
+        )
+    return messages
+
+
+def open_trace(path, mode="rt"):
+    path = Path(path)
+    if path.suffix == ".gz":
+        return gzip.open(path, mode, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def read_trace(path):
+    with open_trace(path) as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def write_trace(messages, file):
+    for message in messages:
+        file.write(json.dumps(message, separators=(",", ":")) + "\n")
+
+
+def main():
+    variant = sys.argv[1] if len(sys.argv) > 1 else "X01"
+    players = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    write_trace(match_trace(variant, players), sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
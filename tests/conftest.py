@@ -0,0 +1,54 @@
+"""Import the integration modules without running its setup module."""
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+import sys
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+INTEGRATION = ROOT / "custom_components/autodarts"
+
+sys.path.insert(0, str(ROOT))
+# offline autodarts library of the benchmarks, tests never reach the cloud
+sys.path.insert(0, str(ROOT / "scripts/stubs"))
+
+if "custom_components.autodarts" not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        "custom_components.autodarts",
+        INTEGRATION / "__init__.py",
+        submodule_search_locations=[str(INTEGRATION)],
+    )
+    # not executed : setup needs the autodarts library and a running core
+    sys.modules[spec.name] = importlib.util.module_from_spec(spec)
+
+
+@pytest.fixture
+async def hass(tmp_path):
+    """Return a Home Assistant core, its loop, bus and state machine only."""
+    core = pytest.importorskip("homeassistant.core")
+    hass = core.HomeAssistant(str(tmp_path))
+    yield hass
+    await hass.async_stop(force=True)
+
+
+@pytest.fixture
+def cloud():
+    """Return an offline cloud knowing an idle board b1."""
+    from autodarts import StubSession
+    from harness import board_state
+
+    session = StubSession()
+    session.boards["b1"] = board_state()
+    return session
+
+
+@pytest.fixture
+def live_match(cloud):
+    """Return the cloud with match m1 running on board b1."""
+    from harness import match_state
+
+    cloud.boards["b1"]["matchId"] = "m1"
+    cloud.matches["m1"] = match_state()
+    return cloud
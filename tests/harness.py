@@ -0,0 +1,71 @@
+"""States of the offline cloud and coordinators following it, for the tests."""
+import asyncio
+
+from custom_components.autodarts.coordinator import (
+    AutoDartsBoardCoordinator,
+    AutoDartsBoardMatchCoordinator,
+)
+
+WINDOW = 20  # ms
+
+T20 = {"name": "T20", "number": 20, "multiplier": 3}
+S5 = {"name": "S5", "number": 5, "multiplier": 1}
+D16 = {"name": "D16", "number": 16, "multiplier": 2}
+
+
+def board_state(**values):
+    return {
+        "id": "b1",
+        "name": "board",
+        "status": "Stopped",
+        "event": "",
+        "numThrows": 0,
+        "connected": True,
+        "matchId": None,
+        **values,
+    }
+
+
+def turn(id, *segments, player="p1"):
+    return {
+        "id": id,
+        "playerId": player,
+        "round": 1,
+        "throws": [{"segment": segment} for segment in segments],
+    }
+
+
+def match_state(*segments, turns=None, **values):
+    """Return a 2 players X01 match, its last turn throwing segments."""
+    return {
+        "id": "m1",
+        "variant": "X01",
+        "player": 0,
+        "players": [{"id": "p1", "name": "a"}, {"id": "p2", "name": "b"}],
+        "scores": [{"sets": 0, "legs": 0}, {"sets": 0, "legs": 0}],
+        "gameScores": [501, 501],
+        "stats": [{}, {}],
+        "finished": False,
+        "turns": turns if turns is not None else [turn("t1", *segments)],
+        **values,
+    }
+
+
+def segments(coordinator):
+    """Return the segment names of the last turn published by coordinator."""
+    return [
+        throw["segment"]["name"]
+        for throw in coordinator.data.state["turns"][-1]["throws"]
+    ]
+
+
+async def wait_window():
+    await asyncio.sleep(WINDOW / 1000 * 3)
+
+
+async def async_setup_coordinators(hass, session, window=WINDOW):
+    board = AutoDartsBoardCoordinator(hass, session, "b1", coalesce_window=window)
+    board.async_set_updated_data(await board._async_update_data())
+    match = AutoDartsBoardMatchCoordinator(hass, board, coalesce_window=window)
+    await match.async_discover()
+    return board, match
@@ -0,0 +1,18 @@
+"""Tests of the versioned frontend assets."""
+import pytest
+
+# frontend first, like the integration: http alone is a circular import
+pytest.importorskip("homeassistant.components.frontend")
+
+from custom_components.autodarts.assets import build_assets  # noqa: E402
+
+
+def test_only_the_loader_is_versioned(tmp_path):
+    loader = tmp_path / "main.js"
+    loader.write_text("const DOMAIN = 'autodarts';")
+    assets, name = build_assets(str(loader))
+    assert list(assets) == [name]
+    assert name.startswith("main.") and name.endswith(".js")
+
+    loader.write_text("const DOMAIN = 'autodarts'; // edited")
+    assert build_assets(str(loader))[1] != name
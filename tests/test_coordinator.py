@@ -0,0 +1,161 @@
+"""Tests of the board and match coordinators, on the offline autodarts library."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from harness import (  # noqa: E402
+    S5,
+    T20,
+    async_setup_coordinators,
+    match_state,
+    segments,
+    wait_window,
+)
+
+from custom_components.autodarts import coordinator as coordinator_module  # noqa: E402
+from custom_components.autodarts.optimistic import (  # noqa: E402
+    CONFIRMED,
+    EXPIRED,
+    FAILED,
+)
+
+
+async def test_live_frames_are_coalesced(hass, live_match):
+    _, match = await async_setup_coordinators(hass, live_match)
+    # the first frame is published as is, nothing was before
+    match.item.emit(match_state(gameScores=[501, 441]))
+    published = match.updates_published
+    match.item.emit(match_state(T20))
+    match.item.emit(match_state(T20, S5))
+    assert match.updates_published == published
+    await wait_window()
+    assert match.updates_published == published + 1
+    assert segments(match) == ["T20", "S5"]
+    assert match.coalesce_stats["messages_received"] == 3
+
+
+async def test_turn_end_is_published_without_waiting(hass, live_match):
+    _, match = await async_setup_coordinators(hass, live_match)
+    # the first frame is published as is, nothing was before
+    match.item.emit(match_state(gameScores=[501, 441]))
+    published = match.updates_published
+    match.item.emit(match_state(T20))
+    match.item.emit(match_state(T20, player=1))
+    # the pending dart goes out with the turn end
+    assert match.updates_published == published + 1
+    assert match.data.state["player"] == 1
+    await wait_window()
+    assert match.updates_published == published + 1
+
+
+async def test_held_frames_are_published_once(hass, live_match):
+    board, _ = await async_setup_coordinators(hass, live_match, window=0)
+    published = board.updates_published
+    async with board.async_hold_updates():
+        board.item.emit(dict(board.store.state, status="Throw"))
+        board.item.emit(dict(board.store.state, status="Takeout"))
+        assert board.updates_published == published
+    assert board.updates_published == published + 1
+    assert board.data.state["status"] == "Takeout"
+
+
+async def test_replay_without_live_match_ends_with_none(hass, cloud):
+    _, match = await async_setup_coordinators(hass, cloud)
+    with match.replaying():
+        match.replay_frame(match_state(T20))
+        assert segments(match) == ["T20"]
+        assert match.view is not None
+    assert match.data is None
+    assert match.view is None
+
+
+async def test_replayed_frames_are_coalesced(hass, cloud):
+    _, match = await async_setup_coordinators(hass, cloud)
+    with match.replaying():
+        match.replay_frame(match_state())
+        published = match.updates_published
+        match.replay_frame(match_state(gameScores=[441, 501]))
+        assert match.updates_published == published
+        await wait_window()
+        assert match.updates_published == published + 1
+        assert match.data.state["gameScores"] == [441, 501]
+        # turn end is published without waiting
+        match.replay_frame(match_state(gameScores=[441, 501], player=1))
+        assert match.updates_published == published + 2
+
+
+async def test_live_frames_are_kept_during_replay(hass, live_match):
+    _, match = await async_setup_coordinators(hass, live_match)
+    changes = []
+    match.async_add_frame_listener(
+        lambda previous, state, changed: changes.append(changed)
+    )
+    with match.replaying():
+        match.replay_frame(match_state(id="m0", player=1))
+        match.item.emit(match_state(T20))
+        await wait_window()
+        assert match.data.state["id"] == "m0"
+    assert changes == [{"turns"}]
+    assert match.data.state["id"] == "m1"
+    assert segments(match) == ["T20"]
+
+
+async def test_commands_reach_the_live_match_during_replay(hass, live_match):
+    _, match = await async_setup_coordinators(hass, live_match)
+    with match.replaying():
+        match.replay_frame(match_state(id="m0"))
+        await match.async_next()
+    assert live_match.actions == [("m1", "next player", (), {})]
+
+
+async def test_echoed_throw_is_confirmed(hass, live_match):
+    _, match = await async_setup_coordinators(hass, live_match)
+    await match.async_throw(T20)
+    assert segments(match) == ["T20"]
+    match.item.emit(match_state(T20))
+    assert match.pending_operations == []
+    assert match.operations[-1].status == CONFIRMED
+    assert segments(match) == ["T20"]
+
+
+async def test_throw_without_echo_expires(hass, live_match, monkeypatch):
+    monkeypatch.setattr(coordinator_module, "OPTIMISTIC_TIMEOUT", 0.01)
+    _, match = await async_setup_coordinators(hass, live_match)
+    await match.async_throw(T20)
+    await match.async_throw(S5)
+    assert segments(match) == ["T20", "S5"]
+    await asyncio.sleep(0.05)
+    assert [operation.status for operation in match.operations] == [EXPIRED] * 2
+    assert segments(match) == []
+
+
+async def test_failed_throw_is_rolled_back(hass, live_match, monkeypatch):
+    _, match = await async_setup_coordinators(hass, live_match)
+
+    async def refused(name, *args, **kwargs):
+        raise RuntimeError("refused")
+
+    monkeypatch.setattr(match.item, "_action", refused)
+    with pytest.raises(RuntimeError):
+        await match.async_throw(T20)
+    assert match.operations[-1].status == FAILED
+    assert segments(match) == []
+
+
+async def test_cancelled_throw_is_rolled_back(hass, live_match, monkeypatch):
+    _, match = await async_setup_coordinators(hass, live_match)
+
+    async def never(name, *args, **kwargs):
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(match.item, "_action", never)
+    task = hass.async_create_task(match.async_throw(T20))
+    await asyncio.sleep(0)
+    assert segments(match) == ["T20"]
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert match.operations[-1].status == FAILED
+    assert segments(match) == []
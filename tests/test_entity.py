@@ -0,0 +1,43 @@
+"""Tests of the entity state writes."""
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from harness import (  # noqa: E402
+    S5,
+    T20,
+    async_setup_coordinators,
+    match_state,
+    wait_window,
+)
+
+from custom_components.autodarts.select import DartSelect  # noqa: E402
+from custom_components.autodarts.sensor import PlayerSensor  # noqa: E402
+
+
+def track_writes(hass, entity):
+    writes = []
+    entity.hass = hass
+    entity.entity_id = f"sensor.test_{id(entity)}"
+    entity.async_write_ha_state = lambda: writes.append(entity.render_key())
+    return writes
+
+
+async def test_entities_write_only_their_changed_slice(hass, live_match):
+    _, match = await async_setup_coordinators(hass, live_match, window=0)
+    players = [PlayerSensor(match, idx) for idx in range(2)]
+    darts = [DartSelect(match, idx) for idx in range(3)]
+    writes = {entity: track_writes(hass, entity) for entity in players + darts}
+    for entity in writes:
+        match.async_add_listener(entity._handle_coordinator_update)
+
+    match.item.emit(match_state(T20))
+    first = {entity: len(calls) for entity, calls in writes.items()}
+    match.item.emit(match_state(T20, S5, gameScores=[436, 501]))
+    await wait_window()
+
+    def written(entity):
+        return len(writes[entity]) - first[entity]
+
+    assert [written(player) for player in players] == [1, 0]
+    assert [written(dart) for dart in darts] == [0, 1, 1]
@@ -0,0 +1,58 @@
+"""Tests of the match events derived from consecutive states."""
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.autodarts.events import (  # noqa: E402
+    EVENT_MATCH_WON,
+    EVENT_THROW,
+    EVENT_TURN_END,
+    match_events,
+)
+
+T20 = {"name": "T20", "number": 20, "multiplier": 3}
+S5 = {"name": "S5", "number": 5, "multiplier": 1}
+
+
+def match(*throws, player=0, **values):
+    return {
+        "id": "m1",
+        "variant": "X01",
+        "player": player,
+        "players": [{"id": "p1", "name": "a"}, {"id": "p2", "name": "b"}],
+        "turns": [
+            {
+                "id": "1",
+                "playerId": "p1",
+                "round": 1,
+                "throws": [{"segment": segment} for segment in throws],
+            }
+        ],
+        **values,
+    }
+
+
+def test_nothing_happened_without_previous_state():
+    state = match(T20, S5, finished=True, winner=0)
+    assert list(match_events(None, state, set(state))) == []
+
+
+def test_throw_events_of_new_darts_only():
+    events = list(match_events(match(T20), match(T20, S5), {"turns"}))
+    assert [(event, data["dart"], data["segment"]) for event, data in events] == [
+        (EVENT_THROW, 2, "S5")
+    ]
+    assert events[0][1]["player"] == "a"
+
+
+def test_turn_end():
+    previous = match(T20, T20, T20, turnScore=180)
+    events = dict(match_events(previous, match(T20, T20, T20, player=1), {"player"}))
+    assert events[EVENT_TURN_END]["points"] == 180
+    assert events[EVENT_TURN_END]["next_player"] == "b"
+
+
+def test_match_won():
+    state = match(T20, finished=True, winner=1)
+    events = dict(match_events(match(T20), state, {"finished"}))
+    assert events[EVENT_MATCH_WON]["player"] == "b"
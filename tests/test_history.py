@@ -0,0 +1,201 @@
+"""Tests of the throw history diffing and storage."""
+import asyncio
+import sqlite3
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.autodarts import history  # noqa: E402
+from custom_components.autodarts.history import (  # noqa: E402
+    ThrowHistory,
+    iter_changed_turns,
+    iter_new_throws,
+    iter_removed_throws,
+)
+
+T20 = {"name": "T20", "number": 20, "multiplier": 3}
+S5 = {"name": "S5", "number": 5, "multiplier": 1}
+
+
+def turn(id, *segments, busted=False):
+    return {
+        "id": id,
+        "playerId": "p1",
+        "round": 1,
+        "score": 501,
+        "busted": busted,
+        "throws": [{"segment": segment} for segment in segments],
+    }
+
+
+def match(*turns):
+    return {
+        "id": "m1",
+        "variant": "X01",
+        "players": [{"id": "p1", "name": "a"}],
+        "turns": list(turns),
+    }
+
+
+def test_nothing_changed_without_previous_state():
+    state = match(turn("1", T20, T20, T20), turn("2", S5))
+    assert list(iter_changed_turns(None, state)) == []
+    assert list(iter_new_throws(None, state)) == []
+    assert list(iter_removed_throws(None, state)) == []
+
+
+def test_new_throws():
+    first = turn("1", T20, T20, T20)
+    previous = match(first, turn("2", S5))
+    state = match(first, turn("2", S5, T20))
+    assert [(dart, throw["segment"]["name"]) for _, dart, throw in iter_new_throws(
+        previous, state
+    )] == [(1, "T20")]
+    assert list(iter_removed_throws(previous, state)) == []
+
+
+def test_new_turn():
+    first = turn("1", T20, T20, T20)
+    new = list(iter_new_throws(match(first), match(first, turn("2", S5))))
+    assert [(t["id"], dart) for t, dart, _ in new] == [("2", 0)]
+
+
+def test_undone_throw():
+    first = turn("1", T20, T20, T20)
+    previous = match(first, turn("2", S5, T20))
+    state = match(first, turn("2", S5))
+    removed = list(iter_removed_throws(previous, state))
+    assert [(dart, throw["segment"]["name"]) for _, dart, throw in removed] == [
+        (1, "T20")
+    ]
+    assert list(iter_new_throws(previous, state)) == []
+
+
+def test_undone_turn():
+    first = turn("1", T20, T20, T20)
+    changed = list(iter_changed_turns(match(first, turn("2")), match(first)))
+    assert changed == [(turn("2"), None)]
+
+
+def test_corrected_throw():
+    previous = match(turn("1", T20, T20))
+    state = match(turn("1", S5, T20))
+    assert [dart for _, dart, _ in iter_new_throws(previous, state)] == [0]
+    assert [dart for _, dart, _ in iter_removed_throws(previous, state)] == [0]
+
+
+class Recorder(ThrowHistory):
+    """History without a loop, operations are kept in the queue."""
+
+    def __init__(self):
+        super().__init__(None, ":memory:")
+        self.calls = []
+        self.async_add_listener(lambda row, sign: self.calls.append((row, sign)))
+
+    def _queue(self, operation):
+        self.queue.append(operation)
+
+
+def names(calls):
+    return [(row[history.COLUMN_INDEX["segment"]], sign) for row, sign in calls]
+
+
+def test_frame_listener_follows_undo_and_corrections():
+    recorder = Recorder()
+    on_frame = recorder.frame_listener("board")
+    first = turn("1", T20)
+    on_frame(None, match(first), {"turns"})
+    assert recorder.calls == []
+
+    on_frame(match(first), match(turn("1", T20, S5)), {"turns"})
+    assert names(recorder.calls) == [("S5", 1)]
+
+    recorder.calls.clear()
+    on_frame(match(turn("1", T20, S5)), match(turn("1", T20, T20)), {"turns"})
+    assert names(recorder.calls) == [("S5", -1), ("T20", 1)]
+
+    recorder.calls.clear()
+    on_frame(match(turn("1", T20, T20)), match(turn("1", T20)), {"turns"})
+    assert names(recorder.calls) == [("T20", -1)]
+
+
+def test_busted_turn_updates_its_darts():
+    recorder = Recorder()
+    on_frame = recorder.frame_listener("board")
+    on_frame(
+        match(turn("1", T20)), match(turn("1", T20, T20, busted=True)), {"turns"}
+    )
+    busted = history.COLUMN_INDEX["busted"]
+    assert [(row[busted], sign) for row, sign in recorder.calls] == [
+        (0, -1),
+        (1, 1),
+        (1, 1),
+    ]
+
+
+def test_correction_keeps_the_timestamp():
+    recorder = Recorder()
+    on_frame = recorder.frame_listener("board")
+    on_frame(match(turn("1")), match(turn("1", T20)), {"turns"})
+    thrown = recorder.calls[-1][0][-1]
+    on_frame(match(turn("1", T20)), match(turn("1", S5)), {"turns"})
+    assert [row[-1] for row, _ in recorder.calls[-2:]] == [thrown, thrown]
+
+
+def test_database_upsert_and_delete():
+    recorder = Recorder()
+    recorder._open()
+    on_frame = recorder.frame_listener("board")
+    on_frame(match(turn("1")), match(turn("1", T20, T20)), {"turns"})
+    on_frame(match(turn("1", T20, T20)), match(turn("1", S5)), {"turns"})
+    recorder._write(list(recorder.queue))
+    rows = recorder._db.execute("SELECT dart, segment FROM throws").fetchall()
+    assert rows == [(0, "S5")]
+    recorder._close()
+
+
+def test_busted_column_is_added_to_old_databases(tmp_path):
+    path = str(tmp_path / "history.db")
+    db = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE throws (match_id TEXT NOT NULL, turn_id TEXT NOT NULL, "
+        "dart INTEGER NOT NULL, player_id TEXT, timestamp REAL NOT NULL, "
+        "PRIMARY KEY (match_id, turn_id, dart))"
+    )
+    db.close()
+    throws = ThrowHistory(None, path)
+    throws._open()
+    columns = {row[1] for row in throws._db.execute("PRAGMA table_info(throws)")}
+    assert "busted" in columns
+    throws._close()
+
+
+async def test_statistics_are_loaded_with_live_throws_waiting(hass, tmp_path):
+    from custom_components.autodarts.statistics import StatisticsEngine
+
+    throws = ThrowHistory(hass, str(tmp_path / "history.db"))
+    throws._open()
+    on_frame = throws.frame_listener("board")
+    on_frame(match(turn("1")), match(turn("1", T20, S5)), {"turns"})
+    # a miss has no number, stored as NULL
+    miss = list(throws.queue[-1][1])
+    miss[history.COLUMN_INDEX["dart"]] = 2
+    miss[history.COLUMN_INDEX["number"]] = None
+    miss[history.COLUMN_INDEX["multiplier"]] = None
+    throws._write(list(throws.queue) + [(history.UPSERT, tuple(miss))])
+    throws.queue.clear()
+
+    engine = StatisticsEngine()
+    throws.async_add_listener(history.statistics_listener(engine))
+    async with throws._lock:
+        task = hass.async_create_task(throws.async_load_statistics(engine))
+        await asyncio.sleep(0)
+        assert engine.loading
+        on_frame(match(turn("2")), match(turn("2", T20)), {"turns"})
+        assert engine.metrics("a")["all_time"]["darts"] == 0
+    await task
+    metrics = engine.metrics("a")["all_time"]
+    assert metrics["darts"] == 4
+    assert metrics["average"] == 3 * (60 + 5 + 0 + 60) / 4
+    await throws.async_close()
@@ -0,0 +1,76 @@
+"""Tests of the board manager client on the LAN."""
+import json
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from harness import (  # noqa: E402
+    D16,
+    S5,
+    T20,
+    async_setup_coordinators,
+    match_state,
+    segments,
+    turn,
+)
+
+from custom_components.autodarts.local import LocalBoardClient  # noqa: E402
+
+
+def board_message(*throws, status="Throw"):
+    return {"status": status, "throws": [{"segment": segment} for segment in throws]}
+
+
+async def setup_client(hass, cloud):
+    board, match = await async_setup_coordinators(hass, cloud)
+    return board, match, LocalBoardClient(hass, board, match, "board.local")
+
+
+async def test_lan_darts_are_shown_before_the_cloud(hass, live_match):
+    board, match, client = await setup_client(hass, live_match)
+    client.on_message(board_message(T20, status="Throw"))
+    assert segments(match) == ["T20"]
+    assert board.data.state["status"] == "Throw"
+    # a late cloud frame keeps the board manager status
+    board.item.emit(dict(board.store.state, status="Stopped"))
+    assert board.store.state["status"] == "Throw"
+
+
+async def test_late_lan_dart_stays_on_its_turn(hass, live_match):
+    _, match, client = await setup_client(hass, live_match)
+    client.on_message(board_message(T20, T20))
+    assert segments(match) == ["T20", "T20"]
+    # the cloud got the third dart first and started the next turn
+    turns = [turn("t1", T20, T20, S5), turn("t2", player="p2")]
+    match.item.emit(match_state(turns=turns, player=1))
+    client.on_message(board_message(T20, T20, S5))
+    assert segments(match) == []
+    first = match.data.state["turns"][0]["throws"]
+    assert [throw["segment"]["name"] for throw in first] == ["T20", "T20", "S5"]
+
+
+async def test_first_dart_waits_for_the_cloud_turn(hass, live_match):
+    _, match, client = await setup_client(hass, live_match)
+    match.item.emit(match_state(T20, T20, T20))
+    client.on_message(board_message(status="Takeout"))
+    client.on_message(board_message(D16))
+    # the previous turn is still the last one, its first dart is kept
+    assert segments(match) == ["T20", "T20", "T20"]
+
+    turns = [turn("t1", T20, T20, T20), turn("t2", player="p2")]
+    match.item.emit(match_state(turns=turns, player=1))
+    client.on_message(board_message(D16, S5))
+    assert segments(match) == ["D16", "S5"]
+
+
+async def test_message_errors_do_not_end_the_client(hass, live_match, monkeypatch):
+    _, match, client = await setup_client(hass, live_match)
+
+    def failing(*args):
+        raise RuntimeError("bug")
+
+    monkeypatch.setattr(match, "apply_local_throw", failing)
+    client._handle("not json")
+    client._handle(json.dumps(board_message(T20)))
+    assert client.messages == 1
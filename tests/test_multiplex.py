@@ -0,0 +1,125 @@
+"""Tests of the account websocket shared by the coordinators."""
+import json
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+pytest.importorskip("homeassistant")
+
+from custom_components.autodarts import multiplex  # noqa: E402
+from custom_components.autodarts.multiplex import MultiplexSocket  # noqa: E402
+
+CHANNEL = "autodarts.boards"
+
+
+class FakeWebSocket:
+    """Websocket delivering a fixed list of messages, then closing."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.sent = []
+        self.closed = False
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+
+    async def __aiter__(self):
+        for message in self.messages:
+            data = message if isinstance(message, str) else json.dumps(message)
+            yield aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, data, None)
+
+
+def frame(topic, data):
+    return {"channel": CHANNEL, "topic": topic, "data": data}
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+def handler(calls, name):
+    return lambda data: calls.append((name, data))
+
+
+async def run(hass, monkeypatch, socket, messages):
+    ws = FakeWebSocket(messages)
+    client = type("Client", (), {"ws_connect": lambda self, url, **kwargs: ws})()
+    monkeypatch.setattr(multiplex, "async_get_clientsession", lambda hass: client)
+    socket.connect()
+    await hass.async_block_till_done()
+    return ws
+
+
+async def test_frames_are_dispatched_by_topic_and_event(hass, monkeypatch, calls):
+    socket = MultiplexSocket(hass, "wss://cloud", lambda: "token")
+    socket.register_callback(CHANNEL, "b1.state", handler(calls, "state"))
+    socket.register_callback(CHANNEL, "b1.events", handler(calls, "reset"), "reset")
+    socket.register_callback(
+        CHANNEL, "b1.events", handler(calls, "closed"), "disconnected"
+    )
+    socket.register_callback(CHANNEL, "b2.state", handler(calls, "other"))
+    ws = await run(
+        hass,
+        monkeypatch,
+        socket,
+        [
+            frame("b1.state", {"status": "Throw"}),
+            frame("b1.events", {"event": "start"}),
+            frame("b1.events", {"event": "reset"}),
+        ],
+    )
+    assert [message["topic"] for message in ws.sent] == [
+        "b1.state",
+        "b1.events",
+        "b2.state",
+    ]
+    assert calls == [
+        ("state", {"status": "Throw"}),
+        ("reset", {"event": "reset"}),
+        ("closed", {"event": "disconnected"}),
+    ]
+
+
+async def test_failing_handler_does_not_close_the_socket(hass, monkeypatch, calls):
+    def failing(data):
+        raise RuntimeError("handler bug")
+
+    async def async_failing(data):
+        raise RuntimeError("async handler bug")
+
+    socket = MultiplexSocket(hass, "wss://cloud", lambda: "token")
+    socket.register_callback(CHANNEL, "b1.state", failing)
+    socket.register_callback(CHANNEL, "b1.state", async_failing)
+    socket.register_callback(CHANNEL, "b1.state", handler(calls, "state"))
+    socket.register_callback(CHANNEL, "b1.events", handler(calls, "events"))
+    await run(
+        hass,
+        monkeypatch,
+        socket,
+        [frame("b1.state", 1), "not json", frame("b1.state", 2)],
+    )
+    assert calls == [
+        ("state", 1),
+        ("state", 2),
+        ("events", {"event": "disconnected"}),
+    ]
+    assert socket.messages == 2
+
+
+async def test_no_disconnected_event_when_closed_on_purpose(hass, calls):
+    socket = MultiplexSocket(hass, "wss://cloud", lambda: None)
+    unregister = socket.register_callback(
+        CHANNEL, "b1.events", handler(calls, "events")
+    )
+    unregister()
+    assert socket._callbacks == {}
+    socket.disconnect()
+    await hass.async_block_till_done()
+    assert calls == []
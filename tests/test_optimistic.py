@@ -0,0 +1,113 @@
+"""Tests of the optimistic effects of match actions and their checks."""
+from custom_components.autodarts.optimistic import (
+    PENDING,
+    Operation,
+    apply_next_player,
+    apply_throw,
+    apply_undo,
+    expect_next_player,
+    expect_throw,
+    expect_undo,
+    segment_key,
+)
+
+T20 = {"name": "T20", "number": 20, "multiplier": 3, "bed": "Triple"}
+S5 = {"name": "S5", "number": 5, "multiplier": 1, "bed": "SingleInner"}
+MISS = {"name": "Miss", "number": 0, "multiplier": 0, "bed": "Outside"}
+
+
+def match(*turns, player=0):
+    return {
+        "player": player,
+        "players": [{"name": "a"}, {"name": "b"}],
+        "turns": [
+            {"id": str(idx), "throws": [{"segment": segment} for segment in throws]}
+            for idx, throws in enumerate(turns)
+        ],
+    }
+
+
+def segments(state, turn=-1):
+    return [throw["segment"]["name"] for throw in state["turns"][turn]["throws"]]
+
+
+def test_operation_starts_pending():
+    operation = Operation(1, "throw")
+    assert operation.status == PENDING
+    assert operation.in_flight
+    assert operation.as_dict()["action"] == "throw"
+
+
+def test_apply_throw_appends_or_replaces():
+    state = match([T20])
+    assert segments(apply_throw(S5, None)(state)) == ["T20", "S5"]
+    assert segments(apply_throw(S5, 0)(state)) == ["S5"]
+    assert segments(state) == ["T20"]
+
+
+def test_apply_throw_stops_at_three_darts():
+    state = match([T20, T20, T20])
+    assert apply_throw(S5, None)(state) == state
+
+
+def test_apply_throw_without_turn():
+    state = {"turns": []}
+    assert apply_throw(S5, None)(state) is state
+
+
+def test_apply_undo():
+    assert segments(apply_undo(match([T20, S5]))) == ["T20"]
+    state = match([])
+    assert apply_undo(state) is state
+
+
+def test_apply_next_player():
+    state = apply_next_player(match([T20, T20, T20], player=1))
+    assert state["player"] == 0
+    assert len(state["turns"]) == 2
+    assert state["turns"][-1]["throws"] == []
+
+
+def test_segment_key_ignores_the_number_of_a_miss():
+    assert segment_key(MISS) == segment_key({"name": "M20", "number": 20})
+    assert segment_key(T20) == segment_key({"number": 20, "multiplier": 3})
+    assert segment_key(None) == (0, 0)
+
+
+def test_expect_throw_matches_its_dart_only():
+    expect = expect_throw(match([T20]), S5, None)
+    assert not expect(match([T20]))
+    assert not expect(match([T20, T20]))
+    assert expect(match([T20, S5]))
+
+
+def test_expect_throw_of_a_replaced_dart():
+    expect = expect_throw(match([T20, T20]), S5, 0)
+    assert not expect(match([T20, T20]))
+    assert expect(match([S5, T20]))
+
+
+def test_expect_throw_ends_with_the_turn():
+    expect = expect_throw(match([T20]), S5, None)
+    assert expect(match([T20, T20, T20], []))
+    assert not expect({"turns": []})
+
+
+def test_expect_without_previous_state():
+    assert expect_throw(None, S5, None) is None
+    assert expect_undo(None) is None
+    assert expect_next_player(None) is None
+
+
+def test_expect_undo():
+    expect = expect_undo(match([T20, S5]))
+    assert not expect(match([T20, S5]))
+    assert expect(match([T20]))
+    assert expect(match([T20, S5, T20], []))
+
+
+def test_expect_next_player():
+    expect = expect_next_player(match([T20], player=0))
+    assert not expect(match([T20, S5], player=0))
+    assert expect(match([T20], player=1))
+    assert expect(match([T20], [], player=0))
@@ -0,0 +1,78 @@
+"""Tests of the reconnect supervisor and the resync once reconnected."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from harness import (  # noqa: E402
+    T20,
+    async_setup_coordinators,
+    board_state,
+    match_state,
+    segments,
+)
+
+from custom_components.autodarts import reconnect  # noqa: E402
+from custom_components.autodarts.const import (  # noqa: E402
+    CIRCUIT_CLOSED,
+    CIRCUIT_OPEN,
+)
+
+DELAY = 0.01  # s
+
+
+@pytest.fixture
+async def coordinators(hass, live_match, monkeypatch):
+    monkeypatch.setattr(reconnect, "RECONNECT_CONFIRM_DELAY", DELAY)
+    board, match = await async_setup_coordinators(hass, live_match)
+    supervisor = board.supervisor
+    supervisor.base_delay = supervisor.max_delay = DELAY
+    supervisor.failure_threshold = 2
+    return board, match
+
+
+async def lose(coordinator):
+    coordinator.item.disconnect()
+    await coordinator.item.async_emit_event("disconnected", {})
+
+
+async def test_reconnected_sockets_are_resynced(hass, live_match, coordinators):
+    board, match = coordinators
+    # cached by a load just before the socket closed
+    await board.async_refresh()
+    await lose(board)
+    await lose(match)
+    live_match.boards["b1"] = board_state(matchId="m1", status="Throw")
+    live_match.matches["m1"] = match_state(T20)
+
+    await asyncio.sleep(DELAY * 5)
+    await hass.async_block_till_done()
+    assert board.supervisor.state == CIRCUIT_CLOSED
+    assert board.supervisor.reconnects == 2
+    assert board.connected and match.connected
+    assert board.data.state["status"] == "Throw"
+    assert segments(match) == ["T20"]
+
+
+async def test_circuit_opens_after_repeated_failures(coordinators):
+    board, _ = coordinators
+    supervisor = board.supervisor
+    supervisor.connection_lost(board)
+    assert supervisor.state == CIRCUIT_CLOSED
+    supervisor.connection_lost(board)
+    assert supervisor.state == CIRCUIT_OPEN
+    assert supervisor.attributes["retry_in"] == supervisor.open_delay
+    supervisor.cancel()
+    assert supervisor.attributes["retry_in"] is None
+
+
+async def test_board_command_drops_the_cached_load(live_match, coordinators):
+    board, _ = coordinators
+    await board.async_refresh()
+    live_match.boards["b1"] = board_state(matchId="m1", status="Throw")
+    await board.async_refresh()
+    assert board.data.state["status"] != "Throw"
+    await board.async_start()
+    await board.async_refresh()
+    assert board.data.state["status"] == "Throw"
@@ -0,0 +1,32 @@
+"""Tests of the dart segment notation."""
+import pytest
+
+from custom_components.autodarts.segments import segment_from_name
+
+
+@pytest.mark.parametrize(
+    "name, number, multiplier",
+    [
+        ("Miss", 0, 0),
+        ("M20", 20, 0),
+        ("25", 25, 1),
+        ("Bull", 25, 2),
+        ("S5", 5, 1),
+        ("D16", 16, 2),
+        ("T20", 20, 3),
+    ],
+)
+def test_segment_from_name(name, number, multiplier):
+    segment = segment_from_name(name)
+    assert segment["number"] == number
+    assert segment["multiplier"] == multiplier
+
+
+def test_mxx_is_a_miss():
+    assert segment_from_name("M3")["name"] == "Miss"
+
+
+@pytest.mark.parametrize("name", ["", "X20", "T", "Tx", "S21", "T25"])
+def test_invalid_names(name):
+    with pytest.raises(ValueError):
+        segment_from_name(name)
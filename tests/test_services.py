@@ -0,0 +1,80 @@
+"""Tests of the turn entry services."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from harness import (  # noqa: E402
+    D16,
+    S5,
+    T20,
+    async_setup_coordinators,
+    match_state,
+    segments,
+)
+
+from custom_components.autodarts.services import async_submit  # noqa: E402
+
+
+@pytest.fixture
+async def match(hass, live_match):
+    _, match = await async_setup_coordinators(hass, live_match)
+    return match
+
+
+def hold_actions(monkeypatch, item):
+    """Record the actions of item, answered once the returned event is set."""
+    started = []
+    answer = asyncio.Event()
+
+    async def action(name, *args, **kwargs):
+        started.append((name, args, kwargs))
+        await answer.wait()
+
+    monkeypatch.setattr(item, "_action", action)
+    return started, answer
+
+
+async def wait_tasks():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_darts_are_sent_in_order_without_waiting(hass, match, monkeypatch):
+    match.item.emit(match_state(T20))
+    started, answer = hold_actions(monkeypatch, match.item)
+    task = hass.async_create_task(async_submit(match, [S5, D16], replace=False))
+    await wait_tasks()
+    # every command is sent before the first answer
+    assert [args[0]["name"] for _, args, _ in started] == ["S5", "D16"]
+    assert [operation.dart for operation in match.pending_operations] == [1, 2]
+    answer.set()
+    await task
+    assert segments(match) == ["T20", "S5", "D16"]
+
+
+async def test_set_turn_undoes_and_corrects(hass, match, monkeypatch):
+    match.item.emit(match_state(T20, T20, T20))
+    started, answer = hold_actions(monkeypatch, match.item)
+    task = hass.async_create_task(async_submit(match, [S5], replace=True))
+    await wait_tasks()
+    assert [(name, kwargs) for name, _, kwargs in started] == [
+        ("undo", {}),
+        ("undo", {}),
+        ("throw", {"throw_id": 0}),
+    ]
+    answer.set()
+    await task
+    assert segments(match) == ["S5"]
+
+
+async def test_failure_is_raised_after_the_resync(hass, match, monkeypatch):
+    async def action(name, *args, **kwargs):
+        raise RuntimeError("refused")
+
+    monkeypatch.setattr(match.item, "_action", action)
+    with pytest.raises(RuntimeError):
+        await async_submit(match, [S5], replace=False)
+    assert match.pending_operations == []
+    assert segments(match) == []
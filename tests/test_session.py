@@ -0,0 +1,114 @@
+"""Tests of the account session pool and its socket tokens."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("keycloak")
+
+from keycloak.exceptions import KeycloakError  # noqa: E402
+
+from custom_components.autodarts import session as session_module  # noqa: E402
+from custom_components.autodarts.session import (  # noqa: E402
+    SessionPool,
+    account_key,
+    with_expiry,
+)
+
+KEY = account_key("email", "password")
+
+
+def token(access, refresh=None):
+    return {
+        "access_token": access,
+        "refresh_token": refresh or f"refresh-{access}",
+        "expires_in": 300,
+        "refresh_expires_in": 1800,
+    }
+
+
+class FakeOpenID:
+    """Keycloak client answering with numbered tokens."""
+
+    def __init__(self):
+        self.grants = []
+        self.down = False
+
+    def token(self, email, password):
+        if self.down:
+            raise KeycloakError("unreachable")
+        self.grants.append("password")
+        return token(f"access-{len(self.grants)}")
+
+    def refresh_token(self, refresh_token):
+        if self.down or refresh_token == "revoked":
+            raise KeycloakError("refused")
+        self.grants.append(refresh_token)
+        return token(f"access-{len(self.grants)}")
+
+
+class FakeSession:
+    def __init__(self):
+        self.logins = 0
+
+    async def is_authenticated(self):
+        self.logins += 1
+        return True
+
+
+@pytest.fixture
+def openid(monkeypatch):
+    openid = FakeOpenID()
+    monkeypatch.setattr(session_module, "create_openid", lambda: openid)
+    monkeypatch.setattr(
+        session_module, "create_session", lambda email, password: FakeSession()
+    )
+    return openid
+
+
+async def test_one_login_per_account(hass, openid):
+    pool = SessionPool(hass)
+    session = await pool.async_acquire("email", "password")
+    assert await pool.async_acquire("email", "password") is session
+    assert session.logins == 1
+    assert openid.grants == ["password"]
+    assert await pool.async_acquire("email", "other") is not session
+
+
+async def test_socket_uses_the_pool_token(hass, openid):
+    pool = SessionPool(hass)
+    await pool.async_acquire("email", "password")
+    socket = pool.socket("email", "password")
+    assert socket._token() == "access-1"
+    assert pool.socket("email", "password") is socket
+
+    await pool._async_refresh(KEY)
+    assert openid.grants == ["password", "refresh-access-1"]
+    assert socket._token() == "access-2"
+
+
+async def test_stored_refresh_token_is_used_after_restart(hass, openid):
+    await SessionPool(hass).async_acquire("email", "password")
+    # tokens are saved by a timer of the store
+    await asyncio.sleep(0.01)
+    await hass.async_block_till_done()
+
+    pool = SessionPool(hass)
+    await pool.async_acquire("email", "password")
+    assert openid.grants == ["password", "refresh-access-1"]
+    assert pool.socket("email", "password")._token() == "access-2"
+
+
+async def test_refused_refresh_token_falls_back_to_a_login(hass, openid):
+    pool = SessionPool(hass)
+    pool._tokens = {KEY: with_expiry(token("old", "revoked"))}
+    await pool.async_acquire("email", "password")
+    assert openid.grants == ["password"]
+    assert pool.socket("email", "password")._token() == "access-1"
+
+
+async def test_no_shared_socket_without_token(hass, openid):
+    openid.down = True
+    pool = SessionPool(hass)
+    await pool.async_acquire("email", "password")
+    assert pool.socket("email", "password") is None
@@ -0,0 +1,109 @@
+"""Tests of the per player statistics."""
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from custom_components.autodarts.statistics import (  # noqa: E402
+    RECORD,
+    StatisticsEngine,
+)
+
+NOW = time.time()
+
+
+def row(number, multiplier, remaining=101, busted=0, round=4, timestamp=NOW):
+    return ("a", "X01", round, number, multiplier, 0, remaining, busted, timestamp)
+
+
+def all_time(engine):
+    return engine.metrics("a")["all_time"]
+
+
+def test_average():
+    engine = StatisticsEngine(session_start=NOW - 60)
+    engine.add_rows([row(20, 3), row(20, 1), row(5, 1)])
+    metrics = all_time(engine)
+    assert metrics["darts"] == 3
+    assert metrics["average"] == 85.0
+    assert metrics["treble_rate"] == pytest.approx(33.33)
+
+
+def test_busted_darts_score_nothing():
+    engine = StatisticsEngine()
+    engine.add_rows([row(20, 3), row(20, 3, busted=1)])
+    metrics = all_time(engine)
+    assert metrics["darts"] == 2
+    assert metrics["average"] == 90.0
+
+
+def test_checkout():
+    engine = StatisticsEngine()
+    engine.add_rows([row(16, 1, remaining=32), row(8, 2, remaining=16)])
+    metrics = all_time(engine)
+    assert metrics["checkout_percentage"] == 50.0
+
+
+def test_removed_throw():
+    engine = StatisticsEngine()
+    engine.add_rows([row(20, 3), row(1, 1)])
+    engine.add_rows([row(1, 1)], sign=-1)
+    assert all_time(engine)["darts"] == 1
+    assert all_time(engine)["average"] == 180.0
+
+
+def test_periods():
+    engine = StatisticsEngine(session_start=NOW - 60)
+    engine.add_rows([row(20, 3, timestamp=NOW - 86400 * 30), row(20, 1)])
+    metrics = engine.metrics("a")
+    assert metrics["all_time"]["darts"] == 2
+    assert metrics["day"]["darts"] == 1
+    assert metrics["session"]["darts"] == 1
+
+
+def test_live_throws_are_applied_on_read():
+    engine = StatisticsEngine()
+    assert all_time(engine)["darts"] == 0
+    engine.record(row(20, 3))
+    engine.record(row(20, 1))
+    engine.record(row(20, 1), -1)
+    assert all_time(engine)["darts"] == 1
+    assert all_time(engine)["average"] == 180.0
+
+
+def test_metrics_are_cached_until_sums_change():
+    engine = StatisticsEngine()
+    engine.add_rows([row(20, 3)])
+    assert engine.metrics("a") is engine.metrics("a")
+    metrics = engine.metrics("a")
+    engine.record(row(1, 1))
+    assert engine.metrics("a") is not metrics
+
+
+def test_all_time_sums_round_trip():
+    engine = StatisticsEngine()
+    engine.add_rows([row(20, 3), row(5, 1, busted=1)])
+    loaded = StatisticsEngine()
+    assert loaded.load_all_time_sums(engine.all_time_sums())
+    assert all_time(loaded) == all_time(engine)
+    assert loaded.metrics("a")["day"]["darts"] == 0
+
+
+def test_sums_of_other_fields_are_refused():
+    engine = StatisticsEngine()
+    assert not engine.load_all_time_sums({"fields": ["darts"], "players": {}})
+
+
+def test_records_from_the_history():
+    engine = StatisticsEngine()
+    records = np.array(
+        [
+            ("a", False, 4, 20, 3, 0, 101, False, NOW),
+            ("b", True, 1, 20, 3, 3, -1, False, NOW),
+        ],
+        dtype=RECORD,
+    )
+    engine.add_records(records)
+    assert all_time(engine)["average"] == 180.0
+    assert engine.metrics("b")["all_time"]["mpr"] == 9.0
@@ -0,0 +1,66 @@
+"""Tests of the state stores."""
+from custom_components.autodarts.store import BoardStore, MatchStore, StateStore
+
+
+def turn(id, *throws):
+    return {"id": id, "throws": [{"segment": {"name": name}} for name in throws]}
+
+
+def test_first_frame_changes_every_key():
+    store = StateStore()
+    assert store.apply({"a": 1, "b": 2}) == {"a", "b"}
+    assert store.state == {"a": 1, "b": 2}
+    assert store.frames == 1
+
+
+def test_equal_values_keep_previous_objects():
+    store = BoardStore()
+    store.apply({"status": "Throw", "throws": [1, 2]})
+    throws = store.state["throws"]
+    assert store.apply({"status": "Takeout", "throws": [1, 2]}) == {"status"}
+    assert store.state["throws"] is throws
+
+
+def test_removed_key_is_changed():
+    store = StateStore()
+    store.apply({"a": 1, "b": 2})
+    assert store.apply({"a": 1}) == {"b"}
+
+
+def test_turns_share_final_turns():
+    store = MatchStore()
+    store.apply({"turns": [turn("1", "T20", "T20", "T20"), turn("2", "S5")]})
+    first = store.state["turns"][0]
+    changed = store.apply(
+        {"turns": [turn("1", "T20", "T20", "T20"), turn("2", "S5", "S1")]}
+    )
+    assert changed == {"turns"}
+    assert store.state["turns"][0] is first
+    assert store.state["turns"][1] == turn("2", "S5", "S1")
+
+
+def test_turns_append_keeps_list_items():
+    store = MatchStore()
+    store.apply({"turns": [turn("1", "T20")]})
+    first = store.state["turns"][0]
+    store.apply({"turns": [turn("1", "T20"), turn("2")]})
+    assert store.state["turns"][0] is first
+    assert len(store.state["turns"]) == 2
+
+
+def test_turns_shrinking_are_replaced():
+    store = MatchStore()
+    store.apply({"turns": [turn("1", "T20"), turn("2")]})
+    assert store.apply({"turns": [turn("1", "T20")]}) == {"turns"}
+    assert store.state["turns"] == [turn("1", "T20")]
+
+
+def test_reset_is_a_baseline_not_a_frame():
+    store = MatchStore()
+    state = {"turns": [turn("1", "T20")]}
+    store.reset(state)
+    assert store.frames == 0
+    assert store.state == state
+    assert store.apply(state) == set()
+    store.clear()
+    assert store.state is None
@@ -0,0 +1,47 @@
+"""Tests of the constant memory estimators."""
+import random
+
+import pytest
+
+from custom_components.autodarts.telemetry import Latency, P2Quantile
+
+
+def test_quantile_without_value():
+    assert P2Quantile(0.5).value is None
+
+
+def test_quantile_of_few_values_is_exact():
+    quantile = P2Quantile(0.5)
+    for x in (3, 1, 2):
+        quantile.add(x)
+    assert quantile.value == 2
+
+
+@pytest.mark.parametrize("p", [0.5, 0.9, 0.99])
+def test_quantile_estimate(p):
+    rng = random.Random(p)
+    values = [rng.uniform(0, 1) for _ in range(20000)]
+    quantile = P2Quantile(p)
+    for x in values:
+        quantile.add(x)
+    exact = sorted(values)[int(p * len(values))]
+    assert quantile.value == pytest.approx(exact, abs=0.02)
+
+
+def test_quantile_of_constant_values():
+    quantile = P2Quantile(0.9)
+    for _ in range(100):
+        quantile.add(1.0)
+    assert quantile.value == 1.0
+
+
+def test_latency_in_ms():
+    latency = Latency()
+    assert latency.as_dict()["mean"] is None
+    for duration in (0.010, 0.020, 0.030):
+        latency.add(duration)
+    stats = latency.as_dict()
+    assert stats["count"] == 3
+    assert stats["mean"] == 20.0
+    assert stats["max"] == 30.0
+    assert stats["p50"] == 20.0